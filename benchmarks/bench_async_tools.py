@@ -0,0 +1,91 @@
+"""Sync vs async tool throughput against local stubs.
+
+    python benchmarks/bench_async_tools.py [--calls 200] [--latency 0.05] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from mem0 import MemoryClient
+
+from benchmarks.stubs import start_stub_server
+from src.tools.browser_tools import ScrapeWebsiteTool
+from src.tools.http_client import http_host_stats
+from src.tools.mem_zero_tool import MemZeroTool
+from src.tools.search_tools import SearchInternetTool
+
+
+def bench_sync(call, calls):
+    start_time = time.perf_counter()
+    for i in range(calls):
+        call(i)
+    return time.perf_counter() - start_time
+
+
+def bench_threads(call, calls, concurrency):
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(call, range(calls)))
+    return time.perf_counter() - start_time
+
+
+def bench_async(acall, calls, concurrency):
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(i):
+            async with semaphore:
+                await acall(i)
+
+        start_time = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(calls)))
+        return time.perf_counter() - start_time
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub response latency (s)")
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.latency)
+    os.environ.setdefault("SERPER_API_KEY", "stub")
+    os.environ.setdefault("BROWSERLESS_API_KEY", "stub")
+    search = SearchInternetTool(endpoint=f"{base_url}/search", use_cache=False)
+    scrape = ScrapeWebsiteTool(endpoint=f"{base_url}/content", use_cache=False)
+    memory = MemZeroTool(client=MemoryClient(api_key="stub", host=base_url), buffered=False)
+    # sync/threads/async 가 같은 쿼리를 쓰므로 검색 캐시를 끄고 매번 mem0 stub 을 호출한다
+    memory.retrieval_cache = None
+
+    cases = {
+        "search_internet": (lambda i: search._run(f"query {i}"), lambda i: search._arun(f"query {i}")),
+        # 요약(LLM) 없이 가져오기 + 추출 경로만 측정
+        "scrape (fetch+extract)": (lambda i: scrape._get_chunks(f"https://example.com/{i}"),
+                                   lambda i: scrape._aget_chunks(f"https://example.com/{i}")),
+        "knowledge (retrieve)": (lambda i: memory._run("bench", "retrieve", query=f"query {i}"),
+                                 lambda i: memory._arun("bench", "retrieve", query=f"query {i}")),
+    }
+    print(f"calls={args.calls} latency={args.latency}s concurrency={args.concurrency}\n")
+    print(f"{'tool':<24}{'sync':>12}{'threads':>12}{'async':>12}   (calls/s)")
+    for name, (call, acall) in cases.items():
+        sync_time = bench_sync(call, args.calls)
+        thread_time = bench_threads(call, args.calls, args.concurrency)
+        async_time = bench_async(acall, args.calls, args.concurrency)
+        print(f"{name:<24}{args.calls / sync_time:>12.1f}{args.calls / thread_time:>12.1f}{args.calls / async_time:>12.1f}")
+
+    print("\nper-host latency (s):")
+    for host, stats in http_host_stats().items():
+        print(f"  {host}: requests={stats['requests']} p50={stats['p50']:.4f} p95={stats['p95']:.4f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
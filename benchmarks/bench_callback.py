@@ -0,0 +1,82 @@
+"""Per-step overhead of CallbackHandler.step_callback on the agent thread.
+
+    python benchmarks/bench_callback.py [--steps 2000] [--output-size 2000] [--compress]
+
+"legacy" is the previous implementation (print + session.log append + one
+indented JSON file per step, all synchronous); "queued" is the current
+handler, whose file writes happen on the background writer.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.callback import CallbackHandler
+
+
+def legacy_step_callback(session_dir, step, agent_name):
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    task, output, step_number = step.task, step.output, step.step_number
+    log_message = f"\n[{timestamp}] {agent_name} - Step {step_number}:"
+    log_message += f"\nTask: {task[:150]}..." if len(task) > 150 else f"\nTask: {task}"
+    log_message += f"\nOutput: {output[:150]}..." if len(output) > 150 else f"\nOutput: {output}"
+    print(log_message)
+    with open(os.path.join(session_dir, "session.log"), "a") as f:
+        f.write(log_message + "\n")
+    step_file = os.path.join(session_dir, f"{agent_name.replace(' ', '_')}_step_{step_number}.json")
+    with open(step_file, "w") as f:
+        json.dump({"timestamp": timestamp, "agent_name": agent_name, "step_number": step_number,
+                   "task": task, "output": output}, f, indent=2)
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return {name: samples[min(len(samples) - 1, int(len(samples) * pct))] * 1e6
+            for name, pct in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))}
+
+
+def run(label, callback, steps):
+    latencies = []
+    for i in range(steps):
+        start_time = time.perf_counter()
+        callback(i)
+        latencies.append(time.perf_counter() - start_time)
+    stats = percentiles(latencies)
+    print(f"{label:8s} mean={sum(latencies) / steps * 1e6:8.1f}us "
+          + " ".join(f"{name}={value:8.1f}us" for name, value in stats.items()), file=sys.__stdout__)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--output-size", type=int, default=2000, help="characters of step output")
+    parser.add_argument("--compress", action="store_true")
+    args = parser.parse_args()
+
+    output = "결과 " * (args.output_size // 3)
+    make_step = lambda i: SimpleNamespace(step_number=i, task="웹사이트 개선안 도출", output=output)
+
+    with tempfile.TemporaryDirectory() as log_dir, contextlib.redirect_stdout(io.StringIO()):
+        legacy_dir = os.path.join(log_dir, "legacy")
+        os.makedirs(legacy_dir)
+        run("legacy", lambda i: legacy_step_callback(legacy_dir, make_step(i), "Senior Analyst"), args.steps)
+
+        handler = CallbackHandler(log_dir=os.path.join(log_dir, "queued"), compress=args.compress)
+        run("queued", lambda i: handler.step_callback(make_step(i), "Senior Analyst"), args.steps)
+        start_time = time.perf_counter()
+        handler.close()
+        print(f"queued   drain on close={(time.perf_counter() - start_time) * 1e3:.1f}ms "
+              f"written={handler.writer.written} dropped={handler.writer.dropped} "
+              f"file={os.path.getsize(handler.session_log) / 1024:.0f}KiB", file=sys.__stdout__)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""End-to-end crew benchmark with no network: fake LLM, stub MCP server, stub search/scrape/mem0.
+
+    python benchmarks/bench_crew.py [--goals 5] [--llm-latency 0.05] [--tool-latency 0.05]
+                                    [--mcp-latency 0.0] [--agents 2] [--mode sequential|parallel]
+                                    [--max-concurrency 3] [--no-agent-cache] [--json PATH]
+
+Reports import time, MCP server startup, CrewConfigManager construction,
+create_crew time (first goal and later goals), kickoff time, and goals per
+minute. With --mode parallel, create time is the task-graph planning call
+and the average critical-path length of the planned DAG is reported too.
+Run once with --no-agent-cache to see the construction time the agent
+template cache saves per goal.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+
+def write_configs(config_dir: str, agents: int, mcp_latency: float):
+    """agents.yaml with `agents` agents using every stubbed tool, mcp.json with the stub MCP server."""
+    agents_path = os.path.join(config_dir, "agents.yaml")
+    mcp_path = os.path.join(config_dir, "mcp.json")
+    with open(agents_path, "w") as f:
+        for i in range(agents):
+            f.write(f"bench_agent_{i}:\n"
+                    f"  role: Benchmark Agent {i}\n"
+                    f"  goal: Answer the benchmark goal using the stub tools.\n"
+                    f"  backstory: A deterministic agent used for performance measurements.\n"
+                    f"  tools: search_internet, scrape_website, stub(mcp)\n")
+    with open(mcp_path, "w") as f:
+        json.dump({"mcpServers": {"stub": {
+            "command": sys.executable,
+            "args": [os.path.join(ROOT, "scripts", "stub_mcp_server.py"), "--latency", str(mcp_latency)],
+            "startupTimeout": 30,
+        }}}, f)
+    return agents_path, mcp_path
+
+
+def timed(fn, *args, **kwargs):
+    start_time = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--goals", type=int, default=5)
+    parser.add_argument("--agents", type=int, default=2)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--tool-latency", type=float, default=0.05, help="search/scrape/mem0 stub latency")
+    parser.add_argument("--mcp-latency", type=float, default=0.0)
+    parser.add_argument("--mode", choices=("sequential", "parallel"), default="sequential",
+                        help="parallel: plan a task DAG and run independent tasks concurrently")
+    parser.add_argument("--max-concurrency", type=int, default=3)
+    parser.add_argument("--no-agent-cache", action="store_true", help="rebuild agents from agents.yaml for every goal")
+    parser.add_argument("--json", help="write the report as JSON to this path")
+    parser.add_argument("--verbose", action="store_true", help="show crew output")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_crew_")
+    # 외부 서비스 대신 로컬 스텁을 쓰고, 캐시는 임시 경로에 둔다
+    os.environ.update({
+        "SERPER_API_KEY": "stub", "BROWSERLESS_API_KEY": "stub", "MEM_ZERO_API_KEY": "stub",
+        "OPENAI_API_KEY": "stub", "MEM0_TELEMETRY": "False", "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true", "SCRAPE_CACHE_PATH": os.path.join(tmp_dir, "scrape_cache.sqlite"),
+    })
+    report = {"goals": args.goals, "agents": args.agents, "llm_latency": args.llm_latency,
+              "tool_latency": args.tool_latency, "mcp_latency": args.mcp_latency}
+
+    start_time = time.perf_counter()
+    from crewai import Agent
+    from mem0 import MemoryClient
+
+    from benchmarks.fake_llm import FakeLLM
+    from benchmarks.stubs import start_stub_server
+    from src.crew_config_manager import CrewConfigManager
+    from src.mcp_pool import MCPServerPool
+    from src.task_graph import critical_path_seconds
+    from src.tools.browser_tools import ScrapeWebsiteTool
+    from src.tools.search_tools import SearchInternetTool
+    report["import_seconds"] = time.perf_counter() - start_time
+
+    server, base_url = start_stub_server(args.tool_latency)
+    agents_path, mcp_path = write_configs(tmp_dir, args.agents, args.mcp_latency)
+    search = SearchInternetTool(endpoint=f"{base_url}/search", use_cache=False)
+    scrape = ScrapeWebsiteTool(endpoint=f"{base_url}/content", use_cache=False)
+    llm = FakeLLM(latency=args.llm_latency)
+    scrape.summarizer = Agent(role="Principal Researcher", goal="Summarize content", backstory="Benchmark summarizer", llm=llm)
+    llm.tool_inputs = {
+        search.name: {"query": "benchmark"},
+        scrape.name: {"website": f"{base_url}/content"},
+        "echo": {"text": "ping"},
+        "mem_zero_management": {"agent_name": "bench", "mode": "retrieve", "query": "benchmark"},
+    }
+
+    pool = MCPServerPool()
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with output:
+            mem0_client, report["mem0_client_seconds"] = timed(MemoryClient, api_key="stub", host=base_url)
+            manager, report["manager_init_seconds"] = timed(
+                CrewConfigManager, agents_config_path=agents_path, mcp_config_path=mcp_path, mcp_pool=pool,
+                llm=llm, mem0_client=mem0_client, tools={"search_internet": search, "scrape_website": scrape},
+                cache_agents=not args.no_agent_cache)
+            _, report["mcp_startup_seconds"] = timed(manager._start_mcp_servers, manager._required_mcp_servers())
+
+            create_times, kickoff_times, critical_paths = [], [], []
+            run_start = time.perf_counter()
+            for i in range(args.goals):
+                if args.mode == "parallel":
+                    nodes, create_seconds = timed(manager.plan_task_graph, f"벤치마크 목표 {i}")
+                    result, kickoff_seconds = timed(manager.run_task_graph, f"벤치마크 목표 {i}", args.max_concurrency, nodes)
+                    critical_paths.append(critical_path_seconds(
+                        nodes, {task_id: end - start for task_id, (start, end) in result.timings.items()}))
+                else:
+                    crew, create_seconds = timed(manager.create_crew, f"벤치마크 목표 {i}")
+                    _, kickoff_seconds = timed(crew.kickoff)
+                create_times.append(create_seconds)
+                kickoff_times.append(kickoff_seconds)
+            run_seconds = time.perf_counter() - run_start
+    finally:
+        pool.shutdown()
+        server.shutdown()
+
+    # 첫 목표는 템플릿을 만드는 비용을 포함하므로 따로 보고한다
+    warm_create_times = create_times[1:] or create_times
+    if critical_paths:
+        # 병렬 모드의 실행 시간은 임계 경로 길이에 가까워야 한다
+        report["critical_path_seconds_avg"] = sum(critical_paths) / len(critical_paths)
+    report.update({
+        "mode": args.mode,
+        "agent_cache": not args.no_agent_cache,
+        "create_crew_first_seconds": create_times[0],
+        "create_crew_seconds_avg": sum(warm_create_times) / len(warm_create_times),
+        "kickoff_seconds_avg": sum(kickoff_times) / len(kickoff_times),
+        "goals_per_minute": args.goals / run_seconds * 60,
+        "llm_calls": llm.calls,
+    })
+    for key, value in report.items():
+        print(f"{key:26s} {value:.3f}" if isinstance(value, float) else f"{key:26s} {value}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Cold-start import cost measured with `python -X importtime`.
+
+    python benchmarks/bench_importtime.py [--module src.crew_config_manager] [--runs 3] [--top 15]
+                                          [--budget-ms 3000] [--forbid MODULE ...] [--json PATH]
+
+Each run imports the module in a fresh interpreter and parses the importtime
+report on stderr. Prints the median total import time, the heaviest
+top-level packages (self time summed per package) and the modules that were
+imported although no agent needs them at import time. Exits with status 1
+when a forbidden module is imported or the median exceeds --budget-ms, so
+it can run as a startup regression check.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# 툴 레지스트리를 통해 에이전트가 참조할 때만 임포트되어야 하는 모듈
+DEFAULT_FORBIDDEN = [
+    "langchain_openai",
+    "mem0",
+    "src.tools.knowledge_tool",
+    "src.tools.browser_tools",
+    "src.tools.search_tools",
+    "src.tools.mem_zero_tool",
+    "src.tools.template_tools",
+    "src.tools.file_tools",
+]
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+class ImportEntry(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportEntry]:
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append(ImportEntry(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def measure(module: str) -> List[ImportEntry]:
+    """importtime entries of `import module`, without the interpreter's own startup imports."""
+    entries = _run_importtime(f"import {module}")
+    # 인터프리터 기동(site, encodings 등) 임포트는 빈 프로그램과 비교해서 제외
+    startup = {entry.module for entry in _run_importtime("pass")}
+    return [entry for entry in entries if entry.module not in startup]
+
+
+def _run_importtime(code: str) -> List[ImportEntry]:
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                               cwd=ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        sys.exit(f"{code} failed:\n{completed.stderr[-2000:]}")
+    return parse_importtime(completed.stderr)
+
+
+def total_ms(entries: List[ImportEntry]) -> float:
+    return sum(entry.cumulative_us for entry in entries if entry.depth == 0) / 1000
+
+
+def package_self_ms(entries: List[ImportEntry]) -> Dict[str, float]:
+    packages: Dict[str, float] = defaultdict(float)
+    for entry in entries:
+        packages[entry.module.split(".")[0]] += entry.self_us / 1000
+    return packages
+
+
+def forbidden_imports(entries: List[ImportEntry], forbidden: List[str]) -> List[str]:
+    imported = {entry.module for entry in entries}
+    return [name for name in forbidden
+            if name in imported or any(module.startswith(name + ".") for module in imported)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="src.crew_config_manager")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters to run; the median is reported")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, help="fail when the median import time exceeds this")
+    parser.add_argument("--forbid", nargs="*", default=DEFAULT_FORBIDDEN,
+                        help="modules that must not be imported by --module")
+    parser.add_argument("--json", help="write the report as JSON to this path")
+    args = parser.parse_args()
+
+    # 첫 실행은 .pyc 생성 비용이 섞이므로 버린다
+    measure(args.module)
+    runs = [measure(args.module) for _ in range(max(1, args.runs))]
+    totals = [total_ms(entries) for entries in runs]
+    median_index = totals.index(sorted(totals)[len(totals) // 2])
+    entries = runs[median_index]
+    packages = sorted(package_self_ms(entries).items(), key=lambda item: item[1], reverse=True)[:args.top]
+    forbidden = forbidden_imports(entries, args.forbid)
+
+    report = {
+        "module": args.module,
+        "runs": len(runs),
+        "import_ms_median": statistics.median(totals),
+        "import_ms_min": min(totals),
+        "modules_imported": len(entries),
+        "top_packages_ms": dict(packages),
+        "forbidden_imported": forbidden,
+    }
+    print(f"{'module':26s} {args.module}")
+    print(f"{'import_ms_median':26s} {report['import_ms_median']:.1f}")
+    print(f"{'import_ms_min':26s} {report['import_ms_min']:.1f}")
+    print(f"{'modules_imported':26s} {report['modules_imported']}")
+    print("\nheaviest packages (self ms)")
+    for name, ms in packages:
+        print(f"  {name:24s} {ms:8.1f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failed = False
+    if forbidden:
+        print(f"\nFAIL: imported at startup: {', '.join(forbidden)}")
+        failed = True
+    if args.budget_ms is not None and report["import_ms_median"] > args.budget_ms:
+        print(f"\nFAIL: median import time {report['import_ms_median']:.1f}ms exceeds budget {args.budget_ms:.1f}ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Deterministic stand-in for the LLM, so crews can be benchmarked without network access."""
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from crewai import BaseLLM
+
+TOOL_NAME = re.compile(r"^Tool Name: (.+)$", re.MULTILINE)
+ACTION = re.compile(r"^Action: (.+)$", re.MULTILINE)
+PLANNER_FIELD = "list_of_plans_per_task"
+TASK_GRAPH_FIELD = '"task_graph"'
+AGENT_LINE = re.compile(r"^- (\S+): ", re.MULTILINE)
+
+
+class FakeLLM(BaseLLM):
+    """Replays a fixed ReAct script instead of calling a model.
+
+    For every agent turn it calls each available tool listed in tool_inputs
+    once (in order, with the given input) and then gives a final answer.
+    Crew planning requests get a valid plan JSON, and task-graph planning gets
+    one independent task per agent plus a final task that joins them. Every call sleeps `latency`
+    seconds to stand in for model time.
+    """
+
+    def __init__(self, latency: float = 0.0, tool_inputs: Optional[Dict[str, Dict[str, Any]]] = None):
+        super().__init__(model="fake-llm")
+        self.latency = latency
+        self.tool_inputs = tool_inputs or {}
+        # crewai 는 에이전트를 복사할 때 LLM 을 얕은 복사하므로 호출 수는 공유 객체에 센다
+        self._counter = {"calls": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self) -> int:
+        return self._counter["calls"]
+
+    def call(self, messages: Union[str, List[Dict[str, str]]], tools=None, callbacks=None,
+             available_functions=None) -> str:
+        with self._lock:
+            self._counter["calls"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        text = "\n".join(str(message.get("content", "")) for message in messages)
+
+        if PLANNER_FIELD in text:
+            plan = json.dumps({PLANNER_FIELD: [
+                {"task": f"Task {i + 1}", "plan": "Use the available tools once, then answer."}
+                for i in range(max(1, len(re.findall(r"Task Number \d+", text))))
+            ]})
+            # 변환(converter) 요청은 JSON 만 기대한다
+            if "JSON" in messages[0].get("content", "") and "Final Answer" not in text:
+                return plan
+            return f"Thought: I now know the final answer\nFinal Answer: {plan}"
+
+        if TASK_GRAPH_FIELD in text:
+            agents = AGENT_LINE.findall(text)
+            tasks = [{"id": f"t{i + 1}", "agent": agent, "description": f"Research part {i + 1} of the goal.",
+                      "expected_output": "Findings", "depends_on": []} for i, agent in enumerate(agents)]
+            tasks.append({"id": "join", "agent": agents[0], "description": "Combine the findings.",
+                          "expected_output": "Final report", "depends_on": [task["id"] for task in tasks]})
+            return json.dumps({"task_graph": tasks})
+
+        available = set(name.strip() for name in TOOL_NAME.findall(text))
+        called = set(name.strip() for name in ACTION.findall(text))
+        for name, tool_input in self.tool_inputs.items():
+            if name in available and name not in called:
+                return (f"Thought: I should use {name}.\nAction: {name}\n"
+                        f"Action Input: {json.dumps(tool_input, ensure_ascii=False)}")
+        return f"Thought: I now know the final answer\nFinal Answer: Benchmark answer after {len(called)} tool calls."
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 128000
@@ -0,0 +1,69 @@
+"""Local stand-ins for the external services the tools talk to, with configurable latency."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_HTML = "<html><body>" + "".join(
+    f"<h2>Section {i}</h2><p>Stub paragraph {i}. It has two sentences.</p>" for i in range(200)) + "</body></html>"
+
+
+class StubServiceHandler(BaseHTTPRequestHandler):
+    """Serves serper (/search), browserless (/content) and mem0 (/v1/..., /v2/...) shaped responses."""
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        if self.path.split("?", 1)[0] == "/v1/ping/":
+            # MemoryClient 가 생성 시 API 키 확인용으로 호출
+            self._reply("application/json", json.dumps(
+                {"status": "ok", "org_id": "stub-org", "project_id": "stub-project", "user_email": "bench@example.com"}))
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        time.sleep(self.latency)
+        path = self.path.split("?", 1)[0]
+        if path == "/search":
+            query = body.get("q", "")
+            self._reply("application/json", json.dumps({"organic": [
+                {"title": f"{query} result {i}", "link": f"https://example.com/{i}", "snippet": f"snippet {i}"}
+                for i in range(5)
+            ]}))
+        elif path == "/content":
+            self._reply("text/html; charset=utf-8", STUB_HTML)
+        elif path in ("/v1/memories/search/", "/v2/memories/search/"):
+            self._reply("application/json", json.dumps([
+                {"id": f"stub-{i}", "memory": f"stub memory {i} for {body.get('query', '')}", "score": 0.9 - i / 10}
+                for i in range(3)
+            ]))
+        elif path == "/v1/memories/":
+            self._reply("application/json", json.dumps([{"id": "stub-added", "event": "ADD"}]))
+        else:
+            self.send_error(404)
+
+    def _reply(self, content_type, text):
+        data = text.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def start_stub_server(latency: float = 0.0):
+    """Start the stub service on a free port; returns (server, base_url)."""
+    handler = type("Handler", (StubServiceHandler,), {"latency": latency})
+    server = StubServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
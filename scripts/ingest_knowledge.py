@@ -0,0 +1,214 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.tools.html_stream import estimate_tokens, pack_chunks
+from src.tools.knowledge_tool import KnowledgeTool, document_id
+
+# 적재 대상 파일 확장자
+KNOWLEDGE_SUFFIXES = (".md", ".txt")
+MANIFEST_NAME = ".ingest_manifest.json"
+# 청크 하나의 최대 토큰 수
+DEFAULT_CHUNK_TOKENS = 500
+# 한 번에 임베딩/업서트하는 청크 수
+DEFAULT_BATCH_SIZE = 64
+# KnowledgeTool 이 add 때 남기는 마크다운 사본 (<document_id>.md) 은 이미 저장소에 있다
+TOOL_COPY_NAME = re.compile(r"^[0-9a-f]{32}$")
+
+
+def sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """Split a document on blank lines and pack the paragraphs into chunks of at most max_tokens.
+
+    Line breaks and indentation inside a paragraph are kept, so markdown lists
+    and code blocks survive chunking.
+    """
+    return list(pack_chunks(_paragraphs(text, max_tokens), max_tokens))
+
+
+def _paragraphs(text: str, max_tokens: int) -> Iterator[str]:
+    for paragraph in PARAGRAPH_BREAK.split(text.replace("\r\n", "\n")):
+        lines = [line.rstrip() for line in paragraph.strip("\n").split("\n")]
+        if not any(lines):
+            continue
+        if estimate_tokens("\n".join(lines)) <= max_tokens:
+            yield "\n".join(lines)
+            continue
+        # 한 문단이 청크보다 크면 줄 단위로 나눠서 줄 구조를 유지한다
+        part: List[str] = []
+        for line in lines:
+            if part and estimate_tokens("\n".join(part + [line])) > max_tokens:
+                yield "\n".join(part)
+                part = []
+            part.append(line)
+        if part:
+            yield "\n".join(part)
+
+
+def iter_agent_files(source: Path) -> Iterator[Tuple[str, Path]]:
+    """(agent_name, file) for every knowledge file under source/<agent_name>/."""
+    for agent_dir in sorted(path for path in source.iterdir() if path.is_dir() and not path.name.startswith(".")):
+        for path in sorted(agent_dir.rglob("*")):
+            if (path.is_file() and path.suffix.lower() in KNOWLEDGE_SUFFIXES and "chroma_db" not in path.parts
+                    and not TOOL_COPY_NAME.match(path.stem)):
+                yield agent_dir.name, path
+
+
+def load_manifest(path: Path) -> Dict[str, Dict]:
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {}
+
+
+def save_manifest(path: Path, manifest: Dict[str, Dict]):
+    # 중간에 중단돼도 매니페스트가 깨지지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def ingest(source: Path, tool: KnowledgeTool, chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+           batch_size: int = DEFAULT_BATCH_SIZE, max_workers: int = 4) -> Dict[str, int]:
+    """Embed and upsert every new or changed file under source, one collection per agent.
+
+    Chunk ids are content hashes, so identical chunks are stored once per agent
+    and re-running the ingestion is idempotent. The manifest records the hash
+    and chunk ids of each file; unchanged files are skipped and chunks that
+    disappeared from a changed or deleted file are removed. Files are committed
+    in groups of about batch_size * max_workers chunks and the manifest is
+    saved after each group, so an interrupted run resumes where it stopped.
+    """
+    manifest_path = source / MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
+    stats = {"files": 0, "skipped": 0, "chunks": 0, "duplicates": 0, "removed": 0}
+    files = list(iter_agent_files(source))
+    seen = {path.relative_to(source).as_posix() for _, path in files}
+
+    # 삭제된 파일의 청크부터 정리
+    deleted = {key: None for key in manifest if key not in seen}
+    if deleted:
+        _commit(tool, manifest_path, manifest, deleted, stats)
+
+    # key -> 새 매니페스트 항목 / (agent_name, chunk id) -> (text, source)
+    group: Dict[str, Optional[Dict]] = {}
+    group_chunks: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest") as executor:
+        for agent_name, path in files:
+            key = path.relative_to(source).as_posix()
+            text = path.read_text(encoding="utf-8", errors="replace")
+            digest = sha256(text)
+            if manifest.get(key, {}).get("sha256") == digest:
+                stats["skipped"] += 1
+                continue
+            stats["files"] += 1
+            chunk_ids = []
+            for chunk in chunk_text(text, chunk_tokens):
+                chunk_id = document_id(chunk)
+                chunk_ids.append(chunk_id)
+                if (agent_name, chunk_id) in group_chunks:
+                    stats["duplicates"] += 1
+                    continue
+                group_chunks[(agent_name, chunk_id)] = (chunk, key)
+            group[key] = {"agent": agent_name, "sha256": digest, "chunks": chunk_ids}
+            if len(group_chunks) >= batch_size * max_workers:
+                _flush(executor, tool, group_chunks, batch_size, stats)
+                _commit(tool, manifest_path, manifest, group, stats)
+                group, group_chunks = {}, {}
+        if group:
+            _flush(executor, tool, group_chunks, batch_size, stats)
+            _commit(tool, manifest_path, manifest, group, stats)
+    return stats
+
+
+def _flush(executor: ThreadPoolExecutor, tool: KnowledgeTool, chunks: Dict[Tuple[str, str], Tuple[str, str]],
+           batch_size: int, stats: Dict[str, int]):
+    """Upsert a group's chunks in parallel batches of at most batch_size per agent."""
+    by_agent: Dict[str, List[Tuple[str, Tuple[str, str]]]] = {}
+    for (agent_name, chunk_id), chunk in chunks.items():
+        by_agent.setdefault(agent_name, []).append((chunk_id, chunk))
+    batches = [(agent_name, items[start:start + batch_size])
+               for agent_name, items in by_agent.items()
+               for start in range(0, len(items), batch_size)]
+    for count in executor.map(lambda batch: _upsert(tool, *batch), batches):
+        stats["chunks"] += count
+
+
+def _commit(tool: KnowledgeTool, manifest_path: Path, manifest: Dict[str, Dict],
+            changes: Dict[str, Optional[Dict]], stats: Dict[str, int]):
+    """Delete chunks nothing references anymore, apply changes (None = deleted file) and save the manifest."""
+    for agent_name, chunk_ids in _stale_chunks(manifest, changes).items():
+        tool._get_collection(agent_name).delete(ids=chunk_ids)
+        stats["removed"] += len(chunk_ids)
+    for key, entry in changes.items():
+        if entry is None:
+            manifest.pop(key, None)
+        else:
+            manifest[key] = entry
+    save_manifest(manifest_path, manifest)
+
+
+def _stale_chunks(manifest: Dict[str, Dict], changes: Dict[str, Optional[Dict]]) -> Dict[str, List[str]]:
+    """Chunk ids of changed/deleted files that no file still references after the changes."""
+    current = {key: entry for key, entry in manifest.items() if key not in changes}
+    current.update({key: entry for key, entry in changes.items() if entry is not None})
+    referenced = {(entry["agent"], chunk_id) for entry in current.values() for chunk_id in entry["chunks"]}
+    stale: Dict[str, List[str]] = {}
+    for key in changes:
+        entry = manifest.get(key)
+        if entry is None:
+            continue
+        for chunk_id in entry["chunks"]:
+            if (entry["agent"], chunk_id) not in referenced and chunk_id not in stale.get(entry["agent"], []):
+                stale.setdefault(entry["agent"], []).append(chunk_id)
+    return stale
+
+
+def _upsert(tool: KnowledgeTool, agent_name: str, batch: List[Tuple[str, Tuple[str, str]]]) -> int:
+    ids = [chunk_id for chunk_id, _ in batch]
+    documents = [chunk for _, (chunk, _) in batch]
+    now = time.time()
+    metadatas = [{"agent_name": agent_name, "source": source, "timestamp": now, "has_feedback": False}
+                 for _, (_, source) in batch]
+    embeddings = tool._embed_many(documents)
+    tool._get_collection(agent_name).upsert(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+    return len(ids)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="에이전트별 지식 디렉토리(<source>/<agent>/*.md|*.txt)를 벡터 저장소에 적재")
+    parser.add_argument("source", nargs="?", default="knowledge", help="에이전트별 하위 디렉토리를 가진 지식 폴더")
+    parser.add_argument("--knowledge-dir", default="knowledge", help="KnowledgeTool 저장소 위치")
+    parser.add_argument("--chunk-tokens", type=int, default=DEFAULT_CHUNK_TOKENS)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    tool = KnowledgeTool(knowledge_dir=args.knowledge_dir)
+    start_time = time.perf_counter()
+    stats = ingest(Path(args.source), tool, args.chunk_tokens, args.batch_size, args.workers)
+    stats["seconds"] = round(time.perf_counter() - start_time, 2)
+    if hasattr(tool.embedder, "stats"):
+        stats["embedding_cache"] = tool.embedder.stats()
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,48 @@
 from typing import List, Dict
 from mem0 import MemoryClient
 import os
+import sys
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.tools.mem0_buffer import Mem0WriteBuffer
+
 
 def initialize_agent_knowledge():
     load_dotenv()
     
     client = MemoryClient(api_key=os.environ.get('MEM_ZERO_API_KEY'))  # Initialize memory client (Cloud API mode)
+    # agent_id -> 지식(메시지 목록) 리스트. 마지막에 에이전트별 한 번의 add 로 일괄 전송
+    knowledge: Dict[str, List[List[Dict]]] = {}
     
     # # Knowledge initialization for Senior Idea Analyst
     # idea_analyst_knowledge = [
     #     {"role": "user", "content": "What makes a great product idea?"},
     #     {"role": "assistant", "content": "A great product idea solves a real pain point, has a clear target market, and offers unique value. It should be feasible to implement and have potential for growth."}
     # ]
-    # client.add(idea_analyst_knowledge, agent_id="senior_idea_analyst")
+    # knowledge.setdefault("senior_idea_analyst", []).append(idea_analyst_knowledge)
 
     # # Knowledge initialization for Senior Communications Strategist
     # strategist_knowledge = [
     #     {"role": "user", "content": "Explain the Golden Circle method."},
     #     {"role": "assistant", "content": "The Golden Circle by Simon Sinek focuses on WHY (purpose), HOW (process), and WHAT (product). Starting with 'why' creates emotional connections and inspires action."}
     # ]
-    # client.add(strategist_knowledge, agent_id="senior_strategist")
+    # knowledge.setdefault("senior_strategist", []).append(strategist_knowledge)
 
     # # Knowledge initialization for Senior React Engineer
     # react_engineer_knowledge = [
     #     {"role": "user", "content": "What are the key elements of a high-converting landing page?"},
     #     {"role": "assistant", "content": "A high-converting landing page needs clear value proposition, intuitive navigation, mobile responsiveness, fast loading times, and strategic CTAs. Using Tailwind CSS for styling ensures consistent, beautiful design."}
     # ]
-    # client.add(react_engineer_knowledge, agent_id="senior_react_engineer")
+    # knowledge.setdefault("senior_react_engineer", []).append(react_engineer_knowledge)
 
     # # Knowledge initialization for Senior Content Editor
     # content_editor_knowledge = [
     #     {"role": "user", "content": "What makes website content engaging?"},
     #     {"role": "assistant", "content": "Engaging content is clear, concise, and value-driven. It uses active voice, maintains consistent tone, includes compelling headlines, and focuses on benefits rather than features."}
     # ]
-    # client.add(content_editor_knowledge, agent_id="senior_content_editor")
+    # knowledge.setdefault("senior_content_editor", []).append(content_editor_knowledge)
 
     # # Knowledge initialization for Senior Tax Accountant (세무사)
     # tax_accountant_knowledge = [
@@ -53,7 +60,7 @@ def initialize_agent_knowledge():
     #     - 업종별 제한: 제조업은 지방세 감면 제외, IT 서비스업은 여성 대표 + 지방 감면 동시 적용 가능
     #     """}
     # ]
-    # client.add(tax_accountant_knowledge, agent_id="senior_tax_accountant")
+    # knowledge.setdefault("senior_tax_accountant", []).append(tax_accountant_knowledge)
 
     # Knowledge initialization for Senior Proposal Expert (제안서 전문가)
     proposal_expert_knowledge = [
@@ -76,7 +83,12 @@ def initialize_agent_knowledge():
         - 검토 프로세스: 일반 기업 최소 1회, 공공기관 최소 2회 내부 검토 필수
         """}
     ]
-    client.add(proposal_expert_knowledge, agent_id="senior_proposal_expert")
+    knowledge.setdefault("senior_proposal_expert", []).append(proposal_expert_knowledge)
+
+    buffer = Mem0WriteBuffer(client)
+    buffer.seed(knowledge)
+    buffer.close()
+    print(f"지식 초기화 완료: {buffer.stats()}")
 
 if __name__ == "__main__":
-    initialize_agent_knowledge() 
\ No newline at end of file
+    initialize_agent_knowledge()
@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.crew_config_manager import CrewConfigManager
+from src.mcp_pool import MCPServerPool
+
+
+def report_mcp_startup_timings(agents_config_path="config/agents.yaml", mcp_config_path="config/mcp.json"):
+    # before: mcp.json 의 모든 서버를 기동 (이전 __init__ 동작)
+    eager_pool = MCPServerPool()
+    eager = CrewConfigManager(agents_config_path=agents_config_path, mcp_config_path=mcp_config_path, mcp_pool=eager_pool)
+    eager._start_mcp_servers(list(eager.mcp_servers))
+    eager_pool.shutdown()
+
+    # after: agents.yaml 이 참조하는 서버만 기동
+    start_time = time.perf_counter()
+    lazy_pool = MCPServerPool()
+    lazy = CrewConfigManager(agents_config_path=agents_config_path, mcp_config_path=mcp_config_path, mcp_pool=lazy_pool)
+    init_time = time.perf_counter() - start_time
+    lazy._start_mcp_servers(lazy._required_mcp_servers())
+    lazy_pool.shutdown()
+
+    print("\n== MCP 서버 기동 시간 ==")
+    print(f"{'server':<20}{'before':>10}{'after':>10}")
+    for server_name in eager.mcp_servers:
+        before = eager.mcp_startup_times.get(server_name)
+        after = lazy.mcp_startup_times.get(server_name)
+        before_str = f"{before:.2f}s" if before is not None else "-"
+        after_str = f"{after:.2f}s" if after is not None else "skipped"
+        print(f"{server_name:<20}{before_str:>10}{after_str:>10}")
+    print(f"{'total':<20}{sum(eager.mcp_startup_times.values()):>9.2f}s{sum(lazy.mcp_startup_times.values()):>9.2f}s")
+    print(f"\nCrewConfigManager.__init__: {init_time:.2f}s (MCP 서버 미기동)")
+    print(f"참조된 MCP 서버: {', '.join(lazy._required_mcp_servers())}")
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    report_mcp_startup_timings()
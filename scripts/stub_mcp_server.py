@@ -0,0 +1,28 @@
+"""Minimal stdio MCP server used by tests and benchmarks.
+
+    python scripts/stub_mcp_server.py [--latency SECONDS]
+"""
+import argparse
+import time
+
+from mcp.server.fastmcp import FastMCP
+
+
+def build_server(latency: float = 0.0) -> FastMCP:
+    server = FastMCP("stub")
+
+    @server.tool()
+    def echo(text: str) -> str:
+        """Return the given text unchanged."""
+        if latency:
+            time.sleep(latency)
+        return text
+
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to sleep in every tool call")
+    args = parser.parse_args()
+    build_server(args.latency).run(transport="stdio")
@@ -0,0 +1,172 @@
+"""Run many goals through one warm CrewConfigManager.
+
+    python -m src.batch_runner goals.jsonl [-o results.jsonl] [--workers 2] [--timeout 900]
+                               [--mode sequential|parallel]
+
+Input is JSONL (or "-" for stdin). Each line is {"id": ..., "goal": ...}.
+Lines shaped like requests.jsonl ({"request_id", "title", "body"}) and plain
+text lines are accepted too. Results are streamed to the output JSONL as
+goals finish, and a summary is printed at the end.
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional, TextIO
+
+# 목표 하나의 기본 제한 시간(초)
+DEFAULT_GOAL_TIMEOUT = 900.0
+DEFAULT_WORKERS = 2
+
+
+class GoalTimeout(Exception):
+    """Raised by run_with_timeout; thread is the goal thread, which is still running."""
+
+    def __init__(self, message: str, thread: Optional[threading.Thread] = None):
+        super().__init__(message)
+        self.thread = thread
+
+
+def parse_goals(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """{"id", "goal"} for every non-empty input line."""
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            entry = line
+        if not isinstance(entry, dict):
+            yield {"id": str(line_number), "goal": str(entry)}
+            continue
+        goal = entry.get("goal") or "\n\n".join(str(entry[key]) for key in ("title", "body") if entry.get(key))
+        goal_id = entry.get("id") or entry.get("request_id") or line_number
+        yield {"id": str(goal_id), "goal": goal}
+
+
+def run_with_timeout(fn: Callable[[], str], timeout: Optional[float]) -> str:
+    """Run fn on a daemon thread and wait at most timeout seconds.
+
+    A crew cannot be interrupted, so on timeout its thread keeps running in the
+    background until it finishes on its own. GoalTimeout.thread is that thread;
+    callers with a fixed number of workers should join it before starting the
+    next goal so a timed-out goal keeps holding its slot.
+    """
+    result = {}
+
+    def target():
+        try:
+            result["output"] = fn()
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target, name="goal", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise GoalTimeout(f"goal did not finish within {timeout:g}s", thread)
+    if "error" in result:
+        raise result["error"]
+    return result["output"]
+
+
+class BatchRunner:
+    """Bounded worker pool running goals with run_goal(goal) -> output and writing result JSONL."""
+
+    def __init__(self, run_goal: Callable[[str], str], output: TextIO, workers: int = DEFAULT_WORKERS,
+                 timeout: Optional[float] = DEFAULT_GOAL_TIMEOUT):
+        self.run_goal = run_goal
+        self.output = output
+        self.workers = workers
+        self.timeout = timeout
+        self.counts = {"ok": 0, "error": 0, "timeout": 0}
+        self.durations = []
+        self._lock = threading.Lock()
+
+    def run(self, goals: Iterable[Dict[str, str]]) -> Dict[str, float]:
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch") as executor:
+            # 입력을 미리 다 읽지 않도록 대기 작업 수를 workers 의 2배로 제한
+            slots = threading.BoundedSemaphore(self.workers * 2)
+            for goal in goals:
+                slots.acquire()
+                future = executor.submit(self._run_one, goal)
+                future.add_done_callback(lambda _: slots.release())
+        return self.summary(time.perf_counter() - start_time)
+
+    def _run_one(self, goal: Dict[str, str]):
+        record = {"id": goal["id"], "goal": goal["goal"]}
+        start_time = time.perf_counter()
+        abandoned = None
+        try:
+            record["output"] = run_with_timeout(lambda: self.run_goal(goal["goal"]), self.timeout)
+            record["status"] = "ok"
+        except GoalTimeout as e:
+            record.update(status="timeout", error=str(e))
+            abandoned = e.thread
+        except Exception as e:
+            record.update(status="error", error=f"{type(e).__name__}: {e}")
+        record["seconds"] = round(time.perf_counter() - start_time, 3)
+        with self._lock:
+            self.counts[record["status"]] += 1
+            self.durations.append(record["seconds"])
+            self.output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.output.flush()
+        # 시간 초과된 목표도 끝날 때까지 워커 자리를 차지한다 (workers 보다 많은 crew 가 동시에 돌지 않도록)
+        if abandoned is not None:
+            abandoned.join()
+
+    def summary(self, wall_seconds: float) -> Dict[str, float]:
+        total = sum(self.counts.values())
+        return {
+            "goals": total,
+            **self.counts,
+            "wall_seconds": round(wall_seconds, 3),
+            "goals_per_minute": round(total / wall_seconds * 60, 3) if wall_seconds else 0.0,
+            "avg_goal_seconds": round(sum(self.durations) / total, 3) if total else 0.0,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JSONL/stdin 의 목표들을 하나의 CrewConfigManager 로 일괄 실행")
+    parser.add_argument("input", help="목표 JSONL 파일 ('-' 이면 stdin)")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl", help="결과 JSONL ('-' 이면 stdout)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="동시에 실행하는 목표 수")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_GOAL_TIMEOUT, help="목표별 제한 시간(초)")
+    parser.add_argument("--mode", choices=("sequential", "parallel"), default="sequential")
+    parser.add_argument("--max-concurrency", type=int, default=3, help="parallel 모드의 목표당 동시 태스크 수")
+    parser.add_argument("--agents-config", default="config/agents.yaml")
+    parser.add_argument("--mcp-config", default="config/mcp.json")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    from src.crew_config_manager import CrewConfigManager
+
+    load_dotenv()
+    start_time = time.perf_counter()
+    manager = CrewConfigManager(agents_config_path=args.agents_config, mcp_config_path=args.mcp_config)
+    # MCP 서버는 첫 목표 전에 한 번만 기동
+    manager._start_mcp_servers(manager._required_mcp_servers())
+    startup_seconds = time.perf_counter() - start_time
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    try:
+        runner = BatchRunner(lambda goal: manager.run_goal(goal, args.mode, args.max_concurrency),
+                             output, workers=args.workers, timeout=args.timeout)
+        summary = runner.run(parse_goals(source))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    summary["startup_seconds"] = round(startup_seconds, 3)
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+    return 0 if summary["error"] == 0 and summary["timeout"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
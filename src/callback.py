@@ -1,27 +1,165 @@
+import atexit
+import gzip
 import os
 import json
+import queue
+import threading
 import time
 from datetime import datetime
 
+from src.telemetry import get_telemetry
+
+# 쓰기 스레드가 한 번에 모아서 기록하는 최대 레코드 수
+LOG_BATCH_SIZE = 256
+# 큐가 비어 있어도 이 시간(초)마다 파일을 flush
+LOG_FLUSH_INTERVAL = 1.0
+# 대기 레코드 상한 (초과분은 버리고 dropped 로 집계)
+LOG_MAX_QUEUE = 10000
+# close() 가 쓰기 스레드를 기다리는 최대 시간(초)
+LOG_CLOSE_TIMEOUT = 5.0
+_STOP = object()
+
+
+class JsonlLogWriter:
+    """Append-only JSONL writer fed through a bounded queue.
+
+    write() never touches the file; a background thread drains the queue in
+    batches, optionally gzip-compressed, and close() (also run at exit until
+    the writer is closed) writes everything still queued.
+    """
+
+    def __init__(self, path, compress=False, max_queue=LOG_MAX_QUEUE, batch_size=LOG_BATCH_SIZE,
+                 flush_interval=LOG_FLUSH_INTERVAL, echo=False):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.echo = echo
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._file = gzip.open(path, "at", encoding="utf-8") if compress else open(path, "a", encoding="utf-8")
+        self._closed = False
+        self._thread = threading.Thread(target=self._drain_loop, name="jsonl-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, record, message=None):
+        """Queue one record (and an optional console message); drops it if the queue is full."""
+        if self._closed:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait((record, message))
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain_loop(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in batch)
+            records = [item for item in batch if item is not _STOP]
+            try:
+                self._write_batch(records)
+            except OSError as e:
+                # 디스크 오류 등은 해당 배치만 버리고 계속 비운다 (큐가 막히지 않도록)
+                self.dropped += len(records)
+                print(f"Warning: failed to write {len(records)} log records to {self.path}: {e}")
+            if stop:
+                return
+
+    def _write_batch(self, batch):
+        if not batch:
+            return
+        lines = []
+        for record, message in batch:
+            lines.append(json.dumps(record, ensure_ascii=False, default=str))
+            if self.echo and message:
+                print(message)
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        self.written += len(batch)
+
+    def close(self, timeout=LOG_CLOSE_TIMEOUT):
+        """Write all queued records and close the file, waiting at most timeout seconds for the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        # 서버는 작업마다 writer 를 만들므로 닫힌 writer 는 atexit 에서 빼서 참조를 놓아준다
+        atexit.unregister(self.close)
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # 쓰기 스레드가 멈춰 있으면 파일은 그 스레드가 쓰는 중일 수 있으므로 닫지 않는다
+            print(f"Warning: log writer did not finish within {timeout:g}s: {self.path}")
+            return
+        # 쓰기 스레드가 IO 오류 등으로 먼저 종료됐다면 남은 레코드는 기록되지 못한다
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                self.dropped += 1
+        self._file.close()
+        if self.dropped:
+            print(f"Warning: {self.dropped} log records were dropped (queue full): {self.path}")
+
+
 class CallbackHandler:
-    """Utility class to handle step callbacks in CrewAI agents"""
+    """Utility class to handle step callbacks in CrewAI agents
+
+    Steps are written to one JSONL file per session (session.jsonl, or
+    session.jsonl.gz with compress=True) by a background writer, so the agent
+    thread only formats the record and enqueues it.
+    """
     
-    def __init__(self, log_dir="logs"):
+    def __init__(self, log_dir="logs", compress=False, echo=True, max_queue=LOG_MAX_QUEUE, session_name=None):
         self.log_dir = log_dir
         os.makedirs(log_dir, exist_ok=True)
-        self.current_session = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # 동시에 여러 세션을 여는 경우(서버 모드) session_name 으로 디렉토리를 구분
+        self.current_session = session_name or datetime.now().strftime("%Y%m%d_%H%M%S")
         self.session_dir = os.path.join(log_dir, self.current_session)
         os.makedirs(self.session_dir, exist_ok=True)
         
         # Create a session log file
-        self.session_log = os.path.join(self.session_dir, "session.log")
-        with open(self.session_log, "w") as f:
-            f.write(f"Session started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self.session_log = os.path.join(self.session_dir, "session.jsonl.gz" if compress else "session.jsonl")
+        self.writer = JsonlLogWriter(self.session_log, compress=compress, max_queue=max_queue, echo=echo)
+        self.writer.write({"event": "session_start", "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S')})
+        # 스텝 소요 시간 = 같은 스레드의 직전 콜백 이후 경과 시간. parallel 모드에서는 태스크마다
+        # 다른 스레드에서 동시에 콜백이 오므로 스레드별로 기록한다. 기준 시각이 없는
+        # (핸들러를 만든 스레드가 아닌) 스레드의 첫 스텝은 step_seconds 를 null 로 남긴다
+        self.telemetry = get_telemetry()
+        self._last_step_times = {threading.get_ident(): time.perf_counter()}
+        self._step_lock = threading.Lock()
+        # 스텝 레코드를 실시간으로 받는 함수들 (예: 서버의 SSE 스트림)
+        self.listeners = []
+
+    def add_listener(self, listener):
+        """Call listener(record) for every step record as soon as it is produced."""
+        self.listeners.append(listener)
     
     def step_callback(self, step, agent_name):
         """Callback function for CrewAI agents to log their steps"""
         # Get timestamp
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        now = time.perf_counter()
+        with self._step_lock:
+            last_step_time = self._last_step_times.get(threading.get_ident())
+            self._last_step_times[threading.get_ident()] = now
+        step_seconds = now - last_step_time if last_step_time is not None else None
+        if step_seconds is not None:
+            self.telemetry.record("step", agent_name, step_seconds)
         
         # Check if step is an AgentFinish object or has step_number attribute
         is_agent_finish = not hasattr(step, 'step_number')
@@ -38,32 +176,31 @@ class CallbackHandler:
             output = step.output
             task = step.task
             step_number = step.step_number
+        task, output = str(task), str(output)
         
         log_message += f"\nTask: {task[:150]}..." if len(task) > 150 else f"\nTask: {task}"
         log_message += f"\nOutput: {output[:150]}..." if len(output) > 150 else f"\nOutput: {output}"
         
-        # Print to console
-        print(log_message)
-        
-        # Write to session log
-        with open(self.session_log, "a") as f:
-            f.write(log_message + "\n")
-        
-        # Save step details to a JSON file
-        step_file = os.path.join(self.session_dir, f"{agent_name.replace(' ', '_')}_step_{step_number}.json")
-        step_data = {
+        # 파일 기록과 콘솔 출력은 쓰기 스레드가 처리
+        record = {
+            "event": "step",
             "timestamp": timestamp,
             "agent_name": agent_name,
             "step_number": step_number,
+            "step_seconds": round(step_seconds, 3) if step_seconds is not None else None,
             "task": task,
             "output": output
         }
-        
-        with open(step_file, "w") as f:
-            json.dump(step_data, f, indent=2)
+        self.writer.write(record, log_message)
+        for listener in self.listeners:
+            listener(record)
         
         return step
 
+    def close(self):
+        """Flush the session log (also done automatically at exit)."""
+        self.writer.close()
+
 def print_progress_bar(iteration, total, prefix='', suffix='', length=50, fill='█'):
     """
     Call in a loop to create terminal progress bar
@@ -83,6 +220,7 @@ def timed_execution(func):
         result = func(*args, **kwargs)
         end_time = time.time()
         execution_time = end_time - start_time
+        get_telemetry().record("function", func.__name__, execution_time)
         print(f"Function '{func.__name__}' took {execution_time:.2f} seconds to execute")
         return result
     return wrapper 
\ No newline at end of file
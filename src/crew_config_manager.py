@@ -1,65 +1,104 @@
 import yaml
 import json
-import os
-from typing import Dict, List, Optional
-from pathlib import Path
-import openai
-from crewai import Agent, Task, Crew, Process
-from src.tools.search_tools import SearchInternetTool
-from src.tools.file_tools import FileTools
-from src.tools.browser_tools import ScrapeWebsiteTool
-from mcp import StdioServerParameters
-from crewai_tools import MCPServerAdapter
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain.schema import HumanMessage, SystemMessage
-from src.tools.mem_zero_tool import MemZeroTool
-from mem0 import MemoryClient
+import threading
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from crewai import Agent, Task, Crew, Process, LLM
+from src.mcp_pool import MCPServerPool, get_mcp_pool
+from src.telemetry import get_telemetry, instrument_crewai
+from src.task_graph import (DEFAULT_MAX_CONCURRENCY, TASK_GRAPH_PROMPT, TaskGraphResult, TaskNode,
+                            dependency_context, parse_task_graph, run_task_graph)
+from src.tools.registry import ToolRegistry, get_tool_registry, parse_tool_specs
+
+if TYPE_CHECKING:
+    from mem0 import MemoryClient
 
 class CrewConfigManager:
-    def __init__(self, agents_config_path: str = "config/agents.yaml", mcp_config_path: str = "config/mcp.json", knol_task_path: str = "config/knol_task.yaml"):
+    def __init__(self, agents_config_path: str = "config/agents.yaml", mcp_config_path: str = "config/mcp.json", knol_task_path: str = "config/knol_task.yaml", mcp_pool: Optional[MCPServerPool] = None,
+                 llm: Any = None, mem0_client: Optional["MemoryClient"] = None, tools: Optional[Dict[str, Any]] = None,
+                 cache_agents: bool = True):
         self.agents_config_path = agents_config_path
         self.mcp_config_path = mcp_config_path
         self.knol_task_path = knol_task_path
         self.agents_config = self._load_agents_config()
-        self.mcp_tools = self._load_mcp_tools()
+        self.mcp_servers = self._load_mcp_config()
+        # MCP 서버는 에이전트가 처음 참조할 때 프로세스 공용 풀에서 기동/재사용한다 (xxx(mcp))
+        self.mcp_pool = mcp_pool or get_mcp_pool()
+        self.mcp_tools: Dict[str, List] = {}
         #self.knol_task_config = self._load_knol_task_config()
-        self.mem0_client = MemoryClient(api_key=os.environ.get('MEM_ZERO_API_KEY'))
-        self.base_tools = {
-            "search_internet": SearchInternetTool(),
-            "write_file": FileTools.write_file,
-            "scrape_website": ScrapeWebsiteTool(),
-            #"knowledge_management": KnowledgeTool()
-            "knowledge_management": MemZeroTool()
-        }
+        # llm 을 지정하면 에이전트/플래너/매니저 모두 이 LLM 을 사용 (벤치마크의 가짜 LLM 등)
+        self.llm = llm
+        # None 이면 MemZeroTool 이 프로세스 공용 MemoryClient 를 사용
+        self.mem0_client = mem0_client
+        # 툴은 에이전트가 참조할 때 처음 임포트/생성되고 프로세스 공용 레지스트리에서 재사용된다
+        # (src/tools/registry.py). 이 매니저에서만 바꾸는 툴은 하위 레지스트리에 등록
+        self.tools = ToolRegistry(parent=get_tool_registry())
+        if mem0_client is not None:
+            self.tools.register("knowledge_management", self._create_mem_zero_tool)
+        for tool_name, tool in (tools or {}).items():
+            self.tools.register(tool_name, tool)
+        # 목표마다 바뀌는 것은 태스크뿐이므로 에이전트 템플릿과 매니저 LLM 은 재사용
+        self.cache_agents = cache_agents
+        self._agent_templates: Optional[List[Agent]] = None
+        self._agent_templates_key = None
+        # 서버/배치 워커가 동시에 create_crew 를 호출해도 템플릿은 한 번만 만든다
+        self._agent_templates_lock = threading.Lock()
+        self._manager_llm = None
+        self._planner_llm = None
+
+    def _create_mem_zero_tool(self, **options):
+        from src.tools.mem_zero_tool import MemZeroTool
+        return MemZeroTool(client=self.mem0_client, **options)
 
     def _load_agents_config(self) -> Dict:
         """Load agents configuration from YAML file."""
         with open(self.agents_config_path, 'r') as f:
             return yaml.safe_load(f)
 
-    def _load_mcp_tools(self) -> Dict[str, List]:
-        """Load MCP tools using MCPServerAdapter, keeping tools separate by server."""
+    def _load_mcp_config(self) -> Dict[str, Dict]:
+        """Load MCP server definitions from JSON without starting any server."""
         try:
             with open(self.mcp_config_path, 'r') as f:
-                mcp_config = json.load(f)
-                tools = {}
-                
-                # Get MCP tools for each server separately
-                for server_name, server_config in mcp_config.get("mcpServers", {}).items():
-                    mcp_server_params = StdioServerParameters(
-                        command=server_config.get("command", "npx"),
-                        args=server_config.get("args", ["@playwright/mcp@latest"]),
-                        env=os.environ  # 필요시 server_config에서 env를 받아올 수도 있음
-                    )
-                    mcp_server_adapter = MCPServerAdapter(mcp_server_params)
-                    tools[server_name] = mcp_server_adapter.tools
-                    
-                return tools
+                return json.load(f).get("mcpServers", {})
         except (FileNotFoundError, json.JSONDecodeError):
             print(f"Warning: Could not load MCP config from {self.mcp_config_path}")
             return {}
 
+    def _get_mcp_tools(self, server_name: str) -> List:
+        """Start an MCP server on first use and return its tools."""
+        if server_name not in self.mcp_tools:
+            self._start_mcp_servers([server_name])
+        return self.mcp_tools[server_name]
+
+    def _required_mcp_servers(self) -> List[str]:
+        """MCP server names referenced as xxx(mcp) by any configured agent."""
+        server_names = []
+        for agent_config in self.agents_config.values():
+            for tool_name, _ in parse_tool_specs(agent_config.get("tools")):
+                if tool_name.endswith("(mcp)") and tool_name[:-5] not in server_names:
+                    server_names.append(tool_name[:-5])
+        return server_names
+
+    def _start_mcp_servers(self, server_names: List[str]):
+        """Acquire MCP servers from the pool; missing ones start concurrently with per-server timeouts."""
+        servers = {}
+        for server_name in server_names:
+            if server_name in self.mcp_servers:
+                servers[server_name] = self.mcp_servers[server_name]
+            else:
+                print(f"Warning: MCP server '{server_name}' is not defined in {self.mcp_config_path}")
+                self.mcp_tools[server_name] = []
+        if servers:
+            self.mcp_tools.update(self.mcp_pool.acquire(servers))
+
+    @property
+    def mcp_startup_times(self) -> Dict[str, float]:
+        return self.mcp_pool.startup_times
+
+    def close(self):
+        """Drop this manager's MCP tool references; the shared pool owns the server processes."""
+        self.mcp_tools.clear()
+
     def _load_knol_task_config(self) -> Dict:
         """Load knowledge task configuration from YAML file."""
         try:
@@ -71,42 +110,86 @@ class CrewConfigManager:
 
     def _get_tools_for_agent(self, agent_config: Dict) -> List:
         """Get tools list for an agent based on their configuration."""
-        tools = []
-        if "tools" in agent_config:
-            tool_names = [t.strip() for t in agent_config["tools"].split(",")]
-            
-            for tool_name in tool_names:
-                if tool_name in self.base_tools:
-                    tools.append(self.base_tools[tool_name])
-                elif tool_name.endswith("(mcp)"):
-                    # Extract the actual tool name without (mcp)
-                    mcp_server_name = tool_name[:-5]  # Remove (mcp)
-                    if mcp_server_name in self.mcp_tools:
-                        # Add all tools from the specified MCP server
-                        tools.extend(self.mcp_tools[mcp_server_name])
+        tools, tool_names = [], set()
+        # "a, b(mcp)" 문자열 또는 [a, {b: {옵션: 값}}] 목록. 옵션이 같은 툴은 에이전트끼리 같은 인스턴스를 공유
+        for tool_name, options in parse_tool_specs(agent_config.get("tools")):
+            if tool_name in self.tools:
+                tools.append(self.tools.get(tool_name, options))
+                tool_names.add(tool_name)
+            elif tool_name.endswith("(mcp)"):
+                # Extract the actual tool name without (mcp)
+                mcp_server_name = tool_name[:-5]  # Remove (mcp)
+                # Add all tools from the specified MCP server (started on first use)
+                tools.extend(self._get_mcp_tools(mcp_server_name))
+            else:
+                print(f"Warning: Unknown tool '{tool_name}' in {self.agents_config_path}")
         # knowledge_management 툴은 항상 추가 [off]
-        tools.append(self.base_tools["knowledge_management"])
+        if "knowledge_management" not in tool_names:
+            tools.append(self.tools.get("knowledge_management"))
         return tools
 
-    def create_crew(self, topic: str) -> Crew:
-        """Create a Crew instance based on the topic using CrewAI's built-in planning."""
-        # Create agents from configuration
-        agents = []
-        for agent_name, agent_config in self.agents_config.items():
-            # Get tools for this agent
-            tools = self._get_tools_for_agent(agent_config)
-            
-            # Create agent
-            agent = Agent(
-                role=agent_name,
-                goal=agent_config["goal"],
-                backstory=agent_config["backstory"],
-                allow_delegation=True,
-                tools=tools,
-                **{k: v for k, v in agent_config.items() 
-                   if k not in ["role", "goal", "backstory", "tools"]}
+    def _get_agent_templates(self) -> List[Agent]:
+        """Agents built from agents.yaml, reused until the resolved tool objects change.
+
+        Templates are never run themselves; create_crew hands out copies.
+        """
+        # MCP 서버가 재시작되면 툴 객체가 바뀌므로 템플릿을 다시 만든다
+        with self._agent_templates_lock:
+            tools_key = tuple((name, tuple(id(tool) for tool in tools))
+                              for name, tools in sorted(self.mcp_tools.items()))
+            if self._agent_templates is None or tools_key != self._agent_templates_key:
+                self._agent_templates = [self._build_agent(agent_name, agent_config)
+                                         for agent_name, agent_config in self.agents_config.items()]
+                self._agent_templates_key = tools_key
+            return self._agent_templates
+
+    def _build_agent(self, agent_name: str, agent_config: Dict) -> Agent:
+        # Get tools for this agent
+        tools = self._get_tools_for_agent(agent_config)
+
+        # Create agent
+        return Agent(
+            role=agent_name,
+            goal=agent_config["goal"],
+            backstory=agent_config["backstory"],
+            allow_delegation=True,
+            tools=tools,
+            **({"llm": self.llm} if self.llm is not None else {}),
+            **{k: v for k, v in agent_config.items() 
+               if k not in ["role", "goal", "backstory", "tools"]}
+        )
+
+    def _get_manager_llm(self):
+        """LLM for the manager, created once per CrewConfigManager."""
+        if self._manager_llm is None and self.llm is not None:
+            self._manager_llm = self.llm
+        elif self._manager_llm is None:
+            from langchain_openai import ChatOpenAI
+            self._manager_llm = ChatOpenAI(
+                model="gpt-4.1",
+                temperature=0.7
             )
-            agents.append(agent)
+        return self._manager_llm
+
+    def create_crew(self, topic: str, step_callback=None) -> Crew:
+        """Create a Crew instance based on the topic using CrewAI's built-in planning.
+
+        step_callback(step, agent_name), e.g. CallbackHandler.step_callback, is attached to every agent.
+        """
+        # 필요한 MCP 서버를 풀에서 가져온다 (없거나 죽은 서버만 병렬로 기동)
+        self._start_mcp_servers(self._required_mcp_servers())
+        # 에이전트/LLM/툴 실행 시간을 telemetry 로 수집
+        instrument_crewai()
+
+        # 에이전트는 캐시된 템플릿의 복사본 (실행 상태/토큰 집계는 복사본마다 새로 시작)
+        if self.cache_agents:
+            agents = [template.copy() for template in self._get_agent_templates()]
+        else:
+            agents = [self._build_agent(agent_name, agent_config)
+                      for agent_name, agent_config in self.agents_config.items()]
+        if step_callback is not None:
+            for agent in agents:
+                agent.step_callback = partial(step_callback, agent_name=agent.role)
 
         # Create initial task
         initial_task = Task(
@@ -115,18 +198,74 @@ class CrewConfigManager:
             expected_output="목표 달성을 위한 상세 실행 계획과 각 에이전트의 역할이 포함된 문서"
         )
 
-        # Create LLM for the manager
-        llm = ChatOpenAI(
-            model="gpt-4.1",
-            temperature=0.7
-        )
-
         # Create and return the crew with planning
         return Crew(
             agents=agents,
             tasks=[initial_task],
-            manager_llm=llm,
+            manager_llm=self._get_manager_llm(),
             process=Process.sequential,
             verbose=True,
-            planning=True
+            planning=True,
+            **({"planning_llm": self.llm} if self.llm is not None else {})
         )
+
+    def _get_planner_llm(self):
+        """LLM that splits a goal into a task graph (parallel mode)."""
+        if self._planner_llm is None:
+            # llm 은 모델 이름 문자열일 수도 있다 (Agent/Crew 는 받아 주지만 .call 은 LLM 객체에만 있음)
+            if isinstance(self.llm, str):
+                self._planner_llm = LLM(model=self.llm, temperature=0.2)
+            else:
+                self._planner_llm = self.llm or LLM(model="gpt-4.1", temperature=0.2)
+        return self._planner_llm
+
+    def plan_task_graph(self, topic: str) -> List[TaskNode]:
+        """Ask the planner LLM for a task DAG over the configured agents."""
+        agents = "\n".join(f"- {agent_name}: {agent_config['goal'].strip()}"
+                           for agent_name, agent_config in self.agents_config.items())
+        answer = self._get_planner_llm().call(
+            [{"role": "user", "content": TASK_GRAPH_PROMPT.format(agents=agents, goal=topic)}])
+        return parse_task_graph(answer, self.agents_config)
+
+    def run_task_graph(self, topic: str, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                       nodes: Optional[List[TaskNode]] = None, step_callback=None) -> TaskGraphResult:
+        """Parallel mode: plan a task DAG and run independent tasks concurrently.
+
+        Each task runs as a one-task crew with its own copy of the agent, and
+        receives the outputs of the tasks it depends on in its description.
+        Pass nodes to run an already planned graph.
+        """
+        self._start_mcp_servers(self._required_mcp_servers())
+        instrument_crewai()
+        nodes = nodes or self.plan_task_graph(topic)
+        templates = {agent.role: agent for agent in self._get_agent_templates()}
+
+        def execute(node: TaskNode, dependency_outputs: Dict[str, str]) -> str:
+            agent = templates[node.agent].copy()
+            if step_callback is not None:
+                agent.step_callback = partial(step_callback, agent_name=agent.role)
+            description = f"전체 목표: {topic}\n\n{node.description}"
+            if dependency_outputs:
+                description += f"\n\n참고할 선행 작업 결과:\n{dependency_context(dependency_outputs)}"
+            task = Task(description=description, expected_output=node.expected_output, agent=agent)
+            crew = Crew(agents=[agent], tasks=[task], process=Process.sequential, verbose=False)
+            output = crew.kickoff().raw
+            get_telemetry().record_crew_usage(crew)
+            return output
+
+        return run_task_graph(nodes, execute, max_concurrency)
+
+    def run_goal(self, topic: str, mode: str = "sequential", max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 step_callback=None) -> str:
+        """Run one goal end to end and return the final output.
+
+        mode is "sequential" (planned crew, create_crew) or "parallel" (task DAG, run_task_graph).
+        """
+        if mode == "parallel":
+            return self.run_task_graph(topic, max_concurrency, step_callback=step_callback).final_output
+        if mode != "sequential":
+            raise ValueError(f"Unknown crew mode: {mode}")
+        crew = self.create_crew(topic, step_callback=step_callback)
+        result = crew.kickoff()
+        get_telemetry().record_crew_usage(crew)
+        return result.raw
@@ -3,6 +3,7 @@
 import os
 from crew_config_manager import CrewConfigManager
 from dotenv import load_dotenv
+from src.telemetry import get_telemetry
 
 def main():
     # Load environment variables from .env file
@@ -33,12 +34,15 @@ def main():
         print(f"\n🎯 입력된 목표: {goal}")
         print("\n🤖 AI 크루를 구성하고 작업을 시작합니다...\n")
         
-        crew = manager.create_crew(goal)
-        result = crew.kickoff()
+        # CREW_MODE=parallel: 태스크 DAG 를 계획하고 독립 태스크를 동시에 실행
+        result = manager.run_goal(goal, os.environ.get("CREW_MODE", "sequential"),
+                                  int(os.environ.get("CREW_MAX_CONCURRENCY", "3")))
         
         print("\n✨ 작업 결과:")
         print(result)
 
+        report_telemetry()
+
     except (KeyboardInterrupt, EOFError):
         print("\n\n👋 프로그램을 종료합니다.")
         return 0
@@ -50,5 +54,18 @@ def main():
 
     return 0
 
+def report_telemetry():
+    """실행 시간을 가장 많이 쓴 에이전트/툴을 출력하고, TELEMETRY_PATH 가 있으면 저장 (.prom 이면 Prometheus 형식)"""
+    telemetry = get_telemetry()
+    print("\n⏱️  실행 시간 요약:")
+    for kind, label in (("agent", "에이전트"), ("tool", "툴")):
+        for name, seconds in telemetry.top(kind):
+            print(f"   {label} {name}: {seconds:.1f}s")
+    path = os.environ.get("TELEMETRY_PATH")
+    if path:
+        with open(path, "w") as f:
+            f.write(telemetry.to_prometheus() if path.endswith(".prom") else telemetry.to_json())
+        print(f"   telemetry 저장: {path}")
+
 if __name__ == "__main__":
     exit(main()) 
\ No newline at end of file
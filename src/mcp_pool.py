@@ -0,0 +1,286 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# mcp.json 에서 서버별 "startupTimeout"(초)을 지정하지 않았을 때의 기본값
+DEFAULT_MCP_STARTUP_TIMEOUT = 60.0
+# 사용되지 않은 서버를 유지하는 최대 시간(초)
+DEFAULT_MCP_IDLE_TTL = 30 * 60.0
+# 기동에 실패한 서버를 다시 시도하기까지 기다리는 시간(초)
+DEFAULT_MCP_RETRY_BACKOFF = 60.0
+# URL(SSE) 서버의 이벤트 스트림 read timeout(초)
+DEFAULT_MCP_SSE_READ_TIMEOUT = 60 * 60.0
+
+
+def config_hash(server_config: Dict) -> str:
+    """Stable hash of a server definition, so an edited mcp.json entry gets a fresh adapter."""
+    return hashlib.sha256(json.dumps(server_config, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+# URL 서버가 지원하는 transport. 고정된 mcp 1.6.0 에는 streamable HTTP 클라이언트가 없고
+# mcpadapt 0.1.3 은 URL 파라미터를 그대로 sse_client(**params) 에 넘기므로 SSE 만 가능
+URL_TRANSPORTS = frozenset({"sse"})
+STREAMABLE_HTTP_TRANSPORTS = frozenset({"streamable-http", "streamable_http", "http"})
+
+
+def is_url_server(server_config: Dict) -> bool:
+    return server_config.get("type") == "url" or "url" in server_config
+
+
+def server_params(server_config: Dict):
+    """Build adapter parameters: StdioServerParameters for local servers, a dict for URL servers.
+
+    URL servers (SSE) keep one long-lived HTTP connection to the remote endpoint
+    instead of spawning a local process.
+    """
+    if is_url_server(server_config):
+        transport = server_config.get("transport", "sse")
+        if transport in STREAMABLE_HTTP_TRANSPORTS:
+            raise ValueError(f"MCP transport '{transport}' needs a streamable HTTP client, which the locked "
+                             "mcp 1.6.0 / mcpadapt 0.1.3 do not provide; use 'sse'")
+        if transport not in URL_TRANSPORTS:
+            raise ValueError(f"Unsupported MCP transport: {transport}")
+        params = {"url": server_config["url"]}
+        if server_config.get("headers"):
+            params["headers"] = {k: os.path.expandvars(v) for k, v in server_config["headers"].items()}
+        if "timeout" in server_config:
+            params["timeout"] = server_config["timeout"]
+        # SSE 스트림을 오래 열어 두어 풀에 있는 동안 연결을 재사용한다
+        params["sse_read_timeout"] = server_config.get("sseReadTimeout", DEFAULT_MCP_SSE_READ_TIMEOUT)
+        return params
+
+    if server_config.get("transport", "stdio") != "stdio":
+        raise ValueError(f"Unsupported MCP transport: {server_config.get('transport')}")
+    if "command" not in server_config:
+        raise ValueError("stdio MCP server needs a 'command'")
+
+    from mcp import StdioServerParameters
+    return StdioServerParameters(
+        command=server_config["command"],
+        args=server_config.get("args", []),
+        env=os.environ  # 필요시 server_config에서 env를 받아올 수도 있음
+    )
+
+
+def create_mcp_adapter(server_config: Dict):
+    """Connect to an MCP server through crewai_tools' MCPServerAdapter."""
+    from crewai_tools import MCPServerAdapter
+    return MCPServerAdapter(server_params(server_config))
+
+
+def adapter_is_alive(adapter) -> bool:
+    """Best-effort liveness check: MCPAdapt serves the session from a background thread."""
+    thread = getattr(getattr(adapter, "_adapter", None), "thread", None)
+    return thread is None or thread.is_alive()
+
+
+class PooledMCPServer:
+    """A running MCP server adapter together with its bookkeeping."""
+
+    def __init__(self, name: str, key: Tuple[str, str], adapter, startup_time: float):
+        self.name = name
+        self.key = key
+        self.adapter = adapter
+        self.tools = list(adapter.tools)
+        self.startup_time = startup_time
+        self.started_at = time.monotonic()
+        self.last_used = self.started_at
+
+    def stop(self):
+        try:
+            self.adapter.stop()
+        except Exception as e:
+            print(f"Warning: Failed to stop MCP server '{self.name}': {e}")
+
+
+class MCPServerPool:
+    """Process-wide pool of MCP server adapters keyed by server name and config hash.
+
+    Servers stay warm across create_crew calls, are restarted when their health
+    check fails, are stopped after idle_ttl seconds without use, and are all
+    stopped on interpreter exit.
+    """
+
+    def __init__(self,
+                 adapter_factory: Callable[[Dict], Any] = create_mcp_adapter,
+                 health_check: Callable[[Any], bool] = adapter_is_alive,
+                 idle_ttl: float = DEFAULT_MCP_IDLE_TTL,
+                 retry_backoff: float = DEFAULT_MCP_RETRY_BACKOFF,
+                 reap_interval: Optional[float] = 60.0):
+        self.adapter_factory = adapter_factory
+        self.health_check = health_check
+        self.idle_ttl = idle_ttl
+        self.retry_backoff = retry_backoff
+        self.reap_interval = reap_interval
+        self.startup_times: Dict[str, float] = {}
+        self._servers: Dict[Tuple[str, str], PooledMCPServer] = {}
+        self._starting: Dict[Tuple[str, str], Future] = {}
+        self._failed: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.RLock()
+        self._closed = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+
+    def acquire(self, servers: Dict[str, Dict]) -> Dict[str, List]:
+        """Return tools for each requested server, starting missing ones concurrently.
+
+        A server that fails or exceeds its startupTimeout maps to an empty list
+        and does not hold up the others.
+        """
+        futures: Dict[str, Tuple[Tuple[str, str], Future, float]] = {}
+        tools: Dict[str, List] = {}
+        with self._lock:
+            if self._closed.is_set():
+                raise RuntimeError("MCPServerPool has been shut down")
+            self._ensure_reaper()
+            for server_name, server_config in servers.items():
+                key = (server_name, config_hash(server_config))
+                server = self._healthy_server(key)
+                if server is not None:
+                    server.last_used = time.monotonic()
+                    tools[server_name] = server.tools
+                    continue
+                failed_at = self._failed.get(key)
+                if failed_at is not None and time.monotonic() - failed_at < self.retry_backoff:
+                    tools[server_name] = []
+                    continue
+                if key not in self._starting:
+                    self._starting[key] = self._submit_start(server_name, key, server_config)
+                timeout = float(server_config.get("startupTimeout", DEFAULT_MCP_STARTUP_TIMEOUT))
+                futures[server_name] = (key, self._starting[key], timeout)
+
+        started_at = time.monotonic()
+        for server_name, (key, future, timeout) in futures.items():
+            remaining = max(0.0, timeout - (time.monotonic() - started_at))
+            try:
+                tools[server_name] = future.result(timeout=remaining).tools
+            except FutureTimeoutError:
+                print(f"Warning: MCP server '{server_name}' did not start within {timeout:.0f}s, skipping")
+                tools[server_name] = []
+                # 기동은 백그라운드에서 계속된다. retry_backoff 동안은 기다리지 않고 건너뛰고,
+                # 그 사이 기동이 끝나면 다음 acquire 에서 바로 사용
+                with self._lock:
+                    if key not in self._servers:
+                        self._failed[key] = time.monotonic()
+            except Exception as e:
+                print(f"Warning: MCP server '{server_name}' failed to start, skipping: {e}")
+                tools[server_name] = []
+        return tools
+
+    def _healthy_server(self, key: Tuple[str, str]) -> Optional[PooledMCPServer]:
+        server = self._servers.get(key)
+        if server is None:
+            return None
+        try:
+            alive = self.health_check(server.adapter)
+        except Exception:
+            alive = False
+        if alive:
+            return server
+        print(f"Warning: MCP server '{server.name}' is not responding, restarting")
+        del self._servers[key]
+        server.stop()
+        return None
+
+    def _submit_start(self, server_name: str, key: Tuple[str, str], server_config: Dict) -> Future:
+        """Start a server on its own daemon thread.
+
+        A start that exceeds startupTimeout cannot be interrupted; a daemon thread
+        keeps it from blocking interpreter exit. If it finishes later the server
+        joins the pool, or is stopped if the pool was shut down meanwhile.
+        """
+        future: Future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(self._start(server_name, key, server_config))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f"mcp-start-{server_name}", daemon=True).start()
+        return future
+
+    def _start(self, server_name: str, key: Tuple[str, str], server_config: Dict) -> PooledMCPServer:
+        start_time = time.perf_counter()
+        try:
+            adapter = self.adapter_factory(server_config)
+        except Exception:
+            with self._lock:
+                self._failed[key] = time.monotonic()
+                self._starting.pop(key, None)
+            raise
+        server = PooledMCPServer(server_name, key, adapter, time.perf_counter() - start_time)
+        print(f"MCP server '{server_name}' started in {server.startup_time:.2f}s")
+        with self._lock:
+            self._starting.pop(key, None)
+            if self._closed.is_set():
+                server.stop()
+                raise RuntimeError("MCPServerPool has been shut down")
+            self._failed.pop(key, None)
+            self.startup_times[server_name] = server.startup_time
+            self._servers[key] = server
+        return server
+
+    def evict_idle(self) -> int:
+        """Stop servers that have not been acquired for idle_ttl seconds."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, server in self._servers.items() if now - server.last_used > self.idle_ttl]
+            servers = [self._servers.pop(key) for key in expired]
+        for server in servers:
+            print(f"MCP server '{server.name}' idle for {now - server.last_used:.0f}s, stopping")
+            server.stop()
+        return len(servers)
+
+    def _ensure_reaper(self):
+        if self.reap_interval is None or (self._reaper is not None and self._reaper.is_alive()):
+            return
+        self._reaper = threading.Thread(target=self._reap_loop, name="mcp-pool-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap_loop(self):
+        while not self._closed.wait(self.reap_interval):
+            self.evict_idle()
+
+    def stats(self) -> Dict[str, Dict]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                server.name: {
+                    "config_hash": server.key[1],
+                    "startup_time": server.startup_time,
+                    "uptime": now - server.started_at,
+                    "idle": now - server.last_used,
+                    "tools": len(server.tools),
+                }
+                for server in self._servers.values()
+            }
+
+    def shutdown(self):
+        """Stop every pooled server. Safe to call more than once."""
+        with self._lock:
+            self._closed.set()
+            servers = list(self._servers.values())
+            self._servers.clear()
+        for server in servers:
+            server.stop()
+
+
+_shared_pool: Optional[MCPServerPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_mcp_pool() -> MCPServerPool:
+    """Process-wide MCP server pool, shut down automatically at exit."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = MCPServerPool()
+            atexit.register(_shared_pool.shutdown)
+        return _shared_pool
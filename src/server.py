@@ -0,0 +1,286 @@
+"""Long-running HTTP service: a warm CrewConfigManager behind a bounded job queue.
+
+    python -m src.server [--host 127.0.0.1] [--port 8000] [--workers 2] [--queue-size 16]
+
+    POST /jobs               {"goal": "...", "mode": "sequential"|"parallel"} -> 202 {"id", "status"}
+                             (429 + Retry-After when the queue is full)
+    GET  /jobs/<id>          status, timings, result or error
+    GET  /jobs/<id>/events   step events as Server-Sent Events, ending with an "end" event
+    GET  /health             worker/queue counters
+    GET  /metrics            telemetry in Prometheus text format
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+from src.batch_runner import GoalTimeout, run_with_timeout
+from src.callback import CallbackHandler
+from src.telemetry import get_telemetry
+
+DEFAULT_WORKERS = 2
+# 대기열 상한. 가득 차면 새 요청은 429 로 거절
+DEFAULT_QUEUE_SIZE = 16
+# 보관하는 최대 작업 수 (오래된 완료 작업부터 삭제)
+MAX_JOBS = 1000
+# SSE 연결 유지용 주석 전송 간격(초)
+SSE_HEARTBEAT = 15.0
+FINISHED = ("done", "error", "timeout")
+
+
+class Job:
+    """One goal and everything the API reports about it; step events are kept for SSE replay."""
+
+    def __init__(self, goal: str, mode: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.goal = goal
+        self.mode = mode
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[str] = None
+        self.error: Optional[str] = None
+        self.events: List[Dict] = []
+        self.changed = threading.Condition()
+
+    def publish(self, event: Dict):
+        with self.changed:
+            self.events.append(event)
+            self.changed.notify_all()
+
+    def finish(self, status: str, result: Optional[str] = None, error: Optional[str] = None):
+        with self.changed:
+            self.status, self.result, self.error = status, result, error
+            self.finished_at = time.time()
+            self.changed.notify_all()
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "goal": self.goal,
+            "mode": self.mode,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "steps": len(self.events),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """Bounded queue of Jobs drained by a fixed number of worker threads.
+
+    run_goal(goal, mode, step_callback) runs one goal; each job gets its own
+    CallbackHandler whose step records are published to the job's SSE stream.
+    """
+
+    def __init__(self, run_goal: Callable, workers: int = DEFAULT_WORKERS, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 timeout: Optional[float] = None, log_dir: str = "logs"):
+        self.run_goal = run_goal
+        self.timeout = timeout
+        self.log_dir = log_dir
+        self.workers = workers
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.running = 0
+        self.rejected = 0
+        self._queue: "queue.Queue[Job]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True).start()
+
+    def submit(self, goal: str, mode: str = "sequential") -> Optional[Job]:
+        """Queue a goal; returns None when the queue is full."""
+        job = Job(goal, mode)
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self.rejected += 1
+                return None
+            self.jobs[job.id] = job
+            self._trim()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in FINISHED]
+        for job_id in finished[:max(0, len(self.jobs) - MAX_JOBS)]:
+            del self.jobs[job_id]
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            with self._lock:
+                self.running += 1
+            job.status, job.started_at = "running", time.time()
+            handler = CallbackHandler(log_dir=self.log_dir, echo=False, session_name=f"job_{job.id}")
+            handler.add_listener(job.publish)
+            try:
+                result = run_with_timeout(lambda: self.run_goal(job.goal, job.mode, handler.step_callback),
+                                          self.timeout)
+                job.finish("done", result=str(result))
+            except GoalTimeout as e:
+                job.finish("timeout", error=str(e))
+                # 시간 초과된 작업도 실제로 끝날 때까지 이 워커를 차지한다 (running 에도 포함)
+                e.thread.join()
+            except Exception as e:
+                job.finish("error", error=f"{type(e).__name__}: {e}")
+            finally:
+                handler.close()
+                with self._lock:
+                    self.running -= 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            statuses = [job.status for job in self.jobs.values()]
+            return {
+                "workers": self.workers,
+                "queued": self._queue.qsize(),
+                "queue_size": self._queue.maxsize,
+                "running": self.running,
+                "done": statuses.count("done"),
+                "failed": statuses.count("error") + statuses.count("timeout"),
+                "rejected": self.rejected,
+            }
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    jobs: JobQueue = None
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            return self._send_json(404, {"error": "not found"})
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            goal = body["goal"].strip()
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return self._send_json(400, {"error": "body must be JSON with a non-empty 'goal'"})
+        mode = body.get("mode", "sequential")
+        if not goal or mode not in ("sequential", "parallel"):
+            return self._send_json(400, {"error": "'goal' is empty or 'mode' is not sequential/parallel"})
+        job = self.jobs.submit(goal, mode)
+        if job is None:
+            return self._send_json(429, {"error": "job queue is full"}, {"Retry-After": "30"})
+        self._send_json(202, {"id": job.id, "status": job.status}, {"Location": f"/jobs/{job.id}"})
+
+    def do_GET(self):
+        parts = [part for part in self.path.split("?", 1)[0].split("/") if part]
+        if parts == ["health"]:
+            return self._send_json(200, self.jobs.stats())
+        if parts == ["metrics"]:
+            return self._send_text(200, get_telemetry().to_prometheus(), "text/plain; version=0.0.4")
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return self._send_json(404, {"error": "unknown job"})
+            if len(parts) == 2:
+                return self._send_json(200, job.to_dict())
+            if parts[2] == "events":
+                return self._stream_events(job)
+        self._send_json(404, {"error": "not found"})
+
+    def _stream_events(self, job: Job):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        sent = 0
+        try:
+            while True:
+                with job.changed:
+                    if sent == len(job.events) and job.status not in FINISHED:
+                        job.changed.wait(SSE_HEARTBEAT)
+                    events, finished = job.events[sent:], job.status in FINISHED
+                if events:
+                    self.wfile.write("".join(f"event: step\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+                                             for event in events).encode("utf-8"))
+                    sent += len(events)
+                elif finished:
+                    data = json.dumps(job.to_dict(), ensure_ascii=False)
+                    self.wfile.write(f"event: end\ndata: {data}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    return
+                else:
+                    # 연결이 끊긴 클라이언트를 감지하기 위한 heartbeat
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None):
+        self._send_text(status, json.dumps(payload, ensure_ascii=False), "application/json", headers)
+
+    def _send_text(self, status: int, text: str, content_type: str, headers: Optional[Dict[str, str]] = None):
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8" if "charset" not in content_type else content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class JobServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def create_server(jobs: JobQueue, host: str = "127.0.0.1", port: int = 8000) -> JobServer:
+    handler = type("Handler", (JobRequestHandler,), {"jobs": jobs})
+    return JobServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="목표를 HTTP 로 받아 실행하는 상주 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="동시에 실행하는 작업 수")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, help="대기열 상한 (초과 시 429)")
+    parser.add_argument("--timeout", type=float, default=None, help="작업별 제한 시간(초)")
+    parser.add_argument("--max-concurrency", type=int, default=3, help="parallel 모드의 작업당 동시 태스크 수")
+    parser.add_argument("--agents-config", default="config/agents.yaml")
+    parser.add_argument("--mcp-config", default="config/mcp.json")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    from src.crew_config_manager import CrewConfigManager
+
+    load_dotenv()
+    # 기동 비용(임포트, MCP 서버, 에이전트 템플릿)은 서버 시작 시 한 번만 낸다
+    start_time = time.perf_counter()
+    manager = CrewConfigManager(agents_config_path=args.agents_config, mcp_config_path=args.mcp_config)
+    manager._start_mcp_servers(manager._required_mcp_servers())
+    manager._get_agent_templates()
+    print(f"Warm start finished in {time.perf_counter() - start_time:.1f}s")
+
+    jobs = JobQueue(lambda goal, mode, step_callback: manager.run_goal(goal, mode, args.max_concurrency, step_callback),
+                    workers=args.workers, queue_size=args.queue_size, timeout=args.timeout)
+    server = create_server(jobs, args.host, args.port)
+    print(f"Listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import json
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+# 동시에 실행하는 태스크 수 기본값
+DEFAULT_MAX_CONCURRENCY = 3
+
+TASK_GRAPH_PROMPT = """You plan work for a team of agents. Split the goal into tasks and return ONLY a JSON object:
+{{"task_graph": [{{"id": "t1", "agent": "<agent key>", "description": "...", "expected_output": "...", "depends_on": []}}]}}
+
+Rules:
+- "agent" must be one of the agent keys below.
+- "depends_on" lists the ids of tasks whose results this task needs; leave it empty when the task can start immediately.
+- Make tasks independent whenever possible so they can run in parallel, and finish with a task that combines the results.
+
+AGENTS
+{agents}
+
+GOAL
+{goal}"""
+
+
+class TaskNode(NamedTuple):
+    id: str
+    agent: str
+    description: str
+    expected_output: str
+    depends_on: Tuple[str, ...] = ()
+
+
+class TaskGraphResult(NamedTuple):
+    outputs: Dict[str, str]
+    # task id -> (시작, 종료) perf_counter 시각
+    timings: Dict[str, Tuple[float, float]]
+    wall_seconds: float
+    final_output: str
+
+
+def parse_task_graph(text: str, agent_names: Iterable[str]) -> List[TaskNode]:
+    """Parse the planner's JSON answer into TaskNodes in dependency order.
+
+    Raises ValueError for malformed JSON or task entries, unknown agents or
+    dependencies, and cycles.
+    """
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if match is None:
+        raise ValueError("task graph: no JSON object in planner output")
+    try:
+        entries = json.loads(match.group(0))["task_graph"]
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"task graph: invalid JSON ({e})") from e
+
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("task graph: 'task_graph' must be a non-empty list of tasks")
+
+    agent_names = set(agent_names)
+    nodes = []
+    for index, entry in enumerate(entries, 1):
+        name = f"'{entry.get('id')}'" if isinstance(entry, dict) and entry.get("id") is not None else f"#{index}"
+        if not isinstance(entry, dict):
+            raise ValueError(f"task graph: task {name} is not an object")
+        missing = [key for key in ("id", "agent", "description") if entry.get(key) is None]
+        if missing:
+            raise ValueError(f"task graph: task {name} is missing {', '.join(missing)}")
+        if not isinstance(entry["agent"], str) or not isinstance(entry["description"], str):
+            raise ValueError(f"task graph: task {name} needs string 'agent' and 'description'")
+        depends_on = entry.get("depends_on") or []
+        if not isinstance(depends_on, list):
+            raise ValueError(f"task graph: task {name} 'depends_on' must be a list of task ids")
+        node = TaskNode(
+            id=str(entry["id"]),
+            agent=entry["agent"],
+            description=entry["description"],
+            expected_output=entry.get("expected_output") or "작업 결과를 정리한 문서",
+            depends_on=tuple(str(dep) for dep in depends_on),
+        )
+        if node.agent not in agent_names:
+            raise ValueError(f"task graph: unknown agent '{node.agent}' in task '{node.id}'")
+        nodes.append(node)
+    return topological_order(nodes)
+
+
+def topological_order(nodes: List[TaskNode]) -> List[TaskNode]:
+    by_id = {node.id: node for node in nodes}
+    if len(by_id) != len(nodes):
+        raise ValueError("task graph: duplicate task ids")
+    for node in nodes:
+        for dep in node.depends_on:
+            if dep not in by_id:
+                raise ValueError(f"task graph: task '{node.id}' depends on unknown task '{dep}'")
+    ordered, done = [], set()
+    remaining = list(nodes)
+    while remaining:
+        ready = [node for node in remaining if all(dep in done for dep in node.depends_on)]
+        if not ready:
+            raise ValueError(f"task graph: cycle between {', '.join(node.id for node in remaining)}")
+        for node in ready:
+            ordered.append(node)
+            done.add(node.id)
+        remaining = [node for node in remaining if node.id not in done]
+    return ordered
+
+
+def run_task_graph(nodes: List[TaskNode], execute: Callable[[TaskNode, Dict[str, str]], str],
+                   max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> TaskGraphResult:
+    """Run nodes as soon as their dependencies finish, at most max_concurrency at a time.
+
+    execute(node, dependency_outputs) returns the node's output. If a task
+    fails, nothing new is started and the error is raised once running tasks
+    have finished.
+    """
+    nodes = topological_order(nodes)
+    outputs: Dict[str, str] = {}
+    timings: Dict[str, Tuple[float, float]] = {}
+    pending = list(nodes)
+    lock = threading.Lock()
+    start_time = time.perf_counter()
+
+    def run(node: TaskNode) -> str:
+        started = time.perf_counter()
+        try:
+            return execute(node, {dep: outputs[dep] for dep in node.depends_on})
+        finally:
+            with lock:
+                timings[node.id] = (started, time.perf_counter())
+
+    error = None
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="task-graph") as executor:
+        running = {}
+        while pending or running:
+            if error is None:
+                ready = [node for node in pending if all(dep in outputs for dep in node.depends_on)]
+                for node in ready:
+                    pending.remove(node)
+                    running[executor.submit(run, node)] = node
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                node = running.pop(future)
+                try:
+                    outputs[node.id] = future.result()
+                except Exception as e:
+                    error = error or e
+    if error is not None:
+        raise error
+
+    # 다른 태스크가 참조하지 않는 마지막 태스크들의 결과를 합친다
+    referenced = {dep for node in nodes for dep in node.depends_on}
+    sinks = [node.id for node in nodes if node.id not in referenced]
+    final_output = "\n\n".join(outputs[node_id] for node_id in sinks)
+    return TaskGraphResult(outputs, timings, time.perf_counter() - start_time, final_output)
+
+
+def critical_path_seconds(nodes: List[TaskNode], durations: Dict[str, float]) -> float:
+    """Length of the longest dependency chain, the lower bound for wall-clock time."""
+    finish: Dict[str, float] = {}
+    for node in topological_order(nodes):
+        finish[node.id] = max((finish[dep] for dep in node.depends_on), default=0.0) + durations.get(node.id, 0.0)
+    return max(finish.values(), default=0.0)
+
+
+def dependency_context(outputs: Dict[str, str]) -> str:
+    """Text appended to a task description with the results it depends on."""
+    return "\n\n".join(f"[{task_id} 결과]\n{output}" for task_id, output in outputs.items())
@@ -0,0 +1,258 @@
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# 지표별로 보관하는 최근 샘플 수 (백분위 계산용)
+MAX_SAMPLES = 4096
+# "tool" 시리즈 이름은 "에이전트/툴"
+TOOL_SERIES_SEPARATOR = "/"
+
+
+def tool_series_name(agent: str, tool: str) -> str:
+    return f"{agent}{TOOL_SERIES_SEPARATOR}{tool}"
+
+
+def _percentile(sorted_samples, pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(pct / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+class _Series:
+    """Count, total and recent samples of one latency series."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+    def add(self, seconds: float, error: bool = False):
+        self.count += 1
+        self.total += seconds
+        self.errors += int(error)
+        self.samples.append(seconds)
+
+    def add_error(self):
+        """A failure whose duration is unknown; counted without skewing the latency samples."""
+        self.errors += 1
+
+    def summary(self) -> Dict[str, float]:
+        samples = sorted(self.samples)
+        return {
+            "count": self.count,
+            "total": round(self.total, 6),
+            "p50": round(_percentile(samples, 50), 6),
+            "p95": round(_percentile(samples, 95), 6),
+            "max": round(samples[-1], 6) if samples else 0.0,
+            "errors": self.errors,
+        }
+
+
+class Telemetry:
+    """Thread-safe recorder of per-agent step/LLM/tool latency and token usage.
+
+    Series are keyed by kind ("step", "agent", "llm", "tool", "function") and
+    name (agent role, "agent/tool" from tool_series_name, ...). summary() aggregates them with p50/p95,
+    each name's share of the wall-clock run time ("share", which adds up to
+    more than 1 when steps/tools run concurrently, e.g. in parallel mode) and
+    its share of the kind's total time ("kind_share", always sums to 1);
+    to_json()/to_prometheus() export it.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._series: Dict[str, Dict[str, _Series]] = defaultdict(lambda: defaultdict(_Series))
+        self._tokens: Dict[str, Dict[str, int]] = defaultdict(lambda: {"in": 0, "out": 0})
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, name: str, seconds: Optional[float], error: bool = False):
+        """seconds=None records an error without a latency sample."""
+        with self._lock:
+            if seconds is None:
+                self._series[kind][name].add_error()
+            else:
+                self._series[kind][name].add(seconds, error)
+
+    def record_tokens(self, agent: str, tokens_in: int, tokens_out: int):
+        with self._lock:
+            self._tokens[agent]["in"] += tokens_in
+            self._tokens[agent]["out"] += tokens_out
+
+    @contextmanager
+    def span(self, kind: str, name: str):
+        """Time a block: `with telemetry.span("tool", "search_internet"): ...`"""
+        start_time = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(kind, name, time.perf_counter() - start_time, error)
+
+    def record_crew_usage(self, crew):
+        """Add the exact token counts crewai collected per agent during kickoff."""
+        for agent in getattr(crew, "agents", []):
+            token_process = getattr(agent, "_token_process", None)
+            if token_process is None:
+                continue
+            usage = token_process.get_summary()
+            self.record_tokens(agent.role, getattr(usage, "prompt_tokens", 0), getattr(usage, "completion_tokens", 0))
+
+    def summary(self) -> Dict:
+        with self._lock:
+            series = {kind: {name: s.summary() for name, s in names.items()} for kind, names in self._series.items()}
+            tokens = {agent: dict(counts) for agent, counts in self._tokens.items()}
+        run_seconds = time.time() - self.started_at
+        # 실행 시간 점유율: 어떤 에이전트/툴이 전체 시간을 차지하는지
+        for names in series.values():
+            kind_total = sum(values["total"] for values in names.values())
+            for values in names.values():
+                values["share"] = round(values["total"] / run_seconds, 4) if run_seconds else 0.0
+                values["kind_share"] = round(values["total"] / kind_total, 4) if kind_total else 0.0
+        return {"run_seconds": round(run_seconds, 3), "series": series, "tokens": tokens}
+
+    def top(self, kind: str, limit: int = 5):
+        """(name, total seconds) of the slowest names of one kind."""
+        names = self.summary()["series"].get(kind, {})
+        return sorted(((name, values["total"]) for name, values in names.items()), key=lambda item: -item[1])[:limit]
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.summary(), ensure_ascii=False, indent=indent)
+
+    def to_prometheus(self, prefix: str = "crew") -> str:
+        """Prometheus text exposition format (summaries with 0.5/0.95 quantiles + token counters)."""
+        summary = self.summary()
+        lines = []
+        for kind, names in sorted(summary["series"].items()):
+            metric = f"{prefix}_{kind}_seconds"
+            label = "tool" if kind == "tool" else "agent" if kind in ("step", "agent", "llm") else "name"
+            lines.append(f"# TYPE {metric} summary")
+            for name, values in sorted(names.items()):
+                labels = _labels(kind, label, name)
+                lines.append(f'{metric}{{{labels},quantile="0.5"}} {values["p50"]}')
+                lines.append(f'{metric}{{{labels},quantile="0.95"}} {values["p95"]}')
+                lines.append(f"{metric}_sum{{{labels}}} {values['total']}")
+                lines.append(f"{metric}_count{{{labels}}} {values['count']}")
+            lines.append(f"# TYPE {metric}_errors_total counter")
+            for name, values in sorted(names.items()):
+                lines.append(f'{metric}_errors_total{{{_labels(kind, label, name)}}} {values["errors"]}')
+        lines.append(f"# TYPE {prefix}_tokens_total counter")
+        for agent, counts in sorted(summary["tokens"].items()):
+            for direction in ("in", "out"):
+                lines.append(f'{prefix}_tokens_total{{agent="{_escape(agent)}",direction="{direction}"}} {counts[direction]}')
+        lines.append(f"# TYPE {prefix}_run_seconds gauge")
+        lines.append(f"{prefix}_run_seconds {summary['run_seconds']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self._tokens.clear()
+            self.started_at = time.time()
+
+
+def _labels(kind: str, label: str, name: str) -> str:
+    if kind == "tool" and TOOL_SERIES_SEPARATOR in name:
+        agent, _, tool = name.rpartition(TOOL_SERIES_SEPARATOR)
+        return f'agent="{_escape(agent)}",tool="{_escape(tool)}"'
+    return f'{label}="{_escape(name)}"'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_telemetry = Telemetry()
+_instrumented = False
+_instrument_lock = threading.Lock()
+# LLM/에이전트/툴 실행 시작 시각 (crewai 는 한 에이전트의 실행을 한 스레드에서 처리)
+_local = threading.local()
+
+
+def _tool_starts() -> Dict:
+    if not hasattr(_local, "tool_starts"):
+        _local.tool_starts = {}
+    return _local.tool_starts
+
+
+def get_telemetry() -> Telemetry:
+    """Process-wide Telemetry used by the crewai event hooks and CallbackHandler."""
+    return _telemetry
+
+
+def instrument_crewai() -> bool:
+    """Register crewai event-bus handlers that feed get_telemetry(); safe to call repeatedly."""
+    global _instrumented
+    with _instrument_lock:
+        if _instrumented:
+            return True
+        try:
+            from crewai.utilities.events import (
+                AgentExecutionCompletedEvent,
+                AgentExecutionStartedEvent,
+                LLMCallCompletedEvent,
+                LLMCallFailedEvent,
+                LLMCallStartedEvent,
+                ToolUsageErrorEvent,
+                ToolUsageFinishedEvent,
+                ToolUsageStartedEvent,
+                crewai_event_bus,
+            )
+        except ImportError as e:
+            print(f"Warning: crewai event bus not available, telemetry hooks disabled: {e}")
+            return False
+
+        @crewai_event_bus.on(AgentExecutionStartedEvent)
+        def _agent_started(source, event):
+            _local.agent = event.agent.role
+            _local.agent_started = time.perf_counter()
+
+        @crewai_event_bus.on(AgentExecutionCompletedEvent)
+        def _agent_completed(source, event):
+            started = getattr(_local, "agent_started", None)
+            if started is not None:
+                _telemetry.record("agent", event.agent.role, time.perf_counter() - started)
+                _local.agent_started = None
+
+        @crewai_event_bus.on(LLMCallStartedEvent)
+        def _llm_started(source, event):
+            _local.llm_started = time.perf_counter()
+
+        def _llm_finished(error):
+            started = getattr(_local, "llm_started", None)
+            if started is not None:
+                _telemetry.record("llm", getattr(_local, "agent", "unknown"), time.perf_counter() - started, error)
+                _local.llm_started = None
+
+        crewai_event_bus.on(LLMCallCompletedEvent)(lambda source, event: _llm_finished(False))
+        crewai_event_bus.on(LLMCallFailedEvent)(lambda source, event: _llm_finished(True))
+
+        def _tool_started_at(event) -> Optional[float]:
+            return _tool_starts().pop((event.agent_role, event.tool_name), None)
+
+        @crewai_event_bus.on(ToolUsageStartedEvent)
+        def _tool_started(source, event):
+            _tool_starts()[(event.agent_role, event.tool_name)] = time.perf_counter()
+
+        @crewai_event_bus.on(ToolUsageFinishedEvent)
+        def _tool_finished(source, event):
+            _tool_started_at(event)
+            _telemetry.record("tool", tool_series_name(event.agent_role, event.tool_name),
+                              (event.finished_at - event.started_at).total_seconds())
+
+        @crewai_event_bus.on(ToolUsageErrorEvent)
+        def _tool_failed(source, event):
+            # 실패한 호출도 실제 걸린 시간을 기록 (시작 이벤트가 없던 실패는 오류 수만 센다)
+            started = _tool_started_at(event)
+            _telemetry.record("tool", tool_series_name(event.agent_role, event.tool_name),
+                              time.perf_counter() - started if started is not None else None, error=True)
+
+        _instrumented = True
+        return True
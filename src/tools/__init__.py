@@ -1 +1,21 @@
-from .knowledge_tool import KnowledgeTool 
\ No newline at end of file
+import importlib
+
+# 툴 모듈은 chromadb/mem0/crewai 등 무거운 의존성을 끌고 오므로 처음 접근할 때 임포트한다
+_LAZY_ATTRS = {
+    "KnowledgeTool": ".knowledge_tool",
+    "MemZeroTool": ".mem_zero_tool",
+    "ScrapeWebsiteTool": ".browser_tools",
+    "SearchInternetTool": ".search_tools",
+    "FileTools": ".file_tools",
+    "TemplateTools": ".template_tools",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -1,38 +1,190 @@
+import asyncio
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
-import requests
-from crewai import Agent, Task
+from crewai import Agent
 from crewai.tools import BaseTool
-from unstructured.partition.html import partition_html
+from pydantic import Field
+from src.tools.http_client import get_async_http_client, get_http_client
+from src.tools.html_stream import ChunkPacker, HtmlElementStream, iter_html_elements, pack_chunks
+from src.tools.page_cache import PageCache, content_hash, get_page_cache
+
+# 요약 단위(토큰 수, 약 8000자)
+CHUNK_TOKENS = 2000
+# 한 페이지에서 요약할 최대 토큰 수 (도달하면 응답 읽기를 중단)
+CONTENT_BUDGET_TOKENS = 40000
+# 응답을 읽는 단위(바이트)
+STREAM_CHUNK_BYTES = 64 * 1024
+# 청크 요약을 동시에 수행하는 최대 LLM 호출 수
+MAX_SUMMARY_WORKERS = 4
+# reduce 단계에서 한 번에 합치는 요약 수
+MERGE_BATCH_SIZE = 6
+
+SUMMARIZE_PROMPT = 'Analyze and summarize the content bellow, make sure to include the most relevant information in the summary, return only the summary nothing else.\n\nCONTENT\n----------\n{content}'
+MERGE_PROMPT = 'The summaries below cover consecutive parts of one web page, in order. Merge them into a single summary that keeps the most relevant information, return only the summary nothing else.\n\nSUMMARIES\n----------\n{content}'
 
 
 class ScrapeWebsiteTool(BaseTool):
     name: str = "scrape_and_summarize_website"
     description: str = "Useful to scrape and summarize a website content"
+    endpoint: str = "https://chrome.browserless.io/content"
+    max_workers: int = MAX_SUMMARY_WORKERS
+    chunk_tokens: int = CHUNK_TOKENS
+    content_budget_tokens: int = CONTENT_BUDGET_TOKENS
+    summarizer: Optional[Agent] = Field(default=None, exclude=True)
+    use_cache: bool = True
+    cache: Optional[PageCache] = Field(default=None, exclude=True)
 
     def _run(self, website: str) -> str:
-        url = f"https://chrome.browserless.io/content?token={os.environ['BROWSERLESS_API_KEY']}"
-        payload = json.dumps({"url": website})
-        headers = {'cache-control': 'no-cache', 'content-type': 'application/json'}
-        response = requests.request("POST", url, headers=headers, data=payload)
-        elements = partition_html(text=response.text)
-        content = "\n\n".join([str(el) for el in elements])
-        content = [content[i:i + 8000] for i in range(0, len(content), 8000)]
-        summaries = []
-        for chunk in content:
-            agent = Agent(
+        chunks = self._get_chunks(website)
+        if not chunks:
+            return ""
+
+        # map: 청크별 요약 (순서 유지) -> reduce: 요약이 하나가 될 때까지 묶어서 병합
+        summaries = self._summarize_all(SUMMARIZE_PROMPT, chunks)
+        while len(summaries) > 1:
+            summaries = self._summarize_all(MERGE_PROMPT, self._merge_batches(summaries))
+        return summaries[0]
+
+    async def _arun(self, website: str) -> str:
+        chunks = await self._aget_chunks(website)
+        if not chunks:
+            return ""
+
+        summaries = await self._asummarize_all(SUMMARIZE_PROMPT, chunks)
+        while len(summaries) > 1:
+            summaries = await self._asummarize_all(MERGE_PROMPT, self._merge_batches(summaries))
+        return summaries[0]
+
+    @staticmethod
+    def _merge_batches(summaries: List[str]) -> List[str]:
+        return ["\n\n".join(summaries[i:i + MERGE_BATCH_SIZE]) for i in range(0, len(summaries), MERGE_BATCH_SIZE)]
+
+    def _get_cache(self) -> Optional[PageCache]:
+        if self.use_cache and self.cache is None:
+            self.cache = get_page_cache()
+        return self.cache if self.use_cache else None
+
+    def _get_chunks(self, website: str) -> List[str]:
+        """Page text packed into token-bounded chunks, served from the cache while fresh."""
+        cache = self._get_cache()
+        cached = cache.get_page(website) if cache else None
+        if cached and cache.is_fresh(cached):
+            return cached.chunks
+
+        response = get_http_client().post(self._content_url(), headers=self._headers(),
+                                          data=json.dumps({"url": website}), stream=True)
+        with response:
+            response.raise_for_status()
+            response.encoding = response.encoding or "utf-8"
+            html_pieces = response.iter_content(chunk_size=STREAM_CHUNK_BYTES, decode_unicode=True)
+            # 요소 단위로 읽으면서 청크를 채우고, 예산에 도달하면 나머지 응답은 읽지 않는다
+            chunks = list(pack_chunks(iter_html_elements(html_pieces),
+                                      self.chunk_tokens, self.content_budget_tokens))
+        if cache:
+            cache.put_page(website, chunks)
+        return chunks
+
+    async def _aget_chunks(self, website: str) -> List[str]:
+        """Async variant of _get_chunks reading the response with httpx streaming."""
+        cache = self._get_cache()
+        cached = cache.get_page(website) if cache else None
+        if cached and cache.is_fresh(cached):
+            return cached.chunks
+
+        elements = HtmlElementStream()
+        packer = ChunkPacker(self.chunk_tokens, self.content_budget_tokens)
+        chunks = []
+        async with get_async_http_client().stream("POST", self._content_url(), headers=self._headers(),
+                                                  content=json.dumps({"url": website})) as response:
+            response.raise_for_status()
+            async for piece in response.aiter_text():
+                for element in elements.feed(piece):
+                    chunks.extend(packer.add(element))
+                if packer.full:
+                    break
+            else:
+                for element in elements.close():
+                    chunks.extend(packer.add(element))
+        chunks.extend(packer.flush())
+        if cache:
+            cache.put_page(website, chunks)
+        return chunks
+
+    def _content_url(self) -> str:
+        return f"{self.endpoint}?token={os.environ['BROWSERLESS_API_KEY']}"
+
+    @staticmethod
+    def _headers():
+        return {'cache-control': 'no-cache', 'content-type': 'application/json'}
+
+    def _get_summarizer(self) -> Agent:
+        """Summarizer agent shared by every chunk and every call of this tool."""
+        if self.summarizer is None:
+            self.summarizer = Agent(
                 role='Principal Researcher',
                 goal=
                 'Do amazing researches and summaries based on the content you are working with',
                 backstory=
                 "You're a Principal Researcher at a big company and you need to do a research about a given topic.",
                 allow_delegation=False)
-            task = Task(
-                agent=agent,
-                description=
-                f'Analyze and summarize the content bellow, make sure to include the most relevant information in the summary, return only the summary nothing else.\n\nCONTENT\n----------\n{chunk}'
-            )
-            summary = task.execute()
-            summaries.append(summary)
-        return "\n\n".join(summaries)
+        return self.summarizer
+
+    def _summarize_all(self, prompt: str, contents: List[str]) -> List[str]:
+        """Summarize contents concurrently on a bounded pool, returning results in input order.
+
+        Summaries are cached by the hash of prompt + content, so unchanged chunks skip the LLM.
+        """
+        keys, summaries, missing = self._cached_summaries(prompt, contents)
+        if not missing:
+            return summaries
+
+        agent = self._get_summarizer()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing)), thread_name_prefix="scrape-summary") as executor:
+            results = executor.map(lambda i: self._summarize(agent, prompt, contents[i]), missing)
+            for i, summary in zip(missing, results):
+                summaries[i] = self._store_summary(keys[i], summary)
+        return summaries
+
+    async def _asummarize_all(self, prompt: str, contents: List[str]) -> List[str]:
+        """Async variant of _summarize_all; at most max_workers LLM calls are in flight."""
+        keys, summaries, missing = self._cached_summaries(prompt, contents)
+        if not missing:
+            return summaries
+
+        agent = self._get_summarizer()
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def summarize(i):
+            async with semaphore:
+                # crewai LLM.call 은 동기 API 라서 이벤트 루프를 막지 않도록 워커 스레드에서 호출
+                return await asyncio.to_thread(self._summarize, agent, prompt, contents[i])
+
+        results = await asyncio.gather(*(summarize(i) for i in missing))
+        for i, summary in zip(missing, results):
+            summaries[i] = self._store_summary(keys[i], summary)
+        return summaries
+
+    def _cached_summaries(self, prompt: str, contents: List[str]):
+        cache = self._get_cache()
+        keys = [content_hash(prompt + content) for content in contents]
+        summaries = [cache.get_summary(key) if cache else None for key in keys]
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+        return keys, summaries, missing
+
+    def _store_summary(self, key: str, summary: str) -> str:
+        cache = self._get_cache()
+        if cache:
+            cache.put_summary(key, summary)
+        return summary
+
+    @staticmethod
+    def _summarize(agent: Agent, prompt: str, content: str) -> str:
+        # Agent/Task 실행기는 호출마다 상태를 갖기 때문에, 공유 에이전트의 LLM을 직접 호출한다
+        messages = [
+            {"role": "system", "content": f"You are {agent.role}. {agent.backstory}\nYour personal goal is: {agent.goal}"},
+            {"role": "user", "content": prompt.format(content=content)},
+        ]
+        return str(agent.llm.call(messages))
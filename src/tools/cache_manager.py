@@ -0,0 +1,42 @@
+import argparse
+import json
+import os
+
+from src.tools.embedding_cache import DEFAULT_CACHE_PATH as DEFAULT_EMBEDDING_CACHE_PATH, EmbeddingCache
+from src.tools.page_cache import DEFAULT_CACHE_PATH, PageCache
+from src.tools.query_cache import QueryCache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스크랩/요약(LLM) 캐시 관리")
+    parser.add_argument("--clear", action="store_true", help="캐시 삭제")
+    parser.add_argument("--older-than", type=float, default=None, metavar="HOURS",
+                        help="--clear 와 함께 사용: 지정한 시간보다 오래 사용되지 않은 항목만 삭제")
+    parser.add_argument("--path", default=os.environ.get("SCRAPE_CACHE_PATH", DEFAULT_CACHE_PATH))
+    parser.add_argument("--search-path", default=os.environ.get("SEARCH_CACHE_PATH"),
+                        help="프로세스 간 공유 검색 캐시 파일 (--clear 시 함께 삭제)")
+    parser.add_argument("--embedding-path", default=os.environ.get("EMBEDDING_CACHE_PATH", DEFAULT_EMBEDDING_CACHE_PATH),
+                        help="지식 저장소 임베딩 캐시 파일 (--clear 시 함께 삭제)")
+    args = parser.parse_args(argv)
+
+    cache = PageCache(args.path)
+    if args.clear:
+        if args.older_than is None:
+            cache.clear()
+            print(f"캐시를 모두 삭제했습니다: {args.path}")
+            if args.search_path:
+                QueryCache(shared_path=args.search_path).clear()
+                print(f"검색 캐시를 모두 삭제했습니다: {args.search_path}")
+            if os.path.exists(args.embedding_path):
+                EmbeddingCache(args.embedding_path).clear()
+                print(f"임베딩 캐시를 모두 삭제했습니다: {args.embedding_path}")
+        else:
+            removed = cache.evict(max_age=args.older_than * 60 * 60)
+            print(f"{args.older_than:g}시간보다 오래된 항목 {removed}개를 삭제했습니다.")
+    print(json.dumps(cache.stats(), indent=2))
+    if os.path.exists(args.embedding_path):
+        print(json.dumps({"embeddings": EmbeddingCache(args.embedding_path).stats()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
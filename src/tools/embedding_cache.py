@@ -0,0 +1,133 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 캐시 파일 기본 위치 (EMBEDDING_CACHE_PATH 로 변경 가능)
+DEFAULT_CACHE_PATH = ".cache/embedding_cache.sqlite"
+# 한 번의 임베딩 API 호출에 넣는 최대 텍스트 수
+DEFAULT_BATCH_SIZE = 64
+
+
+def embedder_namespace(embedder) -> str:
+    """Cache namespace of an embedder, so vectors from different models never mix."""
+    detail = getattr(embedder, "model", None) or getattr(embedder, "dim", "")
+    return f"{type(embedder).__name__}:{detail}"
+
+
+class EmbeddingCache:
+    """SQLite store of float32 embedding vectors keyed by sha256(namespace + text)."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""CREATE TABLE IF NOT EXISTS vectors (
+            key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL, last_access REAL NOT NULL)""")
+
+    @staticmethod
+    def key(namespace: str, text: str) -> str:
+        return hashlib.sha256(f"{namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            # SQLite 바인딩 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for start in range(0, len(keys), 500):
+                batch = list(keys[start:start + 500])
+                placeholders = ",".join("?" * len(batch))
+                for key, blob in self._conn.execute(
+                        f"SELECT key, vector FROM vectors WHERE key IN ({placeholders})", batch):
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+                if found:
+                    self._conn.execute(
+                        f"UPDATE vectors SET last_access = ? WHERE key IN ({placeholders})", [time.time(), *batch])
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        now = time.time()
+        rows = [(key, int(vector.shape[0]), np.asarray(vector, dtype=np.float32).tobytes(), now)
+                for key, vector in items.items()]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO vectors VALUES (?, ?, ?, ?)", rows)
+            self._conn.execute("COMMIT")
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM vectors")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM vectors").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "bytes": total,
+                "bytes_per_vector": total / entries if entries else 0.0,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class CachedEmbedder:
+    """Wraps an embedder (embed/embed_many) with an EmbeddingCache.
+
+    Cache misses are deduplicated and sent to the wrapped embedder in batches of
+    batch_size, and vectors come back as float32 NumPy arrays.
+    """
+
+    def __init__(self, embedder, cache: Optional[EmbeddingCache] = None, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.embedder = embedder
+        self.cache = cache or get_embedding_cache()
+        self.batch_size = batch_size
+        self.namespace = embedder_namespace(embedder)
+        self.calls = 0
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Sequence[str]) -> List[np.ndarray]:
+        keys = [EmbeddingCache.key(self.namespace, text) for text in texts]
+        vectors = self.cache.get_many(keys)
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        missing_keys = list(missing)
+        for start in range(0, len(missing_keys), self.batch_size):
+            batch = missing_keys[start:start + self.batch_size]
+            embedded = self.embedder.embed_many([missing[key] for key in batch])
+            self.calls += 1
+            new_vectors = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(batch, embedded)}
+            self.cache.put_many(new_vectors)
+            vectors.update(new_vectors)
+        return [vectors[key] for key in keys]
+
+    def stats(self) -> Dict[str, float]:
+        return {**self.cache.stats(), "embedding_calls": self.calls}
+
+
+_shared_cache: Optional[EmbeddingCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = EmbeddingCache(os.environ.get("EMBEDDING_CACHE_PATH", DEFAULT_CACHE_PATH))
+        return _shared_cache
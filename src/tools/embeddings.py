@@ -0,0 +1,60 @@
+import math
+import zlib
+from typing import List
+
+from src.tools.query_cache import normalize_query
+
+
+class HashingEmbedder:
+    """Offline embedder: hashed character n-grams of the normalized text, L2-normalized.
+
+    Needs no model or network, so it suits near-duplicate detection and tests.
+    Character n-grams work for Korean as well as English text.
+    """
+
+    def __init__(self, dim: int = 256, ngram_sizes=(2, 3)):
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+
+    def embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        normalized = normalize_query(text)
+        for n in self.ngram_sizes:
+            for i in range(max(1, len(normalized) - n + 1)):
+                gram = normalized[i:i + n].encode("utf-8")
+                h = zlib.crc32(gram)
+                # 부호 해싱으로 충돌 편향을 줄인다
+                vector[h % self.dim] += 1.0 if (h >> 16) & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+    def embed_many(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed(text) for text in texts]
+
+
+class OpenAIEmbedder:
+    """OpenAI embeddings API; the client is created on first use and reused."""
+
+    def __init__(self, model: str = "text-embedding-3-small"):
+        self.model = model
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI()
+        return self._client
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: List[str]) -> List[List[float]]:
+        response = self._get_client().embeddings.create(input=texts, model=self.model)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    """Cosine similarity; vectors from HashingEmbedder are already unit length."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
@@ -1,3 +1,4 @@
+import asyncio
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 from typing import Optional
@@ -32,7 +33,8 @@ class WriteFileTool(BaseTool):
             return "Error with the input format for the tool."
             
     async def _arun(self, data: str):
-        return self._run(data)
+        # 파일 쓰기는 워커 스레드에서 수행해 이벤트 루프를 막지 않는다
+        return await asyncio.to_thread(self._run, data)
 
 
 class FileTools:
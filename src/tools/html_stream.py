@@ -0,0 +1,167 @@
+import re
+from html.parser import HTMLParser
+from typing import Iterable, Iterator, List, Optional
+
+# 텍스트 요소의 경계가 되는 블록 태그
+BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "br", "caption", "dd", "div", "dl", "dt",
+    "figcaption", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li",
+    "main", "nav", "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+})
+# 내용을 버리는 태그
+SKIP_TAGS = frozenset({"script", "style", "noscript", "template", "svg", "iframe"})
+# 문장 경계 (영문/한글 마침표, 물음표, 느낌표 뒤 공백)
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。！？])\s+")
+# 토큰 추정치: UTF-8 4바이트당 1토큰
+BYTES_PER_TOKEN = 4
+CHUNK_SEPARATOR = "\n\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 UTF-8 bytes per token), good enough for chunk budgeting."""
+    return max(1, len(text.encode("utf-8")) // BYTES_PER_TOKEN)
+
+
+class _ElementParser(HTMLParser):
+    """Incremental parser that collects the text of block-level elements as they close."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.elements: List[str] = []
+        self._text: List[str] = []
+        self._skip_depth = 0
+        self._in_head = False
+
+    def handle_starttag(self, tag, attrs):
+        # </head> 가 빠진 문서가 많으므로 head 는 <body> 에서도 끝난다
+        if tag == "head":
+            self._in_head = True
+        elif tag == "body":
+            self._in_head = False
+        elif tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self._in_head = False
+        elif tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if not self._skip_depth and not self._in_head:
+            self._text.append(data)
+
+    def _flush(self):
+        text = " ".join("".join(self._text).split())
+        self._text = []
+        if text:
+            self.elements.append(text)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+class HtmlElementStream:
+    """Push-style wrapper around the parser: feed HTML pieces, get finished text elements back."""
+
+    def __init__(self):
+        self._parser = _ElementParser()
+
+    def feed(self, html: str) -> List[str]:
+        self._parser.feed(html)
+        elements = self._parser.elements
+        self._parser.elements = []
+        return elements
+
+    def close(self) -> List[str]:
+        self._parser.close()
+        return self._parser.elements
+
+
+def iter_html_elements(html_chunks: Iterable[str]) -> Iterator[str]:
+    """Yield text elements from an HTML document delivered in pieces.
+
+    Only the current unfinished element is held in memory, so the input can be
+    a streaming HTTP response of any size.
+    """
+    stream = HtmlElementStream()
+    for html in html_chunks:
+        yield from stream.feed(html)
+    yield from stream.close()
+
+
+def _split_oversized(text: str, max_tokens: int) -> Iterator[str]:
+    """Split an element that does not fit in one chunk, on sentences first, then on characters."""
+    for sentence in SENTENCE_BOUNDARY.split(text):
+        if estimate_tokens(sentence) <= max_tokens:
+            yield sentence
+            continue
+        # 문장 하나가 예산보다 길면 문자 단위로 자른다
+        step = max(1, len(sentence) * max_tokens // estimate_tokens(sentence))
+        for i in range(0, len(sentence), step):
+            yield sentence[i:i + step]
+
+
+class ChunkPacker:
+    """Packs elements into chunks of at most max_tokens, breaking only on element or sentence boundaries.
+
+    Once content_budget tokens have been accepted, `full` turns true and further
+    elements are ignored, so the caller can stop reading the source early.
+    """
+
+    def __init__(self, max_tokens: int, content_budget: Optional[int] = None):
+        self.max_bytes = max_tokens * BYTES_PER_TOKEN
+        self.max_tokens = max_tokens
+        self.budget_bytes = None if content_budget is None else content_budget * BYTES_PER_TOKEN
+        self.full = False
+        self._parts: List[str] = []
+        self._part_bytes = 0
+        self._total_bytes = 0
+
+    def add(self, element: str) -> List[str]:
+        """Add an element and return any chunks it completed."""
+        chunks = []
+        if self.full:
+            return chunks
+        pieces = [element] if estimate_tokens(element) <= self.max_tokens else _split_oversized(element, self.max_tokens)
+        for piece in pieces:
+            size = len(piece.encode("utf-8"))
+            if self.budget_bytes is not None and self._total_bytes + size > self.budget_bytes:
+                self.full = True
+                break
+            if self._parts and self._part_bytes + len(CHUNK_SEPARATOR) + size > self.max_bytes:
+                chunks.extend(self.flush())
+            self._part_bytes += size + (len(CHUNK_SEPARATOR) if self._parts else 0)
+            self._parts.append(piece)
+            self._total_bytes += size
+        if self.full:
+            chunks.extend(self.flush())
+        return chunks
+
+    def flush(self) -> List[str]:
+        """Return the pending partial chunk, if any."""
+        if not self._parts:
+            return []
+        chunk = CHUNK_SEPARATOR.join(self._parts)
+        self._parts, self._part_bytes = [], 0
+        return [chunk]
+
+
+def pack_chunks(elements: Iterable[str], max_tokens: int,
+                content_budget: Optional[int] = None) -> Iterator[str]:
+    """Generator form of ChunkPacker; stops consuming elements once the content budget is reached."""
+    packer = ChunkPacker(max_tokens, content_budget)
+    for element in elements:
+        yield from packer.add(element)
+        if packer.full:
+            return
+    yield from packer.flush()
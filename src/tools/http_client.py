@@ -0,0 +1,241 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+# 재시도 대상 HTTP 상태 코드 (rate limit + 서버 오류)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# (connect, read) timeout 기본값(초)
+DEFAULT_TIMEOUT = (5.0, 60.0)
+# 호스트별로 보관하는 최근 지연시간 샘플 수
+LATENCY_SAMPLES = 512
+
+
+class HostStats:
+    """Latency and error counters for one host."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def snapshot(self) -> Dict[str, float]:
+        samples = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "avg": sum(samples) / len(samples) if samples else 0.0,
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "max": samples[-1] if samples else 0.0,
+        }
+
+
+def percentile(sorted_samples, pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(pct / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+class LatencyRecorder:
+    """Thread-safe per-host stats, shareable between the sync and async clients."""
+
+    def __init__(self):
+        self._stats: Dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, host: str, latency: float, error: bool, retry: bool):
+        with self._lock:
+            stats = self._stats.setdefault(host, HostStats())
+            stats.requests += 1
+            stats.errors += int(error)
+            stats.retries += int(retry)
+            stats.latencies.append(latency)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {host: stats.snapshot() for host, stats in self._stats.items()}
+
+
+def backoff_delay(attempt: int, base: float, maximum: float, retry_after: Optional[str] = None) -> float:
+    """Full-jitter exponential backoff, or the server's Retry-After (seconds) when given."""
+    if retry_after is not None:
+        try:
+            return min(maximum, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    return random.uniform(0, min(maximum, base * (2 ** attempt)))
+
+
+class HttpClient:
+    """Pooled keep-alive HTTP client shared by the web tools.
+
+    Every request gets a timeout, and 429/5xx responses or connection errors are
+    retried with full-jitter exponential backoff (honouring Retry-After).
+    """
+
+    def __init__(self,
+                 timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                 max_retries: int = 3,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 10.0,
+                 pool_maxsize: int = 16,
+                 recorder: Optional[LatencyRecorder] = None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.recorder = recorder or LatencyRecorder()
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+        for attempt in range(self.max_retries + 1):
+            start_time = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(host, time.perf_counter() - start_time, error=True, retry=attempt > 0)
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+            self._record(host, time.perf_counter() - start_time,
+                         error=response.status_code >= 400, retry=attempt > 0)
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+            delay = self._backoff(attempt, response.headers.get("Retry-After"))
+            response.close()
+            time.sleep(delay)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        return backoff_delay(attempt, self.backoff_base, self.backoff_max, retry_after)
+
+    def _record(self, host: str, latency: float, error: bool, retry: bool):
+        self.recorder.record(host, latency, error, retry)
+
+    def host_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-host request counts and latency percentiles (seconds)."""
+        return self.recorder.snapshot()
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncHttpClient:
+    """httpx-based async counterpart of HttpClient with the same timeout/retry policy."""
+
+    def __init__(self,
+                 timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                 max_retries: int = 3,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 10.0,
+                 pool_maxsize: int = 64,
+                 recorder: Optional[LatencyRecorder] = None):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.recorder = recorder or LatencyRecorder()
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize))
+
+    async def _send(self, method: str, url: str, stream: bool, **kwargs) -> httpx.Response:
+        host = urlsplit(url).netloc
+        request = self.client.build_request(method, url, **kwargs)
+        for attempt in range(self.max_retries + 1):
+            start_time = time.perf_counter()
+            try:
+                response = await self.client.send(request, stream=stream)
+            except httpx.TransportError:
+                self.recorder.record(host, time.perf_counter() - start_time, error=True, retry=attempt > 0)
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max))
+                continue
+            self.recorder.record(host, time.perf_counter() - start_time,
+                                 error=response.status_code >= 400, retry=attempt > 0)
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+            await response.aclose()
+            await asyncio.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max,
+                                              response.headers.get("Retry-After")))
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        return await self._send(method, url, stream=False, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Retrying request whose body is read incrementally (response.aiter_text())."""
+        response = await self._send(method, url, stream=True, **kwargs)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    def host_stats(self) -> Dict[str, Dict[str, float]]:
+        return self.recorder.snapshot()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+# 동기/비동기 공용 클라이언트는 통계를 함께 쌓는다
+_shared_recorder = LatencyRecorder()
+_shared_client: Optional[HttpClient] = None
+_shared_client_lock = threading.Lock()
+# httpx.AsyncClient 는 이벤트 루프에 묶이므로 루프마다 하나씩 만든다
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHttpClient]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> HttpClient:
+    """Process-wide HttpClient so tool calls reuse pooled connections."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient(recorder=_shared_recorder)
+        return _shared_client
+
+
+def get_async_http_client() -> AsyncHttpClient:
+    """AsyncHttpClient for the running event loop, sharing stats with get_http_client()."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncHttpClient(recorder=_shared_recorder)
+    return client
+
+
+def http_host_stats() -> Dict[str, Dict[str, float]]:
+    """Per-host stats of the shared sync and async clients."""
+    return _shared_recorder.snapshot()
@@ -1,96 +1,210 @@
+import asyncio
+import hashlib
 import os
-import openai
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 import chromadb
-from chromadb.config import Settings
+from src.tools.embedding_cache import CachedEmbedder
+from src.tools.embeddings import HashingEmbedder, OpenAIEmbedder
+
+# 경로별 PersistentClient 캐시 (같은 DB 파일에 클라이언트를 여러 번 열지 않는다)
+_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_persistent_client(path: str):
+    """Process-wide chromadb.PersistentClient for a directory."""
+    path = os.path.abspath(path)
+    with _clients_lock:
+        if path not in _clients:
+            _clients[path] = chromadb.PersistentClient(path=path)
+        return _clients[path]
+
+
+def document_id(text: str, *metadata: Optional[str]) -> str:
+    """Content-addressed document id: the same text (and metadata values) always map to the same entry.
+
+    Without metadata values the id depends on the text alone.
+    """
+    if any(metadata):
+        text = "\x00".join([text, *(value or "" for value in metadata)])
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def build_where(source: Optional[str] = None, session: Optional[str] = None,
+                has_feedback: Optional[bool] = None) -> Optional[Dict]:
+    """Chroma metadata filter from the optional retrieval filters."""
+    conditions = []
+    if source:
+        conditions.append({"source": source})
+    if session:
+        conditions.append({"session": session})
+    if has_feedback is not None:
+        conditions.append({"has_feedback": has_feedback})
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def default_embedder():
+    """KNOWLEDGE_EMBEDDER=hashing 이면 오프라인 임베더, 아니면 OpenAI 임베딩 (디스크 캐시 사용)"""
+    if os.environ.get("KNOWLEDGE_EMBEDDER", "openai") == "hashing":
+        return CachedEmbedder(HashingEmbedder())
+    return CachedEmbedder(OpenAIEmbedder())
 
 class KnowledgeToolSchema(BaseModel):
     agent_name: str = Field(..., description="에이전트 이름 (knowledge/{agent_name}/)")
     mode: str = Field(..., description="'add' 또는 'retrieve' 중 하나. add는 지식 축적, retrieve는 인출.")
     content: Optional[str] = Field(None, description="추가할 지식 내용 (mode=add일 때)")
     feedback: Optional[str] = Field(None, description="피드백 내용 (mode=add일 때 선택)")
-    query: Optional[str] = Field(None, description="검색 쿼리 (mode=retrieve일 때)")
+    query: Optional[str] = Field(None, description="검색 쿼리 (mode=retrieve일 때, 생략하면 필터에 맞는 문서를 저장된 순서대로 나열)")
+    source: Optional[str] = Field(None, description="지식 출처 (add 시 기록, retrieve 시 필터)")
+    session: Optional[str] = Field(None, description="세션 ID (add 시 기록, retrieve 시 필터)")
+    has_feedback: Optional[bool] = Field(None, description="retrieve 시 피드백이 있는 문서만(true)/없는 문서만(false)")
+    n_results: int = Field(3, description="retrieve 결과 수")
+    offset: int = Field(0, description="retrieve 결과 페이지 시작 위치")
 
 class KnowledgeTool(BaseTool):
     name: str = "knowledge_management"
     description: str = "에이전트별 마크다운 지식 관리 및 ChromaDB 기반 유사도 검색 툴. mode(add/retrieve)에 따라 지식 축적 또는 인출을 수행."
     args_schema: type = KnowledgeToolSchema
+    knowledge_dir: str = "knowledge"
+    embedder: Any = Field(default=None, exclude=True)
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, embedder=None, knowledge_dir: str = "knowledge"):
+        super().__init__(knowledge_dir=knowledge_dir)
+        self.embedder = embedder or default_embedder()
         # 지식 관리 디렉토리가 없으면 생성
         self._ensure_knowledge_dir()
         
     def _ensure_knowledge_dir(self):
         """지식 관리 디렉토리 구조 확인 및 생성"""
-        knowledge_dir = Path("knowledge")
+        knowledge_dir = Path(self.knowledge_dir)
         knowledge_dir.mkdir(exist_ok=True)
+
+    def _agent_dir(self, agent_name) -> Path:
+        return Path(self.knowledge_dir) / agent_name
         
     def _get_collection(self, agent_name):
         # 에이전트별 지식 저장소 경로 생성
-        agent_dir = Path(f"knowledge/{agent_name}")
+        agent_dir = self._agent_dir(agent_name)
         agent_dir.mkdir(parents=True, exist_ok=True)
         
         chroma_dir = agent_dir / "chroma_db"
         chroma_dir.mkdir(exist_ok=True)
         
-        client = chromadb.Client(Settings(
-            persist_directory=str(chroma_dir)
-        ))
-        return client.get_or_create_collection(name="knowledge")
+        # 임베딩은 직접 계산해서 넘기므로 chroma 기본 임베딩 모델은 로드하지 않는다
+        client = get_persistent_client(str(chroma_dir))
+        # 정규화된 임베딩이므로 HNSW 인덱스는 cosine 거리로 만든다 (기존 컬렉션 설정은 유지됨)
+        return client.get_or_create_collection(name="knowledge", embedding_function=None,
+                                               metadata={"hnsw:space": "cosine"})
 
     def _embed(self, text):
-        resp = openai.Embedding.create(input=text, model="text-embedding-ada-002")
-        return resp["data"][0]["embedding"]
+        return self._embed_many([text])[0]
 
-    def _run(self, agent_name: str, mode: str, content: Optional[str] = None, feedback: Optional[str] = None, query: Optional[str] = None):
-        collection = self._get_collection(agent_name)
+    def _embed_many(self, texts):
+        # CachedEmbedder 는 float32 배열을 돌려주므로 chroma 에는 리스트로 넘긴다
+        return [vector.tolist() if hasattr(vector, "tolist") else vector
+                for vector in self.embedder.embed_many(texts)]
+
+    def _run(self, agent_name: str, mode: str, content: Optional[str] = None, feedback: Optional[str] = None,
+             query: Optional[str] = None, source: Optional[str] = None, session: Optional[str] = None,
+             has_feedback: Optional[bool] = None, n_results: int = 3, offset: int = 0):
         if mode == "add":
             if not content:
                 return "content가 필요합니다."
-            emb = self._embed(content)
-            doc_id = f"{datetime.now().strftime('%Y-%m-%d_%H%M%S')}"
-            metadata = {"content": content}
-            if feedback:
-                metadata["feedback"] = feedback
-            collection.add(
-                ids=[doc_id],
-                embeddings=[emb],
-                metadatas=[metadata],
-                documents=[content]
-            )
-            # 마크다운 파일도 저장 (옵션)
-            agent_dir = Path(f"knowledge/{agent_name}")
-            agent_dir.mkdir(parents=True, exist_ok=True)
-            file_path = agent_dir / f"{doc_id}.md"
-            with open(file_path, "w") as f:
-                f.write(f"# 발견 내용\n{content}\n")
-                if feedback:
-                    f.write(f"\n## 피드백\n{feedback}\n")
-            return f"새 문서가 생성되었습니다: {file_path}"
+            return self._add(agent_name, content, feedback, source, session)
         elif mode == "retrieve":
+            if n_results < 1 or offset < 0:
+                return "n_results는 1 이상, offset은 0 이상이어야 합니다."
+            where = build_where(source, session, has_feedback)
             if not query:
-                return "query가 필요합니다."
-            emb = self._embed(query)
-            results = collection.query(
-                query_embeddings=[emb],
-                n_results=3
-            )
-            if not results["ids"][0]:
-                return "지식이 없습니다."
-            output = []
-            for doc_id, metadata in zip(results["ids"][0], results["metadatas"][0]):
-                agent_dir = Path(f"knowledge/{agent_name}")
-                file_path = agent_dir / f"{doc_id}.md"
-                if file_path.exists():
-                    with open(file_path) as f:
-                        output.append(f"[문서: {file_path}]\n" + f.read())
-                else:
-                    output.append(f"[ID: {doc_id}]\n{metadata.get('content', '')}")
-            return "\n\n---\n\n".join(output)
+                if where is None:
+                    return "query 또는 필터(source, session, has_feedback)가 필요합니다."
+                return self._list(agent_name, where, n_results, offset)
+            return self._retrieve(agent_name, query, where, n_results, offset)
         else:
-            return "mode는 add 또는 retrieve만 지원합니다." 
\ No newline at end of file
+            return "mode는 add 또는 retrieve만 지원합니다."
+
+    def _add(self, agent_name, content, feedback=None, source=None, session=None):
+        collection = self._get_collection(agent_name)
+        # 같은 내용이라도 피드백/출처/세션이 다르면 다른 문서로 저장한다
+        doc_id = document_id(content, feedback, source, session)
+        file_path = self._agent_dir(agent_name) / f"{doc_id}.md"
+        # 내용과 메타데이터가 모두 같으면 같은 ID 이므로 기존 문서를 덮어쓰지 않는다
+        if collection.get(ids=[doc_id], include=[])["ids"]:
+            return f"이미 저장된 지식입니다: {file_path}"
+        now = time.time()
+        metadata = {
+            "agent_name": agent_name,
+            "timestamp": now,
+            "created_at": datetime.fromtimestamp(now).isoformat(timespec="seconds"),
+            "has_feedback": bool(feedback),
+        }
+        if feedback:
+            metadata["feedback"] = feedback
+        if source:
+            metadata["source"] = source
+        if session:
+            metadata["session"] = session
+        collection.add(
+            ids=[doc_id],
+            embeddings=[self._embed(content)],
+            metadatas=[metadata],
+            documents=[content]
+        )
+        # 마크다운 파일도 저장 (옵션)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, "w") as f:
+            f.write(f"# 발견 내용\n{content}\n")
+            if feedback:
+                f.write(f"\n## 피드백\n{feedback}\n")
+        return f"새 문서가 생성되었습니다: {file_path}"
+
+    def _retrieve(self, agent_name, query, where=None, n_results=3, offset=0):
+        collection = self._get_collection(agent_name)
+        # chroma 는 offset 을 지원하지 않으므로 앞 페이지까지 함께 가져와 잘라낸다
+        results = collection.query(
+            query_embeddings=[self._embed(query)],
+            n_results=offset + n_results,
+            where=where,
+            include=["documents", "metadatas"]
+        )
+        entries = list(zip(results["ids"][0], results["documents"][0], results["metadatas"][0]))
+        return self._format_entries(agent_name, entries[offset:offset + n_results])
+
+    def _list(self, agent_name, where, n_results=3, offset=0):
+        collection = self._get_collection(agent_name)
+        # 페이지 단위로만 읽는다 (chroma 는 정렬을 지원하지 않으므로 저장된 순서)
+        results = collection.get(where=where, limit=n_results, offset=offset, include=["documents", "metadatas"])
+        entries = list(zip(results["ids"], results["documents"], results["metadatas"]))
+        return self._format_entries(agent_name, entries)
+
+    def _format_entries(self, agent_name, entries):
+        if not entries:
+            return "지식이 없습니다."
+        # 저장된 문서를 컬렉션에서 바로 읽는다 (마크다운 파일은 사람이 보기 위한 사본)
+        output = []
+        for doc_id, document, metadata in entries:
+            metadata = metadata or {}
+            file_path = self._agent_dir(agent_name) / f"{doc_id}.md"
+            entry = f"[문서: {file_path}]\n"
+            if metadata.get("source"):
+                entry += f"[출처: {metadata['source']}]\n"
+            entry += f"# 발견 내용\n{document}\n"
+            if metadata.get("feedback"):
+                entry += f"\n## 피드백\n{metadata['feedback']}\n"
+            output.append(entry)
+        return "\n\n---\n\n".join(output)
+
+    async def _arun(self, agent_name: str, mode: str, content: Optional[str] = None, feedback: Optional[str] = None,
+                    query: Optional[str] = None, source: Optional[str] = None, session: Optional[str] = None,
+                    has_feedback: Optional[bool] = None, n_results: int = 3, offset: int = 0):
+        # ChromaDB 로컬 클라이언트는 동기 API 뿐이라 워커 스레드에서 실행한다
+        return await asyncio.to_thread(self._run, agent_name, mode, content, feedback, query,
+                                       source, session, has_feedback, n_results, offset)
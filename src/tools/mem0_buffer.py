@@ -0,0 +1,158 @@
+import atexit
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+# agent_id 별로 이만큼 쌓이면 바로 전송
+DEFAULT_MAX_BATCH = 10
+# 가장 오래된 항목이 이 시간(초)을 넘기면 전송
+DEFAULT_FLUSH_INTERVAL = 5.0
+DEFAULT_MAX_RETRIES = 3
+
+# 종료 시 flush 할 버퍼들. atexit 훅은 프로세스에 하나만 등록
+_open_buffers: "weakref.WeakSet[Mem0WriteBuffer]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_buffers():
+    for buffer in list(_open_buffers):
+        buffer.close()
+
+
+class Mem0WriteBuffer:
+    """Write-behind buffer for mem0 adds.
+
+    add() only enqueues; a background thread sends an agent's pending entries
+    once max_batch entries or flush_interval seconds have accumulated. Each
+    entry is still its own client.add, so mem0 extracts memories from every
+    entry separately exactly as an unbuffered add would. Failed adds are
+    retried with backoff and everything left is flushed on close() /
+    interpreter exit. on_sent(agent_id) runs after each send of an agent's
+    entries has finished, e.g. to invalidate cached searches.
+    """
+
+    def __init__(self, client, max_batch: int = DEFAULT_MAX_BATCH, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_retries: int = DEFAULT_MAX_RETRIES, backoff_base: float = 1.0,
+                 on_sent: Optional[Callable[[str], None]] = None):
+        self.client = client
+        self.on_sent = on_sent
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        # agent_id -> 쌓인 메시지 묶음 목록 / 처음 쌓인 시각
+        self._pending: Dict[str, List] = {}
+        self._first_added: Dict[str, float] = {}
+        # 큐에서 꺼냈지만 아직 client.add 가 끝나지 않은 항목 수
+        self._in_flight: Dict[str, int] = {}
+        self._condition = threading.Condition()
+        self._agent_locks: Dict[str, threading.Lock] = {}
+        self._closed = False
+        self._thread = threading.Thread(target=self._flush_loop, name="mem0-writer", daemon=True)
+        self._thread.start()
+        _open_buffers.add(self)
+
+    def add(self, agent_id: str, messages: List[Dict]):
+        """Queue one knowledge entry (a mem0 message list) for agent_id."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Mem0WriteBuffer is closed")
+            self._pending.setdefault(agent_id, []).append(messages)
+            self._first_added.setdefault(agent_id, time.monotonic())
+            if len(self._pending[agent_id]) >= self.max_batch:
+                self._condition.notify()
+
+    def pending(self, agent_id: Optional[str] = None) -> int:
+        """Entries not yet written to mem0, counting ones a background send is still writing."""
+        with self._condition:
+            if agent_id is not None:
+                return len(self._pending.get(agent_id, [])) + self._in_flight.get(agent_id, 0)
+            return (sum(len(entries) for entries in self._pending.values())
+                    + sum(self._in_flight.values()))
+
+    def flush(self, agent_id: Optional[str] = None):
+        """Send pending entries now (for one agent or all) and wait for completion.
+
+        Also waits for a background send of the same agent that is already in flight.
+        """
+        with self._condition:
+            agent_ids = [agent_id] if agent_id is not None else list(self._pending.keys() | self._in_flight.keys())
+        for pending_agent in agent_ids:
+            self._send(pending_agent)
+
+    def seed(self, knowledge: Dict[str, List[List[Dict]]], max_workers: int = 4):
+        """Bulk path for initial knowledge: agents are sent in parallel, each agent's entries in order."""
+        for agent_id, entries in knowledge.items():
+            for messages in entries:
+                self.add(agent_id, messages)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mem0-seed") as executor:
+            list(executor.map(self._send, list(knowledge)))
+
+    def _flush_loop(self):
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                self._condition.wait(timeout=self.flush_interval / 2)
+                now = time.monotonic()
+                due = [agent_id for agent_id, entries in self._pending.items()
+                       if len(entries) >= self.max_batch or now - self._first_added[agent_id] >= self.flush_interval]
+            for agent_id in due:
+                self._send(agent_id)
+
+    def _send(self, agent_id: str):
+        # 같은 agent_id 의 전송은 순서대로 하나씩만 진행
+        with self._condition:
+            lock = self._agent_locks.setdefault(agent_id, threading.Lock())
+        with lock:
+            with self._condition:
+                entries = self._pending.pop(agent_id, [])
+                self._first_added.pop(agent_id, None)
+                if entries:
+                    self._in_flight[agent_id] = len(entries)
+            if not entries:
+                return
+            try:
+                # 항목을 하나의 대화로 합치면 mem0 의 추출 결과가 달라지므로 항목마다 따로 add
+                for messages in entries:
+                    self._send_entry(agent_id, messages)
+            finally:
+                with self._condition:
+                    self._in_flight.pop(agent_id, None)
+                    self.batches += 1
+                if self.on_sent is not None:
+                    self.on_sent(agent_id)
+
+    def _send_entry(self, agent_id: str, messages: List[Dict]):
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.client.add(messages, agent_id=agent_id)
+                with self._condition:
+                    self.sent += 1
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    with self._condition:
+                        self.failed += 1
+                    print(f"Warning: Failed to write a mem0 entry for '{agent_id}': {e}")
+                    return
+                time.sleep(self.backoff_base * (2 ** attempt))
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": self.pending(), "sent": self.sent, "batches": self.batches, "failed": self.failed}
+
+    def close(self):
+        """Stop the background writer after flushing everything still queued."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=self.flush_interval)
+        self.flush()
+        _open_buffers.discard(self)
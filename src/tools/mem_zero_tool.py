@@ -1,9 +1,14 @@
+import asyncio
 import os
-from datetime import datetime
-from typing import Optional
+import threading
+import time
+import weakref
+from typing import Dict, Optional, Tuple
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
-from mem0 import MemoryClient
+from mem0 import AsyncMemoryClient, MemoryClient
+from src.tools.mem0_buffer import Mem0WriteBuffer
+from src.tools.retrieval_cache import DEFAULT_SIMILARITY_THRESHOLD, RetrievalCache
 
 class MemZeroToolSchema(BaseModel):
     agent_name: str = Field(..., description="에이전트 이름 (agent_id로 사용)")
@@ -12,50 +17,240 @@ class MemZeroToolSchema(BaseModel):
     feedback: Optional[str] = Field(None, description="피드백 내용 (mode=add일 때 선택)")
     query: Optional[str] = Field(None, description="검색 쿼리 (mode=retrieve일 때)")
 
+_shared_client: Optional[MemoryClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_mem0_client() -> MemoryClient:
+    """Process-wide MemoryClient; creating one validates the API key over the network."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = MemoryClient(api_key=os.environ.get('MEM_ZERO_API_KEY'))
+        return _shared_client
+
+
+def query_embedder(name: Optional[str]):
+    """Embedder for similar-query reuse in the retrieval cache; None means exact matches only."""
+    if name is None:
+        return None
+    if name == "openai":
+        from src.tools.embedding_cache import CachedEmbedder
+        from src.tools.embeddings import OpenAIEmbedder
+        return CachedEmbedder(OpenAIEmbedder())
+    # hashing 임베더는 "세율 인상"/"세율 인하" 를 같은 질문으로 보므로 허용하지 않는다
+    raise ValueError(f"Unknown query_embedder {name!r}; use 'openai' or omit it for exact matches only")
+
+
+class _ClientState:
+    """Write buffer and retrieval caches shared by every MemZeroTool using one mem0 client.
+
+    The registry builds one tool per agents.yaml options set, so a write through
+    any of them has to invalidate the cached searches of all of them.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.write_buffer: Optional[Mem0WriteBuffer] = None
+        self.retrieval_caches: Dict[Tuple[Optional[str], float], RetrievalCache] = {}
+        # AsyncMemoryClient 는 이벤트 루프에 묶인 httpx.AsyncClient 를 쓰므로 루프마다 하나씩 만든다
+        self.async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncMemoryClient]" = \
+            weakref.WeakKeyDictionary()
+
+    def get_write_buffer(self, client) -> Mem0WriteBuffer:
+        with self.lock:
+            if self.write_buffer is None:
+                # 전송이 끝난 뒤에도 한 번 더 무효화 (전송 중에 저장된 검색 결과 제거)
+                self.write_buffer = Mem0WriteBuffer(client, on_sent=self.invalidate)
+            return self.write_buffer
+
+    def get_retrieval_cache(self, embedder_name: Optional[str], similarity_threshold: float) -> RetrievalCache:
+        key = (embedder_name, similarity_threshold)
+        with self.lock:
+            if key not in self.retrieval_caches:
+                self.retrieval_caches[key] = RetrievalCache(embedder=query_embedder(embedder_name),
+                                                            similarity_threshold=similarity_threshold)
+            return self.retrieval_caches[key]
+
+    def get_async_client(self, client) -> AsyncMemoryClient:
+        """AsyncMemoryClient for the running event loop, with the key/host/org of client."""
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            async_client = self.async_clients.get(loop)
+            if async_client is None:
+                async_client = self.async_clients[loop] = AsyncMemoryClient(
+                    api_key=client.api_key, host=client.host, org_id=client.org_id, project_id=client.project_id)
+            return async_client
+
+    def invalidate(self, agent_id: str):
+        with self.lock:
+            caches = list(self.retrieval_caches.values())
+        for cache in caches:
+            cache.invalidate(agent_id)
+
+
+_client_states: "weakref.WeakKeyDictionary[MemoryClient, _ClientState]" = weakref.WeakKeyDictionary()
+_client_states_lock = threading.Lock()
+
+
+def _client_state(client) -> _ClientState:
+    with _client_states_lock:
+        state = _client_states.get(client)
+        if state is None:
+            state = _client_states[client] = _ClientState()
+        return state
+
+
 class MemZeroTool(BaseTool):
     name: str = "mem_zero_management"
     description: str = "에이전트별 지식 검색 툴. mode(add/retrieve)에 따라 지식 축적 또는 인출을 수행."
     args_schema: type = MemZeroToolSchema
     client: MemoryClient = Field(default=None, exclude=True)
+    async_client: Optional[AsyncMemoryClient] = Field(default=None, exclude=True)
+    # add 는 write-behind 버퍼에 쌓고 백그라운드에서 agent_id 별로 묶어서 전송.
+    # 버퍼와 검색 캐시는 지정하지 않으면 같은 client 를 쓰는 툴끼리 공유
+    buffered: bool = True
+    write_buffer: Optional[Mem0WriteBuffer] = Field(default=None, exclude=True)
+    # 같은 실행 안에서 반복되는(비슷한) 검색은 로컬 캐시에서 응답
+    retrieval_cache: Optional[RetrievalCache] = Field(default=None, exclude=True)
+    # "openai" 이면 임베딩이 similarity_threshold 이상 비슷한 쿼리도 캐시에서 응답 (기본은 정규화된 완전 일치만)
+    query_embedder: Optional[str] = None
+    similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+    # retrieve 결과 수 (None 이면 mem0 기본값). agents.yaml 에서 에이전트별로 지정 가능
+    top_k: Optional[int] = None
 
-    def __init__(self):
-        super().__init__()
-        self.client = MemoryClient(api_key=os.environ.get('MEM_ZERO_API_KEY'))
+    def __init__(self, client: Optional[MemoryClient] = None, **options):
+        """options are field values from agents.yaml, e.g. {knowledge_management: {top_k: 5, query_embedder: openai}}."""
+        unknown = sorted(set(options) - set(type(self).model_fields))
+        if unknown:
+            raise TypeError(f"MemZeroTool does not accept options {unknown}")
+        super().__init__(**options)
+        self.client = client or get_mem0_client()
+        if self.retrieval_cache is None:
+            self.retrieval_cache = _client_state(self.client).get_retrieval_cache(
+                self.query_embedder, self.similarity_threshold)
 
     def _run(self, agent_name: str, mode: str, content: Optional[str] = None, feedback: Optional[str] = None, query: Optional[str] = None):
         if mode == "add":
             if not content:
                 return "content가 필요합니다."
             
-            # Mem0 형식에 맞게 메시지 구성
-            messages = [
-                {"role": "user", "content": content}
-            ]
-            if feedback:
-                messages.append({"role": "assistant", "content": feedback})
-            
             # Mem0에 지식 추가
-            self.client.add(messages, agent_id=agent_name)
+            self._add(agent_name, self._messages(content, feedback))
             return f"새로운 지식이 {agent_name}에 추가되었습니다."
             
         elif mode == "retrieve":
             if not query:
                 return "query가 필요합니다."
             
-            # Mem0에서 지식 검색
-            results = self.client.search(query, agent_id=agent_name)
-            
-            if not results:
-                return "지식이 없습니다."
-            
-            # 검색 결과 포맷팅
-            output = []
-            for result in results:
-                memory = result.get('memory', '')
-                score = result.get('score', 0)
-                output.append(f"[유사도: {score:.2f}]\n{memory}")
-            
-            return "\n\n---\n\n".join(output)
+            # Mem0에서 지식 검색 (아직 전송되지 않은 같은 에이전트의 지식을 먼저 반영)
+            self._flush_pending(agent_name)
+            results = self._cached_search(agent_name, query)
+            if results is None:
+                generation = self._cache_generation(agent_name)
+                start_time = time.perf_counter()
+                results = self.client.search(query, agent_id=agent_name, **self._search_options())
+                self._remember_search(agent_name, query, results, time.perf_counter() - start_time, generation)
+            return self._format_results(results)
             
         else:
-            return "mode는 add 또는 retrieve만 지원합니다." 
\ No newline at end of file
+            return "mode는 add 또는 retrieve만 지원합니다."
+
+    async def _arun(self, agent_name: str, mode: str, content: Optional[str] = None, feedback: Optional[str] = None, query: Optional[str] = None):
+        if mode == "add":
+            if not content:
+                return "content가 필요합니다."
+            if self.buffered:
+                self._add(agent_name, self._messages(content, feedback))
+            else:
+                self._invalidate(agent_name)
+                await self._get_async_client().add(self._messages(content, feedback), agent_id=agent_name)
+                self._invalidate(agent_name)
+            return f"새로운 지식이 {agent_name}에 추가되었습니다."
+
+        elif mode == "retrieve":
+            if not query:
+                return "query가 필요합니다."
+            write_buffer = self._get_write_buffer(create=False)
+            if write_buffer is not None and write_buffer.pending(agent_name):
+                await asyncio.to_thread(self._flush_pending, agent_name)
+            results = self._cached_search(agent_name, query)
+            if results is None:
+                generation = self._cache_generation(agent_name)
+                start_time = time.perf_counter()
+                results = await self._get_async_client().search(query, agent_id=agent_name, **self._search_options())
+                self._remember_search(agent_name, query, results, time.perf_counter() - start_time, generation)
+            return self._format_results(results)
+
+        else:
+            return "mode는 add 또는 retrieve만 지원합니다."
+
+    def _add(self, agent_name: str, messages):
+        self._invalidate(agent_name)
+        if not self.buffered:
+            self.client.add(messages, agent_id=agent_name)
+            self._invalidate(agent_name)
+            return
+        self._get_write_buffer().add(agent_name, messages)
+
+    def _get_write_buffer(self, create: bool = True) -> Optional[Mem0WriteBuffer]:
+        if self.write_buffer is not None:
+            return self.write_buffer
+        state = _client_state(self.client)
+        return state.get_write_buffer(self.client) if create else state.write_buffer
+
+    def _search_options(self):
+        return {"top_k": self.top_k} if self.top_k is not None else {}
+
+    def _flush_pending(self, agent_name: str):
+        write_buffer = self._get_write_buffer(create=False)
+        if write_buffer is not None and write_buffer.pending(agent_name):
+            write_buffer.flush(agent_name)
+
+    def _invalidate(self, agent_name: str):
+        # 같은 에이전트의 캐시된 검색 결과는 (옵션이 다른 툴의 것까지) 더 이상 최신이 아니다
+        _client_state(self.client).invalidate(agent_name)
+        if self.retrieval_cache is not None:
+            self.retrieval_cache.invalidate(agent_name)
+
+    def _cache_generation(self, agent_name: str) -> Optional[int]:
+        return self.retrieval_cache.generation(agent_name) if self.retrieval_cache is not None else None
+
+    def _cached_search(self, agent_name: str, query: str):
+        if self.retrieval_cache is None:
+            return None
+        return self.retrieval_cache.get(agent_name, query)
+
+    def _remember_search(self, agent_name: str, query: str, results, latency: float, generation: Optional[int]):
+        if self.retrieval_cache is not None:
+            self.retrieval_cache.put(agent_name, query, results, latency, generation)
+
+    def _get_async_client(self) -> AsyncMemoryClient:
+        if self.async_client is not None:
+            return self.async_client
+        # 주입된 동기 클라이언트와 같은 키/호스트/조직으로 접속 (벤치마크 stub, 사내 mem0 등)
+        return _client_state(self.client).get_async_client(self.client)
+
+    @staticmethod
+    def _messages(content: str, feedback: Optional[str]):
+        # Mem0 형식에 맞게 메시지 구성
+        messages = [
+            {"role": "user", "content": content}
+        ]
+        if feedback:
+            messages.append({"role": "assistant", "content": feedback})
+        return messages
+
+    @staticmethod
+    def _format_results(results) -> str:
+        if not results:
+            return "지식이 없습니다."
+        
+        # 검색 결과 포맷팅
+        output = []
+        for result in results:
+            memory = result.get('memory', '')
+            score = result.get('score', 0)
+            output.append(f"[유사도: {score:.2f}]\n{memory}")
+        
+        return "\n\n---\n\n".join(output)
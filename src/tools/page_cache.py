@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+# 캐시 파일 기본 위치 (SCRAPE_CACHE_PATH 로 변경 가능)
+DEFAULT_CACHE_PATH = ".cache/scrape_cache.sqlite"
+# 이 시간(초) 안에 가져온 페이지는 다시 요청하지 않는다
+DEFAULT_PAGE_TTL = 60 * 60.0
+# 이 시간(초) 동안 사용되지 않은 항목은 삭제
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60.0
+# 캐시 전체 크기 상한 (초과 시 오래 사용되지 않은 항목부터 삭제)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# 스키마가 바뀌면 올린다 (이전 버전 캐시는 버리고 새로 만든다)
+SCHEMA_VERSION = 3
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CachedPage(NamedTuple):
+    url: str
+    chunks: List[str]
+    fetched_at: float
+
+
+class PageCache:
+    """SQLite cache for scraped pages and content-addressed chunk summaries.
+
+    Pages are keyed by URL and store only the extracted chunks; the HTML is
+    streamed and never kept. Summaries are keyed by the hash of prompt + chunk
+    text, so unchanged chunks skip the LLM call even after a refetch.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_PAGE_TTL,
+                 max_age: float = DEFAULT_MAX_AGE, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._conn.executescript(f"""
+                DROP TABLE IF EXISTS pages;
+                DROP TABLE IF EXISTS summaries;
+                PRAGMA user_version = {SCHEMA_VERSION};
+            """)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY, chunks TEXT NOT NULL,
+                fetched_at REAL NOT NULL, last_access REAL NOT NULL, size INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY, summary TEXT NOT NULL,
+                last_access REAL NOT NULL, size INTEGER NOT NULL);
+            CREATE INDEX IF NOT EXISTS pages_last_access ON pages(last_access);
+            CREATE INDEX IF NOT EXISTS summaries_last_access ON summaries(last_access);
+        """)
+
+    def get_page(self, url: str) -> Optional[CachedPage]:
+        """Return the cached page for url regardless of age (see is_fresh)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, chunks, fetched_at FROM pages WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), url))
+        return CachedPage(row[0], json.loads(row[1]), row[2])
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        return time.time() - page.fetched_at < self.ttl
+
+    def put_page(self, url: str, chunks: List[str]):
+        data = json.dumps(chunks, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (url, data, now, now, len(data.encode("utf-8"))))
+        self.evict()
+
+    def get_summary(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE summaries SET last_access = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def put_summary(self, key: str, summary: str):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?)",
+                               (key, summary, time.time(), len(summary.encode("utf-8"))))
+        # 페이지가 신선한 동안은 put_page 가 불리지 않으므로 요약을 쓸 때도 크기 상한을 확인
+        self.evict()
+
+    def evict(self, max_age: Optional[float] = None) -> int:
+        """Drop entries unused for max_age seconds, then least recently used ones until under max_bytes."""
+        cutoff = time.time() - (self.max_age if max_age is None else max_age)
+        removed = 0
+        with self._lock:
+            for table in ("pages", "summaries"):
+                removed += self._conn.execute(f"DELETE FROM {table} WHERE last_access < ?", (cutoff,)).rowcount
+            total = self._total_bytes()
+            while total > self.max_bytes:
+                row = self._conn.execute("""
+                    SELECT 'pages', url, last_access, size FROM pages
+                    UNION ALL SELECT 'summaries', key, last_access, size FROM summaries
+                    ORDER BY last_access LIMIT 1""").fetchone()
+                if row is None:
+                    break
+                table, key, _, size = row
+                column = "url" if table == "pages" else "key"
+                self._conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (key,))
+                total -= size
+                removed += 1
+        return removed
+
+    def _total_bytes(self) -> int:
+        return sum(self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+                   for table in ("pages", "summaries"))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.execute("DELETE FROM summaries")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            summaries = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+            total = self._total_bytes()
+        lookups = self.hits + self.misses
+        return {
+            "pages": pages,
+            "summaries": summaries,
+            "bytes": total,
+            "summary_hits": self.hits,
+            "summary_misses": self.misses,
+            "summary_hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_shared_cache: Optional[PageCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = PageCache(os.environ.get("SCRAPE_CACHE_PATH", DEFAULT_CACHE_PATH))
+        return _shared_cache
@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# 검색 결과를 재사용하는 시간(초)
+DEFAULT_QUERY_TTL = 6 * 60 * 60.0
+# 메모리/공유 캐시에 보관하는 최대 쿼리 수
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a query: NFKC (한글 자모/전각 문자 통일), casefold, collapsed whitespace."""
+    return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+
+
+class QueryCache:
+    """TTL + LRU cache of search results keyed by normalized query.
+
+    With shared_path set, entries are also stored in a SQLite file so that every
+    process on the host shares the same results; the in-memory LRU sits in front.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_QUERY_TTL, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 shared_path: Optional[str] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.shared_path = shared_path
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if shared_path:
+            if os.path.dirname(shared_path):
+                os.makedirs(os.path.dirname(shared_path), exist_ok=True)
+            self._conn = sqlite3.connect(shared_path, check_same_thread=False, isolation_level=None, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS queries (
+                query TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)""")
+
+    def get(self, query: str) -> Optional[str]:
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM queries WHERE query = ? AND expires_at > ?", (key, now)).fetchone()
+                if row is not None:
+                    self._conn.execute("UPDATE queries SET last_access = ? WHERE query = ?", (now, key))
+                    self._remember(key, row[1], row[0])
+                    self.hits += 1
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, query: str, value: str):
+        key = normalize_query(query)
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._conn is not None:
+                self._conn.execute("INSERT OR REPLACE INTO queries VALUES (?, ?, ?, ?)", (key, value, expires_at, now))
+                self._conn.execute("DELETE FROM queries WHERE expires_at <= ?", (now,))
+                self._conn.execute("""DELETE FROM queries WHERE query NOT IN (
+                    SELECT query FROM queries ORDER BY last_access DESC LIMIT ?)""", (self.max_entries,))
+
+    def _remember(self, key: str, expires_at: float, value: str):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM queries")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "shared": self._conn is not None,
+            }
+
+
+_shared_cache: Optional[QueryCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> QueryCache:
+    """Process-wide search cache; set SEARCH_CACHE_PATH to share it between processes."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = QueryCache(shared_path=os.environ.get("SEARCH_CACHE_PATH"))
+        return _shared_cache
@@ -0,0 +1,139 @@
+import importlib
+import inspect
+import json
+import threading
+from importlib.metadata import entry_points
+from typing import Any, Dict, List, Optional, Tuple
+
+# agents.yaml 의 tools 키 -> "모듈:속성". 모듈은 에이전트가 그 툴을 참조할 때 처음 임포트된다
+BUILTIN_TOOLS = {
+    "search_internet": "src.tools.search_tools:SearchInternetTool",
+    "scrape_website": "src.tools.browser_tools:ScrapeWebsiteTool",
+    "write_file": "src.tools.file_tools:FileTools.write_file",
+    "knowledge_management": "src.tools.mem_zero_tool:MemZeroTool",
+    "chroma_knowledge": "src.tools.knowledge_tool:KnowledgeTool",
+    "learn_landing_page_options": "src.tools.template_tools:TemplateTools.learn_landing_page_options",
+    "copy_landing_page_template": "src.tools.template_tools:TemplateTools.copy_landing_page_template_to_project_folder",
+}
+# 외부 패키지는 이 그룹의 entry point 로 툴을 등록한다 (이름 = tools 키, 값 = "모듈:속성")
+ENTRY_POINT_GROUP = "process_gpt.tools"
+
+
+def resolve(path: str) -> Any:
+    """Import "package.module:Attr.attr" and return the attribute."""
+    module_name, _, attr_path = path.partition(":")
+    target = importlib.import_module(module_name)
+    for attr in filter(None, attr_path.split(".")):
+        target = getattr(target, attr)
+    return target
+
+
+def build(target: Any, options: Optional[Dict[str, Any]] = None) -> Any:
+    """Classes and functions are factories called with options; anything else is already a tool."""
+    if isinstance(target, type) or inspect.isroutine(target):
+        return target(**(options or {}))
+    if options:
+        raise TypeError(f"{target!r} is a prebuilt tool and does not take options {sorted(options)}")
+    return target
+
+
+def parse_tool_specs(value: Any) -> List[Tuple[str, Dict[str, Any]]]:
+    """(name, options) pairs from an agents.yaml tools entry.
+
+    Accepts the comma separated form ("search_internet, github(mcp)") and
+    a list whose items are names or {name: {option: value}} mappings.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    specs = []
+    for item in value:
+        if isinstance(item, dict):
+            specs.extend((str(name).strip(), dict(options or {})) for name, options in item.items())
+        elif str(item).strip():
+            specs.append((str(item).strip(), {}))
+    return specs
+
+
+class ToolRegistry:
+    """Tool keys mapped to import paths, factories or tool objects, built once on first get().
+
+    Each (key, options) pair is a singleton. Keys not registered here are
+    looked up in parent, so a manager can override a few tools while sharing
+    the process-wide instances of the rest. Nothing is imported or
+    constructed for keys that no agent references.
+    """
+
+    def __init__(self, tools: Optional[Dict[str, Any]] = None, parent: Optional["ToolRegistry"] = None):
+        self._targets: Dict[str, Any] = dict(BUILTIN_TOOLS if tools is None and parent is None else tools or {})
+        self.parent = parent
+        self._instances: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, target: Any):
+        """target is a "module:attr" path, a factory (class/function) or a tool object."""
+        with self._lock:
+            self._targets[name] = target
+            self._instances = {key: tool for key, tool in self._instances.items() if key[0] != name}
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP):
+        """Register installed plugins by import path only; their modules load on first get()."""
+        for entry_point in entry_points(group=group):
+            self._targets.setdefault(entry_point.name, entry_point.value)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._targets or (self.parent is not None and name in self.parent)
+
+    def names(self) -> List[str]:
+        names = list(self.parent.names()) if self.parent is not None else []
+        return names + [name for name in self._targets if name not in names]
+
+    def loaded(self) -> List[str]:
+        """Keys whose tool has been built so far in this registry."""
+        return list(dict.fromkeys(name for name, _ in self._instances))
+
+    def get(self, name: str, options: Optional[Dict[str, Any]] = None) -> Any:
+        if name not in self._targets:
+            if self.parent is None:
+                raise KeyError(f"Unknown tool: {name}")
+            return self.parent.get(name, options)
+        key = (name, json.dumps(options or {}, sort_keys=True, default=str))
+        with self._lock:
+            if key not in self._instances:
+                target = self._targets[name]
+                target = resolve(target) if isinstance(target, str) else target
+                try:
+                    self._instances[key] = build(target, options)
+                except (TypeError, ValueError) as e:
+                    if not options:
+                        raise
+                    # pydantic 의 ValidationError 는 ValueError
+                    raise TypeError(f"Tool '{name}' does not accept options {sorted(options)}: {e}") from e
+            return self._instances[key]
+
+
+_default_registry: Optional[ToolRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_tool_registry() -> ToolRegistry:
+    """Process-wide registry: builtin tools plus installed entry-point plugins."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = ToolRegistry()
+            _default_registry.load_entry_points()
+        return _default_registry
+
+
+def register_tool(name: str):
+    """Decorator registering a tool class or factory function under an agents.yaml key.
+
+        @register_tool("word_count")
+        class WordCountTool(BaseTool): ...
+    """
+    def decorator(factory):
+        get_tool_registry().register(name, factory)
+        return factory
+    return decorator
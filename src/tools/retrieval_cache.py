@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from src.tools.embeddings import cosine_similarity
+from src.tools.query_cache import normalize_query
+
+# 에이전트별로 기억하는 최근 쿼리 수
+DEFAULT_MAX_ENTRIES_PER_AGENT = 64
+# 캐시를 유지하는 최대 에이전트 수
+DEFAULT_MAX_AGENTS = 32
+# embedder 를 지정했을 때 이 값 이상 유사한 쿼리는 같은 질문으로 보고 결과를 재사용
+DEFAULT_SIMILARITY_THRESHOLD = 0.85
+DEFAULT_RETRIEVAL_TTL = 10 * 60.0
+
+
+class _Entry:
+    __slots__ = ("vector", "results", "latency", "created_at")
+
+    def __init__(self, vector, results, latency):
+        self.vector = vector
+        self.results = results
+        self.latency = latency
+        self.created_at = time.monotonic()
+
+
+class RetrievalCache:
+    """Per-agent cache of memory search results.
+
+    By default only exact matches (after normalize_query) hit. Similar-query
+    reuse needs a semantic embedder (e.g. OpenAIEmbedder): character n-gram
+    hashes score "세율 인상" and "세율 인하" as near-identical, so HashingEmbedder
+    must not be used here. Writes for an agent must call invalidate(agent_id);
+    pass generation(agent_id) taken before a search to put() so results of a
+    search that raced with a write are not stored.
+    """
+
+    def __init__(self, embedder=None, max_entries_per_agent: int = DEFAULT_MAX_ENTRIES_PER_AGENT,
+                 max_agents: int = DEFAULT_MAX_AGENTS, similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+                 ttl: float = DEFAULT_RETRIEVAL_TTL):
+        self.embedder = embedder
+        self.max_entries_per_agent = max_entries_per_agent
+        self.max_agents = max_agents
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.latency_saved = 0.0
+        self._agents: "OrderedDict[str, OrderedDict[str, _Entry]]" = OrderedDict()
+        # invalidate 될 때마다 증가
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, agent_id: str, query: str) -> Optional[List[Any]]:
+        key = normalize_query(query)
+        with self._lock:
+            entries = self._entries(agent_id)
+            entry = entries.get(key) if entries is not None else None
+            if entry is not None and self._alive(entry):
+                entries.move_to_end(key)
+                return self._hit(entry, exact=True)
+            if not entries or self.embedder is None:
+                self.misses += 1
+                return None
+        vector = self.embedder.embed(key)
+        with self._lock:
+            entries = self._entries(agent_id) or {}
+            best_key, best_score = None, self.similarity_threshold
+            for entry_key, entry in entries.items():
+                if not self._alive(entry):
+                    continue
+                score = cosine_similarity(vector, entry.vector)
+                if score >= best_score:
+                    best_key, best_score = entry_key, score
+            if best_key is None:
+                self.misses += 1
+                return None
+            entries.move_to_end(best_key)
+            return self._hit(entries[best_key], exact=False)
+
+    def generation(self, agent_id: str) -> int:
+        with self._lock:
+            return self._generations.get(agent_id, 0)
+
+    def put(self, agent_id: str, query: str, results: List[Any], latency: float, generation: Optional[int] = None):
+        """Remember results of a real search that took latency seconds.
+
+        Skipped when generation is given and the agent was invalidated since.
+        """
+        key = normalize_query(query)
+        entry = _Entry(self.embedder.embed(key) if self.embedder is not None else None, results, latency)
+        with self._lock:
+            if generation is not None and generation != self._generations.get(agent_id, 0):
+                return
+            entries = self._agents.setdefault(agent_id, OrderedDict())
+            self._agents.move_to_end(agent_id)
+            entries[key] = entry
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries_per_agent:
+                entries.popitem(last=False)
+            while len(self._agents) > self.max_agents:
+                self._agents.popitem(last=False)
+
+    def invalidate(self, agent_id: str):
+        with self._lock:
+            self._agents.pop(agent_id, None)
+            self._generations[agent_id] = self._generations.get(agent_id, 0) + 1
+
+    def _entries(self, agent_id: str):
+        entries = self._agents.get(agent_id)
+        if entries is not None:
+            self._agents.move_to_end(agent_id)
+        return entries
+
+    def _alive(self, entry: _Entry) -> bool:
+        return time.monotonic() - entry.created_at < self.ttl
+
+    def _hit(self, entry: _Entry, exact: bool) -> List[Any]:
+        if exact:
+            self.exact_hits += 1
+        else:
+            self.similar_hits += 1
+        self.latency_saved += entry.latency
+        return entry.results
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            hits = self.exact_hits + self.similar_hits
+            lookups = hits + self.misses
+            return {
+                "exact_hits": self.exact_hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "latency_saved": self.latency_saved,
+                "entries": sum(len(entries) for entries in self._agents.values()),
+            }
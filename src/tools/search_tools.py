@@ -1,22 +1,58 @@
 import os
 import json
-import requests
+from typing import Optional
 from crewai.tools import BaseTool
+from pydantic import Field
+from src.tools.http_client import get_async_http_client, get_http_client
+from src.tools.query_cache import QueryCache, get_search_cache
 
 
 class SearchInternetTool(BaseTool):
     name: str = "search_internet"
     description: str = "Useful to search the internet about a given topic and return relevant results"
+    endpoint: str = "https://google.serper.dev/search"
+    use_cache: bool = True
+    cache: Optional[QueryCache] = Field(default=None, exclude=True)
 
     def _run(self, query: str) -> str:
-        url = "https://google.serper.dev/search"
-        payload = json.dumps({"q": query})
-        headers = {
+        cached = self._get_cached(query)
+        if cached is not None:
+            return cached
+
+        response = get_http_client().post(self.endpoint, headers=self._headers(), data=json.dumps({"q": query}))
+        response.raise_for_status()
+        return self._store(query, self._format_results(response.json()['organic']))
+
+    async def _arun(self, query: str) -> str:
+        cached = self._get_cached(query)
+        if cached is not None:
+            return cached
+
+        response = await get_async_http_client().post(self.endpoint, headers=self._headers(), content=json.dumps({"q": query}))
+        response.raise_for_status()
+        return self._store(query, self._format_results(response.json()['organic']))
+
+    def _get_cached(self, query: str) -> Optional[str]:
+        if not self.use_cache:
+            return None
+        if self.cache is None:
+            self.cache = get_search_cache()
+        return self.cache.get(query)
+
+    def _store(self, query: str, output: str) -> str:
+        if self.use_cache:
+            self.cache.put(query, output)
+        return output
+
+    @staticmethod
+    def _headers():
+        return {
             'X-API-KEY': os.environ['SERPER_API_KEY'],
             'content-type': 'application/json'
         }
-        response = requests.request("POST", url, headers=headers, data=payload)
-        results = response.json()['organic']
+
+    @staticmethod
+    def _format_results(results) -> str:
         string = []
         for result in results:
             string.append('\n'.join([
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import shutil
 from pathlib import Path
@@ -25,7 +26,7 @@ class LearnLandingPageOptionsTool(BaseTool):
         return json.dumps(templates, indent=2)
         
     async def _arun(self, input=None):
-        return self._run(input)
+        return await asyncio.to_thread(self._run, input)
 
 
 class CopyLandingPageTemplateTool(BaseTool):
@@ -43,7 +44,7 @@ class CopyLandingPageTemplateTool(BaseTool):
         return f"Template copied to {landing_page_template} and ready to be modified, main files should be under ./{landing_page_template}/src/components, you should focus on those."
         
     async def _arun(self, landing_page_template: str):
-        return self._run(landing_page_template)
+        return await asyncio.to_thread(self._run, landing_page_template)
 
 
 class TemplateTools:
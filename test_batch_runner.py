@@ -0,0 +1,61 @@
+import io
+import json
+import threading
+import time
+
+from src.batch_runner import BatchRunner, parse_goals
+
+
+def test_parse_goals_formats():
+    lines = [
+        '{"id": "a", "goal": "세무 제안서 작성"}',
+        '{"request_id": "user-001", "title": "Title", "body": "Body"}',
+        "",
+        "plain text goal",
+    ]
+    assert list(parse_goals(lines)) == [
+        {"id": "a", "goal": "세무 제안서 작성"},
+        {"id": "user-001", "goal": "Title\n\nBody"},
+        {"id": "4", "goal": "plain text goal"},
+    ]
+
+
+def test_batch_runner_reports_ok_error_and_timeout():
+    def run_goal(goal):
+        if goal == "fail":
+            raise RuntimeError("boom")
+        if goal == "slow":
+            time.sleep(1)
+        return f"done: {goal}"
+
+    output = io.StringIO()
+    runner = BatchRunner(run_goal, output, workers=2, timeout=0.2)
+    goals = [{"id": str(i), "goal": goal} for i, goal in enumerate(["a", "fail", "slow", "b", "c"])]
+    summary = runner.run(goals)
+
+    records = {record["id"]: record for record in map(json.loads, output.getvalue().splitlines())}
+    assert records["0"] == {**records["0"], "status": "ok", "output": "done: a"}
+    assert records["1"]["status"] == "error" and "boom" in records["1"]["error"]
+    assert records["2"]["status"] == "timeout"
+    assert summary["goals"] == 5 and summary["ok"] == 3 and summary["error"] == 1 and summary["timeout"] == 1
+    assert summary["goals_per_minute"] > 0
+
+
+def test_timed_out_goal_keeps_its_worker_slot():
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def run_goal(goal):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.3 if goal == "slow" else 0.01)
+        with lock:
+            running[0] -= 1
+        return goal
+
+    output = io.StringIO()
+    summary = BatchRunner(run_goal, output, workers=1, timeout=0.05).run(
+        [{"id": "1", "goal": "slow"}, {"id": "2", "goal": "fast"}])
+    assert (summary["timeout"], summary["ok"]) == (1, 1)
+    assert peak[0] == 1
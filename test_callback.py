@@ -0,0 +1,106 @@
+import gzip
+import json
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src import callback
+from src.callback import CallbackHandler, JsonlLogWriter
+
+
+def read_records(handler):
+    opener = gzip.open if handler.session_log.endswith(".gz") else open
+    with opener(handler.session_log, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_step_log_is_batched_jsonl():
+    for compress in (False, True):
+        with tempfile.TemporaryDirectory() as log_dir:
+            handler = CallbackHandler(log_dir=log_dir, compress=compress, echo=False)
+            for i in range(500):
+                handler.step_callback(SimpleNamespace(step_number=i, task="task", output=f"output {i}"), "Analyst")
+            handler.step_callback(SimpleNamespace(return_values={"output": "done"}), "Analyst")
+            handler.close()
+
+            records = read_records(handler)
+            assert records[0]["event"] == "session_start"
+            steps = [record for record in records if record["event"] == "step"]
+            assert [record["step_number"] for record in steps] == list(range(500)) + ["final"]
+            assert steps[-1]["output"] == "done"
+            assert handler.writer.dropped == 0
+
+
+def test_full_queue_drops_instead_of_blocking():
+    with tempfile.TemporaryDirectory() as log_dir:
+        handler = CallbackHandler(log_dir=log_dir, echo=False, max_queue=1)
+        # 쓰기 스레드가 따라잡기 전에 몰아서 넣으면 일부는 버려진다
+        for i in range(2000):
+            handler.step_callback(SimpleNamespace(step_number=i, task="task", output="x" * 1000), "Analyst")
+        handler.close()
+        assert handler.writer.written + handler.writer.dropped == 2001
+        assert len(read_records(handler)) == handler.writer.written
+
+
+def test_step_seconds_are_measured_per_thread(tmp_path):
+    handler = CallbackHandler(log_dir=str(tmp_path), echo=False)
+    barrier = threading.Barrier(2)
+
+    def run(agent_name, delay):
+        # 첫 스텝 이후 delay 만큼 기다리고 두 번째 스텝. 다른 스레드의 스텝과 섞여도 자기 간격만 잰다
+        handler.step_callback(SimpleNamespace(step_number=1, task="task", output="out"), agent_name)
+        barrier.wait()
+        time.sleep(delay)
+        handler.step_callback(SimpleNamespace(step_number=2, task="task", output="out"), agent_name)
+
+    threads = [threading.Thread(target=run, args=("Fast", 0.05)), threading.Thread(target=run, args=("Slow", 0.3))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    handler.close()
+
+    steps = {(record["agent_name"], record["step_number"]): record["step_seconds"]
+             for record in read_records(handler) if record["event"] == "step"}
+    # 핸들러를 만든 스레드가 아니면 첫 스텝의 기준 시각이 없다
+    assert steps[("Fast", 1)] is None and steps[("Slow", 1)] is None
+    assert 0.04 <= steps[("Fast", 2)] < 0.25
+    assert steps[("Slow", 2)] >= 0.29
+
+
+def test_close_unregisters_atexit_hook(monkeypatch, tmp_path):
+    registered = []
+    monkeypatch.setattr(callback.atexit, "register", registered.append)
+    monkeypatch.setattr(callback.atexit, "unregister", registered.remove)
+    writers = [JsonlLogWriter(str(tmp_path / f"{i}.jsonl")) for i in range(3)]
+    assert len(registered) == 3
+    for writer in writers:
+        writer.close()
+    assert registered == []
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_close_returns_when_drain_thread_died(monkeypatch, tmp_path):
+    def broken_write(self, batch):
+        raise RuntimeError("writer crashed")
+
+    monkeypatch.setattr(JsonlLogWriter, "_write_batch", broken_write)
+    writer = JsonlLogWriter(str(tmp_path / "session.jsonl"), max_queue=2)
+    writer.write({"event": "step"})
+    writer._thread.join(5)
+    assert not writer._thread.is_alive()
+    # 쓰기 스레드가 없으니 큐가 가득 찬 채로 남는다
+    writer.write({"event": "step"})
+    writer.write({"event": "step"})
+    start_time = time.perf_counter()
+    writer.close(timeout=0.2)
+    assert time.perf_counter() - start_time < 2
+    assert writer.dropped == 2
+
+
+if __name__ == "__main__":
+    test_step_log_is_batched_jsonl()
+    test_full_queue_drops_instead_of_blocking()
@@ -0,0 +1,75 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+from crewai import LLM
+
+from src.crew_config_manager import CrewConfigManager
+
+AGENTS = {
+    "Analyst": {"goal": "Analyze the goal", "backstory": "Analyst"},
+    "Writer": {"goal": "Write the report", "backstory": "Writer"},
+}
+
+
+class FakeMemoryClient:
+    def search(self, query, agent_id, **options):
+        return []
+
+    def add(self, messages, agent_id):
+        pass
+
+
+def make_manager(tmp_path):
+    agents_path = tmp_path / "agents.yaml"
+    agents_path.write_text(yaml.safe_dump(AGENTS), encoding="utf-8")
+    return CrewConfigManager(agents_config_path=str(agents_path), mcp_config_path=str(tmp_path / "mcp.json"),
+                             llm="gpt-4.1-mini", mem0_client=FakeMemoryClient())
+
+
+def test_concurrent_callers_share_one_set_of_templates(tmp_path):
+    manager = make_manager(tmp_path)
+    build_agent, builds = manager._build_agent, []
+
+    def slow_build_agent(agent_name, agent_config):
+        builds.append(agent_name)
+        time.sleep(0.05)
+        return build_agent(agent_name, agent_config)
+
+    manager._build_agent = slow_build_agent
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: manager._get_agent_templates(), range(4)))
+    assert builds == list(AGENTS)
+    assert all(templates is results[0] for templates in results)
+
+
+def test_crews_get_isolated_copies_of_the_templates(tmp_path):
+    manager = make_manager(tmp_path)
+    events = []
+    first = manager.create_crew("goal 1", step_callback=lambda step, agent_name: events.append((1, agent_name)))
+    second = manager.create_crew("goal 2", step_callback=lambda step, agent_name: events.append((2, agent_name)))
+    templates = manager._get_agent_templates()
+
+    for template, a, b in zip(templates, first.agents, second.agents):
+        assert len({id(template), id(a), id(b)}) == 3
+        assert template.step_callback is None
+        # 툴 객체는 공유하지만 실행 상태는 복사본마다 따로
+        assert [tool.name for tool in a.tools] == [tool.name for tool in template.tools]
+        a.tools_results.append({"result": "goal 1 only"})
+        assert b.tools_results == [] and template.tools_results == []
+
+    first.agents[0].step_callback(None)
+    second.agents[1].step_callback(None)
+    assert events == [(1, "Analyst"), (2, "Writer")]
+    assert first.tasks[0].agent is first.agents[0] and "goal 1" in first.tasks[0].description
+    assert second.tasks[0].agent is second.agents[0] and "goal 2" in second.tasks[0].description
+
+
+def test_string_llm_is_wrapped_for_the_planner(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path)
+    planner = manager._get_planner_llm()
+    assert isinstance(planner, LLM) and planner.model == "gpt-4.1-mini"
+
+    answer = '{"task_graph": [{"id": "t1", "agent": "Analyst", "description": "분석"}]}'
+    monkeypatch.setattr(LLM, "call", lambda self, messages, *args, **kwargs: answer)
+    assert [node.agent for node in manager.plan_task_graph("세무 제안서")] == ["Analyst"]
@@ -0,0 +1,45 @@
+import os
+import tempfile
+
+import numpy as np
+
+from src.tools.embedding_cache import CachedEmbedder, EmbeddingCache
+from src.tools.embeddings import HashingEmbedder
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__(dim=64)
+        self.batches = []
+
+    def embed_many(self, texts):
+        self.batches.append(list(texts))
+        return super().embed_many(texts)
+
+
+def test_embedding_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "embeddings.sqlite")
+        inner = CountingEmbedder()
+        embedder = CachedEmbedder(inner, EmbeddingCache(path), batch_size=2)
+
+        texts = ["벡터 데이터베이스", "임베딩 캐시", "벡터 데이터베이스", "배치 임베딩"]
+        vectors = embedder.embed_many(texts)
+        # 중복 제거 후 3개를 batch_size=2 로 두 번 호출
+        assert inner.batches == [["벡터 데이터베이스", "임베딩 캐시"], ["배치 임베딩"]]
+        assert all(vector.dtype == np.float32 and vector.shape == (64,) for vector in vectors)
+        np.testing.assert_array_equal(vectors[0], vectors[2])
+
+        # 새 프로세스(새 캐시 인스턴스)에서도 디스크 캐시를 재사용
+        reopened = CachedEmbedder(inner, EmbeddingCache(path))
+        np.testing.assert_array_equal(reopened.embed("임베딩 캐시"), vectors[1])
+        assert len(inner.batches) == 2
+
+        stats = reopened.stats()
+        assert stats["entries"] == 3
+        assert stats["bytes_per_vector"] == 64 * 4
+        assert stats["hit_rate"] == 1.0
+
+
+if __name__ == "__main__":
+    test_embedding_cache()
@@ -0,0 +1,30 @@
+from src.tools.html_stream import estimate_tokens, iter_html_elements, pack_chunks
+
+PAGE = """<html><head><title>제목</title><style>p {color: red}</style></head>
+<body><h1>세무 안내</h1><p>법인세 신고는 3월까지입니다.</p>
+<script>var x = 1;</script><ul><li>항목 1</li><li>항목 2</li></ul></body></html>"""
+
+
+def test_block_elements_are_extracted_without_skipped_content():
+    assert list(iter_html_elements([PAGE])) == ["세무 안내", "법인세 신고는 3월까지입니다.", "항목 1", "항목 2"]
+
+
+def test_elements_split_across_pieces():
+    pieces = [PAGE[i:i + 7] for i in range(0, len(PAGE), 7)]
+    assert list(iter_html_elements(pieces)) == list(iter_html_elements([PAGE]))
+
+
+def test_missing_head_end_tag_does_not_skip_body():
+    html = "<html><head><title>제목</title><body><p>본문</p><p>두 번째</p></body></html>"
+    assert list(iter_html_elements([html])) == ["본문", "두 번째"]
+
+
+def test_chunks_respect_token_limit_and_budget():
+    elements = [f"문장 {i}. " * 20 for i in range(50)]
+    chunks = list(pack_chunks(elements, max_tokens=100))
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert " ".join(chunks).split() == " ".join(elements).split()
+
+    limited = list(pack_chunks(iter(elements), max_tokens=100, content_budget=300))
+    assert sum(estimate_tokens(chunk) for chunk in limited) <= 300
+    assert len(limited) < len(chunks)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.tools.http_client import HttpClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """로컬 스텁 서버: /flaky 는 처음 두 번 503, 이후 200"""
+    protocol_version = "HTTP/1.1"
+    calls = {}
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        count = StubHandler.calls[self.path] = StubHandler.calls.get(self.path, 0) + 1
+        if self.path == "/flaky" and count <= 2:
+            self._reply(503, {"error": "busy"}, {"Retry-After": "0"})
+        elif self.path == "/down":
+            self._reply(500, {"error": "down"})
+        else:
+            self._reply(200, {"organic": [], "path": self.path, "port": self.client_address[1]})
+
+    def _reply(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_http_client_retries_and_stats():
+    """테스트: 503 재시도, 재시도 소진 시 마지막 응답 반환, 호스트별 통계"""
+    server, base_url = start_stub_server()
+    client = HttpClient(max_retries=2, backoff_base=0.01)
+    try:
+        response = client.post(f"{base_url}/flaky", data="{}")
+        assert response.status_code == 200
+        assert StubHandler.calls["/flaky"] == 3
+
+        response = client.post(f"{base_url}/down", data="{}")
+        assert response.status_code == 500
+
+        stats = client.host_stats()[f"127.0.0.1:{server.server_port}"]
+        assert stats["requests"] == 6
+        assert stats["retries"] == 4
+        assert stats["errors"] == 5
+        assert stats["p95"] >= stats["p50"] > 0
+    finally:
+        client.close()
+        server.shutdown()
+
+
+def test_http_client_keeps_connections_alive():
+    """테스트: 연속 요청이 같은 keep-alive 연결(클라이언트 포트)을 재사용"""
+    server, base_url = start_stub_server()
+    client = HttpClient()
+    try:
+        ports = {client.post(f"{base_url}/ok", data="{}").json()["port"] for _ in range(5)}
+        assert len(ports) == 1
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_http_client_retries_and_stats()
+    test_http_client_keeps_connections_alive()
+    print("\n✅ 테스트 완료!")
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from scripts import ingest_knowledge
+from scripts.ingest_knowledge import MANIFEST_NAME, chunk_text, ingest
+
+
+class FakeCollection:
+    def __init__(self):
+        self.documents = {}
+
+    def upsert(self, ids, embeddings, metadatas, documents):
+        self.documents.update(zip(ids, documents))
+
+    def delete(self, ids):
+        for chunk_id in ids:
+            self.documents.pop(chunk_id, None)
+
+
+class FakeTool:
+    def __init__(self):
+        self.collections = {}
+
+    def _get_collection(self, agent_name):
+        return self.collections.setdefault(agent_name, FakeCollection())
+
+    def _embed_many(self, texts):
+        return [[0.0] for _ in texts]
+
+    def documents(self, agent_name):
+        return sorted(self._get_collection(agent_name).documents.values())
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_chunk_text_keeps_line_structure():
+    text = "# 제목\n\n- 항목 1\n- 항목 2\n\n```python\ndef f():\n    return 1\n```\n\n\n문단   공백은 유지\n"
+    assert chunk_text(text, 500) == ["# 제목\n\n- 항목 1\n- 항목 2\n\n```python\ndef f():\n    return 1\n```\n\n문단   공백은 유지"]
+    chunks = chunk_text("\n".join(f"- item {i}" for i in range(200)), 50)
+    assert len(chunks) > 1
+    assert all(line.startswith("- item ") for chunk in chunks for line in chunk.split("\n") if line)
+
+
+def test_unchanged_files_are_skipped_and_stale_chunks_removed(tmp_path):
+    write(tmp_path / "tax" / "a.md", "법인세 신고")
+    write(tmp_path / "tax" / "b.md", "부가세 신고")
+    tool = FakeTool()
+    assert ingest(tmp_path, tool)["files"] == 2
+    assert tool.documents("tax") == ["법인세 신고", "부가세 신고"]
+
+    stats = ingest(tmp_path, tool)
+    assert (stats["files"], stats["skipped"], stats["chunks"]) == (0, 2, 0)
+
+    write(tmp_path / "tax" / "a.md", "법인세 중간예납")
+    (tmp_path / "tax" / "b.md").unlink()
+    stats = ingest(tmp_path, tool)
+    assert (stats["files"], stats["removed"]) == (1, 2)
+    assert tool.documents("tax") == ["법인세 중간예납"]
+    assert list(json.loads((tmp_path / MANIFEST_NAME).read_text(encoding="utf-8"))) == ["tax/a.md"]
+
+
+def test_interrupted_run_resumes_from_manifest(tmp_path, monkeypatch):
+    for name in ("a", "b", "c"):
+        write(tmp_path / "tax" / f"{name}.md", f"지식 {name}")
+    upsert = ingest_knowledge._upsert
+
+    def failing_upsert(tool, agent_name, batch):
+        if any(chunk == "지식 b" for _, (chunk, _) in batch):
+            raise KeyboardInterrupt
+        return upsert(tool, agent_name, batch)
+
+    tool = FakeTool()
+    monkeypatch.setattr(ingest_knowledge, "_upsert", failing_upsert)
+    with pytest.raises(KeyboardInterrupt):
+        ingest(tmp_path, tool, batch_size=1, max_workers=1)
+    assert list(json.loads((tmp_path / MANIFEST_NAME).read_text(encoding="utf-8"))) == ["tax/a.md"]
+
+    monkeypatch.setattr(ingest_knowledge, "_upsert", upsert)
+    stats = ingest(tmp_path, tool, batch_size=1, max_workers=1)
+    assert (stats["files"], stats["skipped"]) == (2, 1)
+    assert tool.documents("tax") == ["지식 a", "지식 b", "지식 c"]
@@ -1,45 +1,68 @@
-import os
-import sys
-from src.tools.knowledge_tool import KnowledgeTool
+import tempfile
+from src.tools.embeddings import HashingEmbedder
+from src.tools.knowledge_tool import KnowledgeTool, get_persistent_client
 
-# OpenAI API 키 확인
-api_key = os.environ.get("OPENAI_API_KEY")
-if not api_key:
-    api_key = input("OpenAI API 키를 입력하세요: ")
-    os.environ["OPENAI_API_KEY"] = api_key
 
 def test_knowledge_tool():
-    print(f"API 키: {os.environ['OPENAI_API_KEY'][:5]}...{os.environ['OPENAI_API_KEY'][-4:]}")
-    
-    # 지식 관리 도구 초기화
-    tool = KnowledgeTool()
-    
-    # 테스트 에이전트 이름
-    agent_name = "test_agent"
-    
-    # 1. 지식 추가 테스트
-    content = "ChromaDB는 벡터 데이터베이스로, 임베딩 기반 검색을 효율적으로 수행할 수 있습니다."
-    feedback = "이 정보는 매우 유용합니다."
-    
-    print("===== 지식 추가 테스트 =====")
-    add_result = tool._run(
-        agent_name=agent_name, 
-        mode="add", 
-        content=content, 
-        feedback=feedback
-    )
-    print(add_result)
-    
-    # 2. 지식 검색 테스트
-    query = "벡터 데이터베이스"
-    
-    print("\n===== 지식 검색 테스트 =====")
-    retrieve_result = tool._run(
-        agent_name=agent_name, 
-        mode="retrieve", 
-        query=query
-    )
-    print(retrieve_result)
+    with tempfile.TemporaryDirectory() as knowledge_dir:
+        # 오프라인 임베더로 지식 관리 도구 초기화
+        tool = KnowledgeTool(embedder=HashingEmbedder(), knowledge_dir=knowledge_dir)
+
+        # 테스트 에이전트 이름
+        agent_name = "test_agent"
+
+        # 1. 지식 추가 테스트
+        content = "ChromaDB는 벡터 데이터베이스로, 임베딩 기반 검색을 효율적으로 수행할 수 있습니다."
+        feedback = "이 정보는 매우 유용합니다."
+
+        print("===== 지식 추가 테스트 =====")
+        add_result = tool._run(
+            agent_name=agent_name,
+            mode="add",
+            content=content,
+            feedback=feedback
+        )
+        print(add_result)
+        assert "새 문서가 생성되었습니다" in add_result
+
+        # 2. 지식 검색 테스트 (마크다운 파일이 아니라 컬렉션의 문서를 돌려준다)
+        query = "벡터 데이터베이스"
+
+        print("\n===== 지식 검색 테스트 =====")
+        retrieve_result = tool._run(
+            agent_name=agent_name,
+            mode="retrieve",
+            query=query
+        )
+        print(retrieve_result)
+        assert content in retrieve_result
+        assert feedback in retrieve_result
+
+        # 3. 내용과 메타데이터가 같으면 같은 ID 라 덮어쓰지 않고, 피드백이 다르면 새 문서로 저장한다
+        assert "이미 저장된 지식입니다" in tool._run(agent_name=agent_name, mode="add", content=content, feedback=feedback)
+        new_feedback = "세율 변경 후 다시 확인 필요"
+        assert "새 문서가 생성되었습니다" in tool._run(agent_name=agent_name, mode="add", content=content,
+                                                     feedback=new_feedback)
+        assert new_feedback in tool._run(agent_name=agent_name, mode="retrieve", query=query, n_results=5)
+
+        # 4. 메타데이터 필터 + 페이지네이션
+        for i in range(3):
+            tool._run(agent_name=agent_name, mode="add", content=f"세션 문서 {i}", source="web", session="s1")
+        filtered = tool._run(agent_name=agent_name, mode="retrieve", query=query, source="web", n_results=10)
+        assert content not in filtered and filtered.count("[출처: web]") == 3
+        first_page = tool._run(agent_name=agent_name, mode="retrieve", session="s1", n_results=2)
+        second_page = tool._run(agent_name=agent_name, mode="retrieve", session="s1", n_results=2, offset=2)
+        assert first_page.count("# 발견 내용") == 2 and second_page.count("# 발견 내용") == 1
+        # 저장된 순서대로 한 페이지씩 읽는다
+        assert "세션 문서 0" in first_page and "세션 문서 2" in second_page
+        assert "n_results는 1 이상" in tool._run(agent_name=agent_name, mode="retrieve", session="s1", n_results=0)
+        with_feedback = tool._run(agent_name=agent_name, mode="retrieve", has_feedback=True, n_results=10)
+        assert feedback in with_feedback and "세션 문서" not in with_feedback
+
+        # 5. 같은 저장소 경로는 클라이언트를 재사용한다
+        chroma_dir = f"{knowledge_dir}/{agent_name}/chroma_db"
+        assert get_persistent_client(chroma_dir) is get_persistent_client(chroma_dir)
+
 
 if __name__ == "__main__":
-    test_knowledge_tool() 
\ No newline at end of file
+    test_knowledge_tool()
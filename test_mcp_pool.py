@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+import importlib.util
+import sys
+import threading
+import time
+from src.mcp_pool import MCPServerPool, server_params
+
+STUB_SERVER = {"command": sys.executable, "args": ["scripts/stub_mcp_server.py"], "startupTimeout": 30}
+
+
+class FakeAdapter:
+    def __init__(self, server_config):
+        self.config = server_config
+        self.tools = [f"{server_config['args'][0]}_tool"]
+        self.alive = True
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+
+def make_pool(**kwargs):
+    started = []
+
+    def factory(server_config):
+        if server_config.get("fail"):
+            raise RuntimeError("boom")
+        if server_config.get("sleep"):
+            time.sleep(server_config["sleep"])
+        adapter = FakeAdapter(server_config)
+        started.append(adapter)
+        return adapter
+
+    pool = MCPServerPool(adapter_factory=factory, health_check=lambda a: a.alive, reap_interval=None, **kwargs)
+    return pool, started
+
+
+def test_pool_reuses_warm_servers():
+    """테스트: 같은 이름/설정의 서버는 한 번만 기동되고, 설정이 바뀌면 새로 기동"""
+    pool, started = make_pool()
+    config = {"command": "x", "args": ["a"]}
+    assert pool.acquire({"a": config}) == {"a": ["a_tool"]}
+    assert pool.acquire({"a": config}) == {"a": ["a_tool"]}
+    assert len(started) == 1
+
+    pool.acquire({"a": dict(config, args=["a2"])})
+    assert len(started) == 2
+    pool.shutdown()
+    assert all(adapter.stopped for adapter in started)
+
+
+def test_pool_restarts_dead_and_evicts_idle():
+    """테스트: 헬스체크 실패 시 재기동, idle_ttl 초과 시 종료"""
+    pool, started = make_pool(idle_ttl=0.05)
+    config = {"command": "x", "args": ["a"]}
+    pool.acquire({"a": config})
+    started[0].alive = False
+    pool.acquire({"a": config})
+    assert len(started) == 2 and started[0].stopped
+
+    time.sleep(0.1)
+    assert pool.evict_idle() == 1
+    assert started[1].stopped
+    pool.shutdown()
+
+
+def test_pool_skips_failed_and_slow_servers():
+    """테스트: 실패/타임아웃 서버는 건너뛰고 나머지는 정상 로드"""
+    pool, started = make_pool()
+    tools = pool.acquire({
+        "ok": {"args": ["ok"]},
+        "bad": {"args": ["bad"], "fail": True},
+        "slow": {"args": ["slow"], "sleep": 0.5, "startupTimeout": 0.1},
+    })
+    assert tools == {"ok": ["ok_tool"], "bad": [], "slow": []}
+    # 실패한 서버는 retry_backoff 동안 다시 시도하지 않는다
+    assert pool.acquire({"bad": {"args": ["bad"], "fail": True}}) == {"bad": []}
+    pool.shutdown()
+
+
+def test_timed_out_start_is_not_waited_for_again():
+    """테스트: 제한 시간을 넘긴 서버는 retry_backoff 동안 기다리지 않고, 기동이 끝나면 바로 사용"""
+    pool, started = make_pool()
+    config = {"args": ["slow"], "sleep": 0.3, "startupTimeout": 0.1}
+    assert pool.acquire({"slow": config}) == {"slow": []}
+    start_time = time.monotonic()
+    assert pool.acquire({"slow": config}) == {"slow": []}
+    assert time.monotonic() - start_time < 0.05
+    time.sleep(0.4)
+    assert pool.acquire({"slow": config}) == {"slow": ["slow_tool"]}
+    assert len(started) == 1
+    pool.shutdown()
+
+
+def test_timed_out_start_runs_on_daemon_thread_and_stops_after_shutdown():
+    """테스트: 제한 시간을 넘긴 기동은 종료를 막지 않고, 풀이 닫힌 뒤 끝나면 바로 정리"""
+    pool, started = make_pool()
+    assert pool.acquire({"slow": {"args": ["slow"], "sleep": 0.3, "startupTimeout": 0.05}}) == {"slow": []}
+    assert all(thread.daemon for thread in threading.enumerate() if thread.name.startswith("mcp-start"))
+    pool.shutdown()
+    deadline = time.time() + 5
+    while not started and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    assert len(started) == 1 and started[0].stopped
+
+
+def test_url_servers_do_not_spawn_processes():
+    """테스트: type=url 서버는 npx 대신 SSE 연결 파라미터로 변환"""
+    sse = server_params({"type": "url", "url": "https://example.com/sse", "transport": "sse",
+                         "headers": {"Authorization": "Bearer ${MCP_TEST_TOKEN}"}})
+    assert isinstance(sse, dict) and sse["url"] == "https://example.com/sse"
+    # mcpadapt 0.1.3 은 이 dict 를 그대로 sse_client(**params) 에 넘기므로 transport 키가 있으면 안 된다
+    assert "transport" not in sse and "command" not in sse
+    for transport, message in (("streamable-http", "streamable HTTP"), ("websocket", "Unsupported")):
+        try:
+            server_params({"url": "https://example.com/mcp", "transport": transport})
+            assert False, f"{transport} should raise"
+        except ValueError as e:
+            assert message in str(e)
+
+
+def test_pool_with_stub_stdio_server():
+    """테스트: 로컬 stdio 더미 MCP 서버를 풀에서 기동/재사용"""
+    if importlib.util.find_spec("crewai_tools") is None:
+        print("crewai_tools 미설치 - 건너뜀")
+        return
+    pool = MCPServerPool(reap_interval=None)
+    try:
+        first = pool.acquire({"stub": STUB_SERVER})["stub"]
+        assert [tool.name for tool in first] == ["echo"]
+        assert pool.acquire({"stub": STUB_SERVER})["stub"] is first
+        assert "stub" in pool.stats()
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    test_pool_reuses_warm_servers()
+    test_pool_restarts_dead_and_evicts_idle()
+    test_pool_skips_failed_and_slow_servers()
+    test_timed_out_start_is_not_waited_for_again()
+    test_timed_out_start_runs_on_daemon_thread_and_stops_after_shutdown()
+    test_url_servers_do_not_spawn_processes()
+    test_pool_with_stub_stdio_server()
+    print("\n✅ 테스트 완료!")
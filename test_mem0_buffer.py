@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+
+from src.tools import mem0_buffer
+from src.tools.mem0_buffer import Mem0WriteBuffer
+
+
+class FakeClient:
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.calls = []
+        self.adds = []
+        self.lock = threading.Lock()
+
+    def add(self, messages, agent_id):
+        with self.lock:
+            self.calls.append((agent_id, messages))
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("mem0 unavailable")
+            self.adds.append((agent_id, messages))
+
+
+def entry(text):
+    return [{"role": "user", "content": text}]
+
+
+def test_flush_sends_each_entry_as_its_own_add():
+    client = FakeClient()
+    buffer = Mem0WriteBuffer(client, flush_interval=60)
+    buffer.add("tax", entry("법인세 신고 기한"))
+    buffer.add("tax", entry("부가세 세율"))
+    buffer.add("legal", entry("계약서 검토"))
+    assert client.adds == []
+    assert buffer.pending() == 3
+
+    buffer.flush("tax")
+    assert client.adds == [("tax", entry("법인세 신고 기한")), ("tax", entry("부가세 세율"))]
+    assert buffer.pending() == 1
+    buffer.flush()
+    assert client.adds[-1] == ("legal", entry("계약서 검토"))
+    assert buffer.stats() == {"pending": 0, "sent": 3, "batches": 2, "failed": 0}
+    buffer.close()
+
+
+def test_background_flush_after_max_batch():
+    client = FakeClient()
+    buffer = Mem0WriteBuffer(client, max_batch=2, flush_interval=60)
+    buffer.add("tax", entry("a"))
+    buffer.add("tax", entry("b"))
+    deadline = time.monotonic() + 5
+    while len(client.adds) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [messages for _, messages in client.adds] == [entry("a"), entry("b")]
+    buffer.close()
+
+
+def test_failed_add_is_retried_then_counted_as_failed():
+    client = FakeClient(failures=1)
+    buffer = Mem0WriteBuffer(client, flush_interval=60, max_retries=2, backoff_base=0)
+    buffer.add("tax", entry("a"))
+    buffer.flush()
+    assert len(client.calls) == 2
+    assert client.adds == [("tax", entry("a"))]
+
+    client.failures = 10
+    buffer.add("tax", entry("b"))
+    buffer.add("tax", entry("c"))
+    buffer.flush()
+    stats = buffer.stats()
+    assert (stats["sent"], stats["failed"]) == (1, 2)
+    buffer.close()
+
+
+def test_close_flushes_pending_and_rejects_new_adds():
+    client = FakeClient()
+    buffer = Mem0WriteBuffer(client, flush_interval=0.2)
+    buffer.add("tax", entry("a"))
+    assert buffer in mem0_buffer._open_buffers
+    buffer.close()
+    assert client.adds == [("tax", entry("a"))]
+    assert buffer not in mem0_buffer._open_buffers
+    with pytest.raises(RuntimeError):
+        buffer.add("tax", entry("b"))
+    buffer.close()
+
+
+class SlowClient(FakeClient):
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def add(self, messages, agent_id):
+        self.started.set()
+        self.release.wait(5)
+        super().add(messages, agent_id)
+
+
+def test_in_flight_background_send_counts_as_pending_and_flush_waits():
+    client = SlowClient()
+    buffer = Mem0WriteBuffer(client, max_batch=1, flush_interval=60)
+    buffer.add("tax", entry("a"))
+    assert client.started.wait(5)
+    # 백그라운드 전송이 진행 중이어도 아직 쓰이지 않은 항목으로 센다
+    assert buffer.pending("tax") == 1 and buffer.pending() == 1
+
+    threading.Timer(0.1, client.release.set).start()
+    buffer.flush("tax")
+    assert client.adds == [("tax", entry("a"))]
+    assert buffer.pending("tax") == 0
+    buffer.close()
+
+
+def test_on_sent_runs_after_entries_are_written():
+    client = FakeClient()
+    sent = []
+    buffer = Mem0WriteBuffer(client, flush_interval=60, on_sent=lambda agent_id: sent.append((agent_id, len(client.adds))))
+    buffer.add("tax", entry("a"))
+    buffer.add("tax", entry("b"))
+    buffer.flush()
+    assert sent == [("tax", 2)]
+    buffer.close()
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.tools import mem_zero_tool
+from src.tools.mem0_buffer import Mem0WriteBuffer
+from src.tools.mem_zero_tool import MemZeroTool
+from src.tools.registry import ToolRegistry
+
+
+class FakeClient:
+    api_key, host, org_id, project_id = "injected-key", "http://mem0.internal", "org", "project"
+
+    def __init__(self, **options):
+        self.options = options
+        self.searches = []
+
+    def search(self, query, agent_id, **options):
+        self.searches.append((query, agent_id, options))
+        return [{"memory": f"{agent_id}: {query}"}]
+
+    def add(self, messages, agent_id):
+        pass
+
+
+def test_agent_options_are_tool_fields():
+    client = FakeClient()
+    registry = ToolRegistry({"knowledge_management": lambda **options: MemZeroTool(client=client, **options)})
+    tool = registry.get("knowledge_management", {"top_k": 5, "buffered": False})
+    assert (tool.top_k, tool.buffered) == (5, False)
+    tool._run(agent_name="tax", mode="retrieve", query="법인세")
+    assert client.searches == [("법인세", "tax", {"top_k": 5})]
+    assert registry.get("knowledge_management").top_k is None
+
+
+def test_unknown_option_is_rejected_with_tool_name():
+    registry = ToolRegistry({"knowledge_management": lambda **options: MemZeroTool(client=FakeClient(), **options)})
+    with pytest.raises(TypeError, match="knowledge_management.*'limit'"):
+        registry.get("knowledge_management", {"limit": 5})
+
+
+def test_query_embedder_option_enables_similar_query_reuse(monkeypatch):
+    class TopicEmbedder:
+        def embed(self, text):
+            return [1.0, 0.0] if "기한" in text else [0.0, 1.0]
+
+    monkeypatch.setattr(mem_zero_tool, "query_embedder", lambda name: TopicEmbedder() if name else None)
+    client = FakeClient()
+    registry = ToolRegistry({"knowledge_management": lambda **options: MemZeroTool(client=client, **options)})
+    tool = registry.get("knowledge_management", {"query_embedder": "openai", "similarity_threshold": 0.9})
+    assert tool.retrieval_cache.similarity_threshold == 0.9
+    tool._run(agent_name="tax", mode="retrieve", query="신고 기한")
+    tool._run(agent_name="tax", mode="retrieve", query="법인세 신고 기한은?")
+    assert len(client.searches) == 1 and tool.retrieval_cache.stats()["similar_hits"] == 1
+    assert registry.get("knowledge_management").retrieval_cache.embedder is None
+
+
+def test_hashing_query_embedder_is_rejected():
+    registry = ToolRegistry({"knowledge_management": lambda **options: MemZeroTool(client=FakeClient(), **options)})
+    with pytest.raises(TypeError, match="query_embedder"):
+        registry.get("knowledge_management", {"query_embedder": "hashing"})
+
+
+def test_async_client_uses_injected_client_settings(monkeypatch):
+    monkeypatch.setenv("MEM_ZERO_API_KEY", "env-key")
+    monkeypatch.setattr(mem_zero_tool, "AsyncMemoryClient", FakeClient)
+    tool = MemZeroTool(client=FakeClient())
+
+    async def get_twice():
+        return tool._get_async_client(), tool._get_async_client()
+
+    first, again = asyncio.run(get_twice())
+    assert first is again
+    assert first.options == {"api_key": "injected-key", "host": "http://mem0.internal",
+                             "org_id": "org", "project_id": "project"}
+    # 다른 이벤트 루프는 다른 클라이언트를 쓴다
+    assert asyncio.run(get_twice())[0] is not first
+
+
+class SlowWriteClient(FakeClient):
+    """add() blocks until released; search() reports how many adds had landed."""
+
+    def __init__(self):
+        super().__init__()
+        self.written = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def add(self, messages, agent_id):
+        self.started.set()
+        self.release.wait(5)
+        self.written += 1
+
+    def search(self, query, agent_id, **options):
+        return [{"memory": f"written={self.written}"}]
+
+
+class AsyncWrapper:
+    def __init__(self, client):
+        self.client = client
+
+    async def search(self, query, agent_id, **options):
+        return self.client.search(query, agent_id, **options)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_retrieve_waits_for_in_flight_background_flush(use_async, monkeypatch):
+    client = SlowWriteClient()
+    monkeypatch.setattr(mem_zero_tool, "AsyncMemoryClient", lambda **options: AsyncWrapper(client))
+    tool = MemZeroTool(client=client)
+    tool.write_buffer = Mem0WriteBuffer(client, max_batch=1, flush_interval=60)
+    tool._run(agent_name="tax", mode="add", content="법인세 신고 기한은 3월")
+    assert client.started.wait(5)
+
+    threading.Timer(0.1, client.release.set).start()
+    if use_async:
+        result = asyncio.run(tool._arun(agent_name="tax", mode="retrieve", query="신고 기한"))
+    else:
+        result = tool._run(agent_name="tax", mode="retrieve", query="신고 기한")
+    assert "written=1" in result
+    tool.write_buffer.close()
+
+
+def test_add_through_any_options_set_invalidates_shared_cache():
+    client = FakeClient()
+    registry = ToolRegistry({"knowledge_management": lambda **options: MemZeroTool(client=client, **options)})
+    default = registry.get("knowledge_management")
+    tuned = registry.get("knowledge_management", {"top_k": 5, "buffered": False})
+    assert default is not tuned and default.retrieval_cache is tuned.retrieval_cache
+
+    default._run(agent_name="tax", mode="retrieve", query="법인세")
+    default._run(agent_name="tax", mode="retrieve", query="법인세")
+    assert len(client.searches) == 1
+    tuned._run(agent_name="tax", mode="add", content="법인세 세율 변경")
+    default._run(agent_name="tax", mode="retrieve", query="법인세")
+    assert len(client.searches) == 2
+
+
+def test_search_racing_a_buffered_write_is_not_cached():
+    client = SlowWriteClient()
+    tool = MemZeroTool(client=client)
+    tool._run(agent_name="tax", mode="add", content="법인세 신고 기한은 3월")
+    write_buffer = tool._get_write_buffer()
+    assert tool.write_buffer is None and write_buffer.on_sent is not None
+
+    # 검색이 진행되는 동안 쓰기가 끝나면 그 검색 결과는 캐시에 남지 않는다
+    generation = tool._cache_generation("tax")
+    threading.Timer(0.05, client.release.set).start()
+    write_buffer.flush("tax")
+    tool._remember_search("tax", "신고 기한", [{"memory": "stale"}], 0.1, generation)
+    assert "written=1" in tool._run(agent_name="tax", mode="retrieve", query="신고 기한")
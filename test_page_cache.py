@@ -0,0 +1,55 @@
+import time
+
+from src.tools.page_cache import PageCache, content_hash
+
+
+def test_page_round_trip_and_freshness(tmp_path):
+    cache = PageCache(str(tmp_path / "cache.sqlite"), ttl=60)
+    assert cache.get_page("https://example.com") is None
+    cache.put_page("https://example.com", ["첫 청크", "두 번째 청크"])
+    page = cache.get_page("https://example.com")
+    assert page.chunks == ["첫 청크", "두 번째 청크"]
+    assert cache.is_fresh(page)
+    assert not PageCache(str(tmp_path / "cache.sqlite"), ttl=0).is_fresh(page)
+
+
+def test_summary_hits_and_misses(tmp_path):
+    cache = PageCache(str(tmp_path / "cache.sqlite"))
+    key = content_hash("prompt" + "chunk")
+    assert cache.get_summary(key) is None
+    cache.put_summary(key, "요약")
+    assert cache.get_summary(key) == "요약"
+    stats = cache.stats()
+    assert (stats["summaries"], stats["summary_hits"], stats["summary_misses"]) == (1, 1, 1)
+
+
+def test_evict_by_age_and_size(tmp_path):
+    cache = PageCache(str(tmp_path / "cache.sqlite"), max_bytes=10 ** 6)
+    cache.put_page("https://a.example", ["a" * 100])
+    time.sleep(0.01)
+    cache.put_page("https://b.example", ["b" * 100])
+    cache.max_bytes = 150
+    assert cache.evict() == 1
+    assert cache.get_page("https://a.example") is None
+    assert cache.get_page("https://b.example") is not None
+
+    assert cache.evict(max_age=-1) == 1
+    assert cache.stats()["pages"] == 0
+
+
+def test_summaries_alone_stay_under_max_bytes(tmp_path):
+    cache = PageCache(str(tmp_path / "cache.sqlite"), max_bytes=1000)
+    for i in range(50):
+        cache.put_summary(content_hash(f"chunk {i}"), f"{i:03d}" + "요" * 100)
+    stats = cache.stats()
+    assert stats["bytes"] <= 1000 and 0 < stats["summaries"] < 50
+    assert cache.get_summary(content_hash("chunk 49")) is not None
+    assert cache.get_summary(content_hash("chunk 0")) is None
+
+
+def test_old_schema_is_replaced(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = PageCache(path)
+    cache.put_page("https://example.com", ["청크"])
+    cache._conn.execute("PRAGMA user_version = 1")
+    assert PageCache(path).get_page("https://example.com") is None
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import time
+import unicodedata
+from src.tools.query_cache import QueryCache, normalize_query
+
+
+def test_normalize_query():
+    """테스트: 공백/대소문자/유니코드(NFD 한글, 전각) 차이는 같은 쿼리로 취급"""
+    assert normalize_query("  uEngine   세무 제안서 ") == "uengine 세무 제안서"
+    # NFD 로 분해된 한글(macOS 입력 등)과 전각 영문
+    nfd_query = unicodedata.normalize("NFD", "세무 ＡＩ")
+    assert nfd_query != unicodedata.normalize("NFC", nfd_query)
+    assert normalize_query(nfd_query) == normalize_query("세무 ai") == "세무 ai"
+
+    cache = QueryCache()
+    cache.put(unicodedata.normalize("NFC", "세무 제안서"), "result")
+    assert cache.get(unicodedata.normalize("NFD", "세무 제안서")) == "result"
+
+
+def test_query_cache_ttl_lru_and_stats():
+    """테스트: TTL 만료, LRU 제거, hit/miss 카운터"""
+    cache = QueryCache(ttl=0.05, max_entries=2)
+    cache.put("A", "a")
+    assert cache.get(" a ") == "a"
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+    cache.ttl = 60
+    cache.put("a", "a")
+    cache.put("b", "b")
+    cache.get("a")
+    cache.put("c", "c")
+    assert cache.get("b") is None and cache.get("a") == "a"
+    stats = cache.stats()
+    assert stats["hits"] == 3 and stats["misses"] == 2
+
+
+def test_query_cache_shared_between_instances():
+    """테스트: shared_path 를 쓰면 다른 인스턴스(프로세스)와 결과 공유"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "search.sqlite")
+        QueryCache(shared_path=path).put("세무 제안서", "result")
+        other = QueryCache(shared_path=path)
+        assert other.get("세무  제안서") == "result"
+        assert other.stats()["hit_rate"] == 1.0
+
+
+if __name__ == "__main__":
+    test_normalize_query()
+    test_query_cache_ttl_lru_and_stats()
+    test_query_cache_shared_between_instances()
+    print("\n✅ 테스트 완료!")
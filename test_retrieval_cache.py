@@ -0,0 +1,68 @@
+import pytest
+
+from src.tools.embeddings import HashingEmbedder, cosine_similarity
+from src.tools.retrieval_cache import RetrievalCache
+
+# 글자 n-gram 으로는 비슷하지만 뜻이 다른 쿼리 쌍
+DIFFERENT_MEANING = [
+    ("2023년 법인세 신고 기한", "2024년 법인세 신고 기한"),
+    ("법인세 세율 인상", "법인세 세율 인하"),
+    ("how to increase revenue", "how to decrease revenue"),
+]
+
+
+@pytest.mark.parametrize("cached, asked", DIFFERENT_MEANING)
+def test_different_queries_do_not_share_results(cached, asked):
+    cache = RetrievalCache()
+    cache.put("agent", cached, ["cached memory"], 0.5)
+    assert cache.get("agent", asked) is None
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.parametrize("cached, asked", DIFFERENT_MEANING)
+def test_hashing_scores_lexical_overlap_not_meaning(cached, asked):
+    # 이 유사도가 높기 때문에 HashingEmbedder 는 기본 embedder 가 아니다
+    embedder = HashingEmbedder()
+    assert cosine_similarity(embedder.embed(cached), embedder.embed(asked)) > 0.8
+
+
+def test_normalized_exact_match_hits():
+    cache = RetrievalCache()
+    cache.put("agent", "  법인세  신고 기한 ", ["memory"], 0.5)
+    assert cache.get("agent", "법인세 신고 기한") == ["memory"]
+    assert cache.get("other", "법인세 신고 기한") is None
+    stats = cache.stats()
+    assert (stats["exact_hits"], stats["similar_hits"], stats["misses"]) == (1, 0, 1)
+    assert stats["latency_saved"] == 0.5
+
+
+def test_invalidate_drops_agent_entries():
+    cache = RetrievalCache()
+    cache.put("agent", "세무 전략", ["memory"], 0.1)
+    cache.invalidate("agent")
+    assert cache.get("agent", "세무 전략") is None
+
+
+class TopicEmbedder:
+    """Stand-in for a semantic model: queries about the same topic map to the same vector."""
+
+    def embed(self, text):
+        return [1.0, 0.0] if "전략" in text else [0.0, 1.0]
+
+
+def test_similar_match_with_semantic_embedder():
+    cache = RetrievalCache(embedder=TopicEmbedder())
+    cache.put("agent", "세무 전략", ["memory"], 0.1)
+    assert cache.get("agent", "세무 전략은?") == ["memory"]
+    assert cache.get("agent", "법인세 세율") is None
+    assert cache.stats()["similar_hits"] == 1
+
+
+def test_put_is_skipped_after_invalidate_since_generation():
+    cache = RetrievalCache()
+    generation = cache.generation("agent")
+    cache.invalidate("agent")
+    cache.put("agent", "세무 전략", ["stale"], 0.1, generation)
+    assert cache.get("agent", "세무 전략") is None
+    cache.put("agent", "세무 전략", ["fresh"], 0.1, cache.generation("agent"))
+    assert cache.get("agent", "세무 전략") == ["fresh"]
@@ -0,0 +1,111 @@
+import json
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+
+from src.server import JobQueue, create_server
+
+
+def request(base_url, method, path, payload=None):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+def test_jobs_queue_sse_and_backpressure():
+    release = threading.Event()
+
+    def run_goal(goal, mode, step_callback):
+        if goal == "block":
+            release.wait(5)
+        for i in range(3):
+            step_callback(SimpleNamespace(step_number=i, task=goal, output=f"step {i}"), agent_name="Analyst")
+        if goal == "fail":
+            raise RuntimeError("boom")
+        return f"result for {goal}"
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        jobs = JobQueue(run_goal, workers=1, queue_size=1, log_dir=log_dir)
+        server = create_server(jobs, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        try:
+            status, blocked = request(base_url, "POST", "/jobs", {"goal": "block"})
+            assert status == 202
+            wait_for(lambda: jobs.stats()["running"] == 1)
+            status, queued = request(base_url, "POST", "/jobs", {"goal": "세무 제안서"})
+            assert status == 202
+            # 작업 1개 실행 중 + 대기열 1개가 가득 참 -> 429
+            status, body = request(base_url, "POST", "/jobs", {"goal": "overflow"})
+            assert status == 429 and jobs.stats()["rejected"] == 1
+            assert request(base_url, "POST", "/jobs", {"mode": "parallel"})[0] == 400
+
+            release.set()
+            with urllib.request.urlopen(f"{base_url}/jobs/{queued['id']}/events", timeout=5) as response:
+                stream = response.read().decode("utf-8")
+            events = [block for block in stream.split("\n\n") if block.startswith("event:")]
+            assert [block.split("\n")[0] for block in events] == ["event: step"] * 3 + ["event: end"]
+            assert json.loads(events[0].split("data: ", 1)[1])["output"] == "step 0"
+
+            status, job = request(base_url, "GET", f"/jobs/{queued['id']}")
+            assert status == 200 and job["status"] == "done" and job["result"] == "result for 세무 제안서"
+            assert job["steps"] == 3
+
+            status, failed = request(base_url, "POST", "/jobs", {"goal": "fail"})
+            wait_for(lambda: jobs.get(failed["id"]).status == "error")
+            assert "boom" in request(base_url, "GET", f"/jobs/{failed['id']}")[1]["error"]
+            assert request(base_url, "GET", "/jobs/unknown")[0] == 404
+            assert request(base_url, "GET", "/health")[1]["done"] == 2
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_non_object_json_body_is_rejected():
+    with tempfile.TemporaryDirectory() as log_dir:
+        jobs = JobQueue(lambda goal, mode, step_callback: goal, workers=1, log_dir=log_dir)
+        server = create_server(jobs, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        try:
+            for payload in ([], "x", 1, {"goal": 1}):
+                status, body = request(base_url, "POST", "/jobs", payload)
+                assert status == 400 and "goal" in body["error"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_timed_out_job_keeps_its_worker_until_it_exits():
+    release = threading.Event()
+
+    def run_goal(goal, mode, step_callback):
+        if goal == "slow":
+            release.wait(5)
+        return goal
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        jobs = JobQueue(run_goal, workers=1, timeout=0.05, log_dir=log_dir)
+        slow = jobs.submit("slow")
+        fast = jobs.submit("fast")
+        wait_for(lambda: slow.status == "timeout")
+        time.sleep(0.1)
+        assert fast.status == "queued" and jobs.stats()["running"] == 1
+        release.set()
+        wait_for(lambda: fast.status == "done")
+        wait_for(lambda: jobs.stats()["running"] == 0)
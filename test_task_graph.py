@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from src.task_graph import TaskNode, critical_path_seconds, parse_task_graph, run_task_graph
+
+
+def test_independent_tasks_run_concurrently():
+    # a, b, c 는 독립 (각 0.2초), d 는 a/b/c 결과를 합친다 (0.1초) -> 임계 경로 0.3초
+    nodes = [
+        TaskNode("a", "tax", "세무 검토", "결과"),
+        TaskNode("b", "proposal", "제안서 초안", "결과"),
+        TaskNode("c", "writer", "기술 보고서", "결과"),
+        TaskNode("d", "proposal", "종합", "결과", ("a", "b", "c")),
+    ]
+    durations = {"a": 0.2, "b": 0.2, "c": 0.2, "d": 0.1}
+    seen = {}
+
+    def execute(node, dependency_outputs):
+        seen[node.id] = dependency_outputs
+        time.sleep(durations[node.id])
+        return f"{node.id} done"
+
+    result = run_task_graph(nodes, execute, max_concurrency=3)
+    assert seen["d"] == {"a": "a done", "b": "b done", "c": "c done"}
+    assert result.final_output == "d done"
+    assert critical_path_seconds(nodes, durations) == pytest.approx(0.3)
+    assert result.wall_seconds < 0.45
+    # 선행 태스크가 끝나기 전에는 시작하지 않는다
+    assert result.timings["d"][0] >= max(result.timings[dep][1] for dep in "abc")
+
+    # 동시 실행 수 1 이면 순차 실행과 같다
+    assert run_task_graph(nodes, execute, max_concurrency=1).wall_seconds >= 0.7
+
+
+def test_failure_stops_dependents():
+    nodes = [TaskNode("a", "x", "", ""), TaskNode("b", "x", "", "", ("a",))]
+    started = []
+
+    def execute(node, dependency_outputs):
+        started.append(node.id)
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        run_task_graph(nodes, execute)
+    assert started == ["a"]
+
+
+def test_parse_task_graph_validates():
+    text = '```json\n{"task_graph": [{"id": "t1", "agent": "writer", "description": "d", "depends_on": []},' \
+           ' {"id": "t2", "agent": "writer", "description": "d", "depends_on": ["t1"]}]}\n```'
+    nodes = parse_task_graph(text, ["writer"])
+    assert [node.id for node in nodes] == ["t1", "t2"] and nodes[1].depends_on == ("t1",)
+    with pytest.raises(ValueError, match="unknown agent"):
+        parse_task_graph(text, ["tax"])
+    cyclic = '{"task_graph": [{"id": "a", "agent": "w", "description": "", "depends_on": ["b"]},' \
+             ' {"id": "b", "agent": "w", "description": "", "depends_on": ["a"]}]}'
+    with pytest.raises(ValueError, match="cycle"):
+        parse_task_graph(cyclic, ["w"])
+
+
+@pytest.mark.parametrize("graph, message", [
+    ('{"task_graph": {"id": "t1"}}', "non-empty list"),
+    ('{"task_graph": []}', "non-empty list"),
+    ('{"task_graph": ["t1"]}', "task #1 is not an object"),
+    ('{"task_graph": [{"id": "t1", "description": "d"}]}', "task 't1' is missing agent"),
+    ('{"task_graph": [{"agent": "w", "description": "d"}]}', "task #1 is missing id"),
+    ('{"task_graph": [{"id": "t1", "agent": ["w"], "description": "d"}]}', "task 't1' needs string"),
+    ('{"task_graph": [{"id": "t1", "agent": "w", "description": "d", "depends_on": "t0"}]}', "must be a list"),
+])
+def test_parse_task_graph_rejects_malformed_tasks(graph, message):
+    with pytest.raises(ValueError, match=message):
+        parse_task_graph(graph, ["w"])
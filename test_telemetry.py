@@ -0,0 +1,82 @@
+import json
+import time
+
+import pytest
+
+from src import telemetry as telemetry_module
+from src.telemetry import Telemetry, tool_series_name
+
+
+def test_summary_and_exports():
+    telemetry = Telemetry()
+    for i in range(1, 101):
+        telemetry.record("llm", "Researcher", i / 100)
+    telemetry.record("tool", "search_internet", 0.5)
+    try:
+        with telemetry.span("tool", "scrape_website"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    telemetry.record_tokens("Researcher", 1200, 300)
+
+    summary = telemetry.summary()
+    llm = summary["series"]["llm"]["Researcher"]
+    assert llm["count"] == 100 and llm["p50"] == 0.51 and llm["p95"] == 0.95 and llm["max"] == 1.0
+    assert summary["series"]["tool"]["scrape_website"]["errors"] == 1
+    assert summary["tokens"]["Researcher"] == {"in": 1200, "out": 300}
+    assert telemetry.top("tool")[0][0] == "search_internet"
+    assert json.loads(telemetry.to_json())["tokens"]["Researcher"]["out"] == 300
+
+    text = telemetry.to_prometheus()
+    assert '# TYPE crew_llm_seconds summary' in text
+    assert 'crew_llm_seconds{agent="Researcher",quantile="0.95"} 0.95' in text
+    assert 'crew_tool_seconds_count{tool="search_internet"} 1' in text
+    assert 'crew_tool_seconds_errors_total{tool="scrape_website"} 1' in text
+    assert 'crew_tokens_total{agent="Researcher",direction="in"} 1200' in text
+
+
+def test_concurrent_totals_can_exceed_wall_time():
+    telemetry = Telemetry()
+    # 두 태스크가 동시에 10초씩 실행된 경우
+    telemetry.record("step", "Researcher", 10.0)
+    telemetry.record("step", "Writer", 10.0)
+    telemetry.started_at -= 10
+    steps = telemetry.summary()["series"]["step"]
+    assert sum(values["share"] for values in steps.values()) > 1.5
+    assert steps["Researcher"]["kind_share"] == steps["Writer"]["kind_share"] == 0.5
+
+
+if __name__ == "__main__":
+    test_summary_and_exports()
+    test_concurrent_totals_can_exceed_wall_time()
+
+
+def test_tool_series_are_per_agent_and_errors_without_duration_skip_samples():
+    telemetry = Telemetry()
+    telemetry.record("tool", tool_series_name("Researcher", "search_internet"), 0.4)
+    telemetry.record("tool", tool_series_name("Writer", "search_internet"), 0.2, error=True)
+    telemetry.record("tool", tool_series_name("Writer", "search_internet"), None, error=True)
+
+    tools = telemetry.summary()["series"]["tool"]
+    writer = tools["Writer/search_internet"]
+    assert (writer["count"], writer["errors"], writer["p50"]) == (1, 2, 0.2)
+    assert tools["Researcher/search_internet"]["count"] == 1
+    text = telemetry.to_prometheus()
+    assert 'crew_tool_seconds_count{agent="Researcher",tool="search_internet"} 1' in text
+    assert 'crew_tool_seconds_errors_total{agent="Writer",tool="search_internet"} 2' in text
+
+
+def test_failed_tool_call_records_elapsed_time(monkeypatch):
+    pytest.importorskip("crewai")
+    from crewai.utilities.events import ToolUsageErrorEvent, ToolUsageStartedEvent, crewai_event_bus
+
+    monkeypatch.setattr(telemetry_module, "_telemetry", Telemetry())
+    assert telemetry_module.instrument_crewai()
+    event = {"agent_key": "k", "agent_role": "Researcher", "tool_name": "scrape_website",
+             "tool_args": {}, "tool_class": "scrape_website"}
+    crewai_event_bus.emit(None, ToolUsageStartedEvent(**event))
+    time.sleep(0.05)
+    crewai_event_bus.emit(None, ToolUsageErrorEvent(**event, error=RuntimeError("boom")))
+
+    series = telemetry_module.get_telemetry().summary()["series"]["tool"]["Researcher/scrape_website"]
+    assert series["errors"] == 1 and series["max"] >= 0.05
@@ -0,0 +1,130 @@
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from src.tools import registry as registry_module
+from src.tools.registry import ToolRegistry, parse_tool_specs, register_tool
+
+
+@pytest.fixture
+def plugin_module(tmp_path, monkeypatch):
+    (tmp_path / "fake_tool_plugin.py").write_text(textwrap.dedent("""
+        built = []
+
+        class EchoTool:
+            def __init__(self):
+                built.append(self)
+
+        class Holder:
+            echo = object()
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "fake_tool_plugin"
+    sys.modules.pop("fake_tool_plugin", None)
+
+
+def test_tools_are_imported_and_built_on_first_get(plugin_module):
+    registry = ToolRegistry({"echo": f"{plugin_module}:EchoTool", "held": f"{plugin_module}:Holder.echo"})
+    assert plugin_module not in sys.modules
+    assert registry.loaded() == []
+
+    tool = registry.get("echo")
+    assert registry.get("echo") is tool
+    assert sys.modules[plugin_module].built == [tool]
+    # 클래스가 아닌 속성은 이미 만들어진 툴 객체로 그대로 사용
+    assert registry.get("held") is sys.modules[plugin_module].Holder.echo
+    assert registry.loaded() == ["echo", "held"]
+
+
+def test_register_factory_and_instance():
+    calls, given = [], object()
+    registry = ToolRegistry({})
+    registry.register("made", lambda: calls.append(1) or "made tool")
+    registry.register("given", given)
+    assert "made" in registry and "missing" not in registry
+    assert calls == []
+    assert registry.get("made") == "made tool"
+    assert registry.get("made") == "made tool"
+    assert calls == [1]
+    assert registry.get("given") is given
+    with pytest.raises(KeyError):
+        registry.get("missing")
+
+
+def test_register_replaces_built_tool():
+    old, new = object(), object()
+    registry = ToolRegistry({"tool": old})
+    assert registry.get("tool") is old
+    registry.register("tool", new)
+    assert registry.get("tool") is new
+
+
+def test_parse_tool_specs_accepts_string_and_list_forms():
+    assert parse_tool_specs("search_internet, github(mcp), ") == [("search_internet", {}), ("github(mcp)", {})]
+    assert parse_tool_specs(["search_internet", {"scrape_website": {"chunk_tokens": 1000}}, {"write_file": None}]) == [
+        ("search_internet", {}), ("scrape_website", {"chunk_tokens": 1000}), ("write_file", {})]
+    assert parse_tool_specs(None) == []
+
+
+def test_options_are_passed_to_factory_and_cached_per_options():
+    class Tool:
+        def __init__(self, size=1):
+            self.size = size
+
+    registry = ToolRegistry({"tool": Tool, "prebuilt": object()})
+    default, big = registry.get("tool"), registry.get("tool", {"size": 5})
+    assert (default.size, big.size) == (1, 5)
+    assert registry.get("tool", {"size": 5}) is big
+    assert registry.get("tool", {}) is default
+    with pytest.raises(TypeError):
+        registry.get("prebuilt", {"size": 5})
+
+
+def test_child_registry_overrides_and_shares_parent_tools():
+    shared, override = object(), object()
+    parent = ToolRegistry({"shared": lambda: shared, "tool": object})
+    child = ToolRegistry(parent=parent)
+    child.register("tool", override)
+    assert child.get("shared") is parent.get("shared") is shared
+    assert child.get("tool") is override
+    assert parent.get("tool") is not override
+    assert child.loaded() == ["tool"]
+    assert set(child.names()) == {"shared", "tool"}
+
+
+def test_entry_points_and_decorator(monkeypatch, plugin_module):
+    class EntryPoint:
+        name, value = "plugin_echo", f"{plugin_module}:EchoTool"
+
+    monkeypatch.setattr(registry_module, "entry_points", lambda group: [EntryPoint] if group == "process_gpt.tools" else [])
+    monkeypatch.setattr(registry_module, "_default_registry", None)
+
+    @register_tool("decorated")
+    def make_decorated():
+        return "decorated tool"
+
+    default = registry_module.get_tool_registry()
+    assert "search_internet" in default and "plugin_echo" in default
+    assert plugin_module not in sys.modules
+    assert default.get("plugin_echo") in sys.modules[plugin_module].built
+    assert default.get("decorated") == "decorated tool"
+
+
+def test_importing_src_tools_does_not_import_tool_modules():
+    code = ("import sys, src.tools, src.tools.registry; "
+            "print(sorted(m for m in sys.modules if m.startswith(('chromadb', 'mem0', 'crewai', 'src.tools.'))))")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "['src.tools.registry']"
+
+
+def test_rejected_options_name_the_tool():
+    class Tool:
+        def __init__(self, size=1):
+            self.size = size
+
+    registry = ToolRegistry({"tool": Tool})
+    with pytest.raises(TypeError, match="Tool 'tool' does not accept options \\['color'\\]"):
+        registry.get("tool", {"color": "red"})
+    assert registry.loaded() == []